@@ -0,0 +1,7 @@
+"""
+LifeGame Theory: la vida como un RPG.
+
+Los módulos `defaults`, `engine`, `search` y `render` no dependen de
+Streamlit y pueden importarse sin levantar la app; `storage`, `state`, `ui`
+y `pages` son la capa de la interfaz.
+"""
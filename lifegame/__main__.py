@@ -0,0 +1,5 @@
+import sys
+
+from lifegame.cli import main
+
+sys.exit(main())
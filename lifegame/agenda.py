@@ -0,0 +1,217 @@
+"""
+Agenda diaria: el "hoy" del juego y las misiones de ese día, precalculadas.
+
+El día de juego cambia a la hora `daily_reset_time` de la configuración de
+cada usuario (hora local del servidor): antes de esa hora sigue siendo el
+día anterior. Al cambiar de día (`roll_over`) se cierra el anterior: se
+recalcula la racha y las misiones no diarias que quedaron sin completar pasan
+al día nuevo. La agenda resultante la sirve el UserHub a todas las sesiones,
+y AgendaScheduler hace el cambio de día a la hora de reset aunque nadie esté
+usando la app. Para no esperar al historial entero, cada guardado deja los
+registros de los últimos días en mission_log.recent.json (ver recent_log).
+Este módulo no importa Streamlit.
+"""
+
+import json
+import threading
+import weakref
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List
+
+from lifegame.engine import completions_index, is_mission_active_today, mark_completed
+
+DEFAULT_RESET_TIME = "06:00"
+# Registros recientes guardados junto al mission_log y días que cubren
+RECENT_LOG_FILE = "mission_log.recent.json"
+RECENT_DAYS = 7
+# Tope de espera del planificador (recoge hubs nuevos y cambios de hora)
+SCHEDULER_POLL_SECONDS = 300
+
+def parse_reset_time(value: str | None) -> time:
+    try:
+        return datetime.strptime(value or DEFAULT_RESET_TIME, "%H:%M").time()
+    except ValueError:
+        return datetime.strptime(DEFAULT_RESET_TIME, "%H:%M").time()
+
+def game_day(now: datetime, reset_time: str | None) -> date:
+    """Día de juego en `now`: antes de la hora de reset sigue siendo ayer"""
+    if now.time() < parse_reset_time(reset_time):
+        return now.date() - timedelta(days=1)
+    return now.date()
+
+def next_reset(now: datetime, reset_time: str | None) -> datetime:
+    """Próximo cambio de día de juego estrictamente después de `now`"""
+    reset = datetime.combine(now.date(), parse_reset_time(reset_time))
+    return reset if reset > now else reset + timedelta(days=1)
+
+def day_completed(day_log: Dict[str, Dict]) -> bool:
+    return any(log.get("status") == "completed" for log in day_log.values())
+
+def current_streak(completions: Dict[str, Dict[str, Dict]], day: date) -> tuple:
+    """(racha, último día activo) contando días seguidos con misiones hasta `day` - 1"""
+    streak = 0
+    cursor = day - timedelta(days=1)
+    while day_completed(completions.get(cursor.isoformat(), {})):
+        streak += 1
+        cursor -= timedelta(days=1)
+    if streak:
+        return streak, (day - timedelta(days=1)).isoformat()
+    last_active = max((d for d, log in completions.items() if d < day.isoformat() and day_completed(log)), default=None)
+    return 0, last_active
+
+def close_days(profile: Dict, completions: Dict[str, Dict[str, Dict]], first: date, day: date) -> tuple:
+    """
+    (racha, último día activo) tras cerrar los días [first, day) sobre los
+    valores del perfil, que ya cuentan hasta first - 1. Solo necesita el
+    historial desde `first`.
+    """
+    streak = profile["streak_days"]
+    last_active = profile["last_active_date"]
+    cursor = first
+    while cursor < day:
+        if day_completed(completions.get(cursor.isoformat(), {})):
+            previous = (cursor - timedelta(days=1)).isoformat()
+            streak = streak + 1 if last_active == previous else 1
+            last_active = cursor.isoformat()
+        cursor += timedelta(days=1)
+    if last_active != (day - timedelta(days=1)).isoformat():
+        streak = 0
+    return streak, last_active
+
+def carried_over(missions: List[Dict], completions: Dict[str, Dict[str, Dict]], previous: Dict, day: date) -> List[str]:
+    """
+    Misiones no diarias de la agenda anterior que quedaron sin completar y
+    que `day` no trae por sí solo; siguen pasando de día hasta completarse o
+    hasta su fecha de fin.
+    """
+    previous_day = date.fromisoformat(previous["date"])
+    day_log = completions.get(previous["date"], {})
+    pending = set(previous.get("carried_over", []))
+    pending.update(m["id"] for m in missions if is_mission_active_today(m, previous_day))
+    carried = []
+    for mission in missions:
+        if mission["id"] not in pending or mission["type"] == "daily":
+            continue
+        if day_log.get(mission["id"], {}).get("status") == "completed":
+            continue
+        if mission["end_date"] and date.fromisoformat(mission["end_date"]) < day:
+            continue
+        if not is_mission_active_today(mission, day):
+            carried.append(mission["id"])
+    return carried
+
+def roll_over(state, day: date) -> bool:
+    """
+    Cierra los días de juego hasta `day` en el perfil: racha, último día
+    activo y misiones arrastradas (profile["agenda"]). Con una agenda previa
+    solo mira el historial desde su fecha. Devuelve si cambió.
+    """
+    profile = state["profile"]["data"]
+    previous = profile["agenda"] or {}
+    if previous.get("date") == day.isoformat():
+        return False
+    missions = state["missions"]["data"]["missions"]
+    completions = completions_index(state["mission_log"]["data"])
+    if previous.get("date") and previous["date"] < day.isoformat():
+        carried = carried_over(missions, completions, previous, day)
+        first = date.fromisoformat(previous["date"])
+        profile["streak_days"], profile["last_active_date"] = close_days(profile, completions, first, day)
+    else:
+        # Primera agenda (o el reloj fue hacia atrás): racha desde el historial
+        carried = []
+        profile["streak_days"], profile["last_active_date"] = current_streak(completions, day)
+    profile["agenda"] = {"date": day.isoformat(), "carried_over": carried}
+    return True
+
+def agenda_missions(agenda: Dict, day_log: Dict[str, Dict]) -> List[Dict]:
+    """Misiones de la agenda marcadas como completadas (según el log del día) y arrastradas"""
+    missions = mark_completed(agenda["missions"], day_log)
+    for mission in missions:
+        mission["carried_over"] = mission["id"] in agenda["carried_over"]
+    return missions
+
+def build_agenda(state, day: date) -> Dict:
+    """Misiones del día (activas y arrastradas), sin el estado de completadas"""
+    carried = set((state["profile"]["data"]["agenda"] or {}).get("carried_over", []))
+    missions = [
+        mission for mission in state["missions"]["data"]["missions"]
+        if mission["id"] in carried or is_mission_active_today(mission, day)
+    ]
+    return {"date": day, "missions": missions, "carried_over": carried}
+
+# =========================================================
+#  REGISTROS RECIENTES
+# =========================================================
+
+def recent_log(records: List[Dict], since: date, source: str | None) -> Dict:
+    """Registros desde `since` del mission_log con SHA `source`"""
+    first = since.isoformat()
+    return {
+        "source": source,
+        "since": first,
+        "records": [record for record in records if (record.get("date") or "") >= first],
+    }
+
+def covers(recent: Dict | None, since: date | None) -> bool:
+    """Si los registros recientes bastan para mirar el historial desde `since`"""
+    return recent is not None and since is not None and since.isoformat() >= recent["since"]
+
+def read_recent_log(username: str, backend) -> tuple:
+    """
+    (registros recientes o None, SHA del archivo): solo valen si salieron del
+    mission_log actual, cuya SHA sale del listado sin descargarlo.
+    """
+    shas = backend.file_shas(username)
+    if RECENT_LOG_FILE not in shas:
+        return None, None
+    content, sha = backend.get(username, RECENT_LOG_FILE)
+    try:
+        recent = json.loads(content)
+    except ValueError:
+        return None, sha
+    if not isinstance(recent, dict) or recent.get("source") != shas.get("mission_log.jsonl"):
+        return None, sha
+    return recent, sha
+
+def write_recent_log(username: str, recent: Dict, backend, sha: str | None = None) -> str | None:
+    """Guarda los registros recientes; sin `sha` pide la actual al backend. Devuelve la SHA nueva (None si falla)"""
+    if sha is None:
+        _, sha = backend.get(username, RECENT_LOG_FILE)
+    return backend.put(username, RECENT_LOG_FILE, json.dumps(recent, ensure_ascii=False), sha)
+
+class AgendaScheduler:
+    """
+    Hilo del proceso que, a la hora de reset de cada usuario cargado, llama a
+    `hub.agenda(now)` para que el cambio de día ya esté hecho cuando vuelva.
+    Los hubs se guardan con referencias débiles.
+    """
+
+    def __init__(self):
+        self._hubs = weakref.WeakSet()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def register(self, hub):
+        with self._cond:
+            self._hubs.add(hub)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="lifegame-agenda", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            now = datetime.now()
+            with self._cond:
+                hubs = list(self._hubs)
+            for hub in hubs:
+                due = hub.next_reset
+                if due is not None and due <= now:
+                    hub.agenda(now)
+            pending = [hub.next_reset for hub in hubs if hub.next_reset is not None]
+            wait = min([SCHEDULER_POLL_SECONDS] + [(due - datetime.now()).total_seconds() for due in pending])
+            del hubs
+            with self._cond:
+                self._cond.wait(max(wait, 0.05))
+
+AGENDA_SCHEDULER = AgendaScheduler()
@@ -0,0 +1,554 @@
+"""
+Backups por streaming, generados solo cuando se piden.
+
+Un backup se escribe archivo a archivo y el historial registro a registro,
+sin armarlo entero en memoria. Hay dos formatos:
+
+- zip: `<usuario>/<archivo>` con el mismo contenido que el almacenamiento,
+  más un `manifest.json` con la versión, la fecha y los totales;
+- NDJSON (opcionalmente con gzip): una línea `header`, una `dataset` por
+  cada archivo JSON, una `record` por registro de historial y una `end` con
+  los totales.
+
+Con `since` (fecha u hora ISO) el backup es incremental: los JSONL solo
+llevan los registros con `timestamp` (o `date`) desde ese momento; los
+archivos JSON van siempre completos. Los archivos salen de la sesión
+(`session_files`: incluye lo no guardado y recorre el historial compactado
+sin rehidratarlo) o del backend (`backend_files`: un archivo a la vez, que
+es lo que usa la CLI para exportar a todos los usuarios con memoria acotada).
+
+`import_backup` lee cualquiera de los dos formatos (y el JSON de la versión
+1.0) de a un registro: valida contra RECORD_SCHEMAS y DATASET_SCHEMAS,
+descarta repetidos, guarda el historial importado en archivos temporales y
+escribe cada usuario en un solo lote. Solo la lectura del backup es por
+streaming: los backends reciben cada archivo entero, así que al fusionar
+el historial existente y el resultado de cada archivo se arman en memoria
+(de a un archivo). Este módulo no importa Streamlit.
+"""
+
+import gzip
+import heapq
+import io
+import json
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterable, Iterator, Tuple
+
+from lifegame.defaults import USER_FILES
+from lifegame.schema import upgrade
+from lifegame.storage import DEFAULT_DATA, serialize_user_file
+
+BACKUP_FORMAT = "lifegame-backup"
+EXPORT_VERSION = "2.0"
+EXPORT_FORMATS = ("zip", "ndjson.gz", "ndjson")
+EXPORT_MIME = {
+    "zip": "application/zip",
+    "ndjson.gz": "application/gzip",
+    "ndjson": "application/x-ndjson",
+}
+
+# =========================================================
+#  ORÍGENES
+# =========================================================
+
+# Cada origen produce (archivo, contenido): texto para los JSON y un
+# iterador de líneas JSON para los JSONL
+
+def text_lines(text: str | None) -> Iterator[str]:
+    """Líneas no vacías de un texto, sin copiarlo (io.StringIO lo duplica en UCS-4)"""
+    text = text or ""
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start)
+        if end < 0:
+            end = len(text)
+        line = text[start:end].strip()
+        if line:
+            yield line
+        start = end + 1
+
+def dataset_lines(dataset: Dict) -> Iterator[str]:
+    """Líneas del historial: primero la parte compactada, luego los registros vivos"""
+    archive = dataset.get("archive")
+    if archive is not None:
+        yield from archive.lines()
+    for record in dataset["data"]:
+        yield json.dumps(record)
+
+def session_files(datasets: Dict[str, Dict]) -> Iterator[Tuple[str, object]]:
+    """Archivos desde los datasets en memoria; recorrerlos con el lock del hub tomado"""
+    for fname, key in USER_FILES.items():
+        dataset = datasets[key]
+        if fname.endswith(".jsonl"):
+            yield fname, dataset_lines(dataset)
+        else:
+            yield fname, serialize_user_file(fname, dataset["data"])
+
+def backend_files(username: str, backend) -> Iterator[Tuple[str, object]]:
+    """Archivos leídos del backend de a uno (los que falten se omiten)"""
+    for fname in USER_FILES:
+        content, _ = backend.get(username, fname)
+        if content is None:
+            continue
+        yield fname, text_lines(content) if fname.endswith(".jsonl") else content
+
+def record_time(record: Dict) -> str:
+    return record.get("timestamp") or record.get("date") or ""
+
+def since_lines(lines: Iterable[str], since: str | None) -> Iterator[str]:
+    if since is None:
+        yield from lines
+        return
+    for line in lines:
+        if record_time(json.loads(line)) >= since:
+            yield line
+
+# =========================================================
+#  EXPORTACIÓN
+# =========================================================
+
+def export_filename(fmt: str, since: str | None = None, label: str = "backup") -> str:
+    stamp = datetime.now().strftime("%Y-%m-%d")
+    suffix = f"_desde_{since[:10]}" if since else ""
+    return f"lifegame_{label}_{stamp}{suffix}.{fmt}"
+
+def write_export(out: BinaryIO, users: Iterable[Tuple[str, Iterable]], fmt: str = "zip", since: str | None = None) -> Dict:
+    """
+    Escribe en `out` el backup de `users`, pares (usuario, archivos de un
+    origen), y devuelve el manifiesto con los registros por archivo.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"formato desconocido: {fmt}")
+    manifest = {
+        "format": BACKUP_FORMAT,
+        "export_version": EXPORT_VERSION,
+        "export_date": datetime.now().isoformat(),
+        "since": since,
+        "users": {},
+    }
+    if fmt == "zip":
+        _write_zip(out, users, since, manifest)
+    elif fmt == "ndjson.gz":
+        with gzip.GzipFile(fileobj=out, mode="wb") as gz:
+            _write_ndjson(gz, users, since, manifest)
+    else:
+        _write_ndjson(out, users, since, manifest)
+    return manifest
+
+def _write_zip(out: BinaryIO, users, since: str | None, manifest: Dict):
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for username, files in users:
+            counts = manifest["users"].setdefault(username, {})
+            for fname, content in files:
+                with zf.open(f"{username}/{fname}", "w") as f:
+                    if isinstance(content, str):
+                        f.write(content.encode("utf-8"))
+                        counts[fname] = 1
+                        continue
+                    # Mismo formato que serialize_user_file: sin salto final
+                    n = 0
+                    for line in since_lines(content, since):
+                        f.write((line if not n else "\n" + line).encode("utf-8"))
+                        n += 1
+                    counts[fname] = n
+        zf.writestr("manifest.json", json.dumps(manifest, indent=2, ensure_ascii=False))
+
+def _write_ndjson(out: BinaryIO, users, since: str | None, manifest: Dict):
+    header = {"type": "header", **{k: v for k, v in manifest.items() if k != "users"}}
+    out.write((json.dumps(header, ensure_ascii=False) + "\n").encode("utf-8"))
+    for username, files in users:
+        counts = manifest["users"].setdefault(username, {})
+        user = json.dumps(username)
+        for fname, content in files:
+            key = USER_FILES[fname]
+            if isinstance(content, str):
+                line = {"type": "dataset", "user": username, "key": key, "data": json.loads(content)}
+                out.write((json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8"))
+                counts[fname] = 1
+                continue
+            # Los registros ya son JSON de una línea: se envuelven sin parsearlos
+            prefix = f'{{"type": "record", "user": {user}, "key": "{key}", "data": '
+            n = 0
+            for line in since_lines(content, since):
+                out.write((prefix + line + "}\n").encode("utf-8"))
+                n += 1
+            counts[fname] = n
+    end = {"type": "end", "users": manifest["users"]}
+    out.write((json.dumps(end, ensure_ascii=False) + "\n").encode("utf-8"))
+
+# =========================================================
+#  IMPORTACIÓN
+# =========================================================
+
+# Campos obligatorios de cada registro de historial y su tipo; el resto se
+# conserva tal cual
+RECORD_SCHEMAS = {
+    "mission_log": {"mission_id": str, "date": str, "status": str, "timestamp": str},
+    "journal": {"id": str, "date": str, "timestamp": str, "text": str},
+    "decisions": {"id": str, "timestamp": str, "situation": str},
+}
+# Los de cada archivo JSON; las listas son de elementos con `id` y al
+# fusionar se combinan por `id`
+DATASET_SCHEMAS = {
+    "profile": {"current_level": int, "current_xp": int, "xp_base_per_level": int, "total_tokens": int},
+    "config": {},
+    "attributes": {"attributes": list},
+    "missions": {"missions": list},
+    "calendar": {"events": list},
+    "rewards": {"rewards": list, "redemptions": list},
+}
+TYPE_NAMES = {str: "texto", int: "entero", list: "lista"}
+# Errores que el reporte detalla (los demás solo se cuentan)
+MAX_REPORTED_ERRORS = 20
+# Historial importado de un usuario que se guarda en memoria antes de pasar a disco
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+KEY_FILES = {key: fname for fname, key in USER_FILES.items()}
+
+def schema_errors(schema: Dict, value) -> list:
+    if not isinstance(value, dict):
+        return ["no es un objeto"]
+    errors = []
+    for field, kind in schema.items():
+        if field not in value:
+            errors.append(f"falta '{field}'")
+        elif not isinstance(value[field], kind) or (kind is int and isinstance(value[field], bool)):
+            errors.append(f"'{field}' debe ser {TYPE_NAMES[kind]}")
+        elif kind is list and any(not isinstance(item, dict) or not isinstance(item.get("id"), str) for item in value[field]):
+            errors.append(f"'{field}' tiene elementos sin 'id'")
+    for field in ("date", "timestamp"):
+        if isinstance(value.get(field), str):
+            try:
+                datetime.fromisoformat(value[field])
+            except ValueError:
+                errors.append(f"'{field}' no es una fecha ISO")
+    return errors
+
+def line_time(line: str) -> str:
+    return record_time(json.loads(line))
+
+def in_time_order(lines: list) -> list:
+    """Las líneas tal cual si ya están en orden de fecha; si no, ordenadas (estable)"""
+    times = [line_time(line) for line in lines]
+    if all(a <= b for a, b in zip(times, times[1:])):
+        return lines
+    return [lines[n] for n in sorted(range(len(lines)), key=times.__getitem__)]
+
+def join_lines(lines: Iterable[str]) -> str:
+    """Une las líneas con saltos de línea sin armar la lista intermedia"""
+    out = io.StringIO()
+    for n, line in enumerate(lines):
+        out.write(line if not n else "\n" + line)
+    return out.getvalue()
+
+def record_key(key: str, record: Dict) -> str:
+    """Identidad de un registro: `id`, o misión y día en el mission_log (que no tiene id)"""
+    if key == "mission_log":
+        return f"{record['mission_id']}@{record['date']}"
+    return record["id"]
+
+def merge_dataset(key: str, existing, imported):
+    """
+    Fusión de un archivo JSON: se queda lo existente y se agregan los
+    elementos nuevos por `id`, con ambos lados en la versión de esquema actual
+    para que el documento fusionado no mezcle versiones.
+    """
+    if existing is None:
+        return imported
+    upgrade(key, existing)
+    upgrade(key, imported)
+    merged = dict(existing)
+    for field, kind in DATASET_SCHEMAS[key].items():
+        if kind is list:
+            ids = {item.get("id") for item in existing.get(field, [])}
+            merged[field] = existing.get(field, []) + [item for item in imported[field] if item["id"] not in ids]
+    return merged
+
+# ---------------------------------------------------------
+#  Lectura: eventos (tipo, usuario, clave, datos, lugar)
+# ---------------------------------------------------------
+
+def read_backup(f: BinaryIO) -> Iterator[tuple]:
+    """
+    Recorre un backup de cualquier formato: zip y NDJSON (con o sin gzip) de
+    a una línea, y el JSON de la versión 1.0 entero (era un único objeto, sin
+    usuario). `f` tiene que admitir seek. Los tipos son header, dataset,
+    record e invalid (datos = el error).
+    """
+    head = f.read(2)
+    f.seek(0)
+    if head == b"PK":
+        yield from _read_zip(f)
+        return
+    raw = gzip.GzipFile(fileobj=f) if head == b"\x1f\x8b" else f
+    text = io.TextIOWrapper(raw, encoding="utf-8")
+    try:
+        first = text.readline()
+        try:
+            header = json.loads(first)
+        except ValueError:
+            header = None
+        if isinstance(header, dict) and header.get("type") == "header":
+            yield from _read_ndjson(header, text)
+        else:
+            # Versión 1.0: un objeto JSON con indentación
+            yield from _read_legacy(json.loads(first + text.read()))
+    finally:
+        # El archivo es de quien llama: el wrapper no debe cerrarlo
+        text.detach()
+
+def _check_header(header: Dict) -> Dict:
+    if header.get("format") != BACKUP_FORMAT:
+        raise ValueError("No es un backup de Life RPG")
+    if str(header.get("export_version", "")).split(".")[0] != EXPORT_VERSION.split(".")[0]:
+        raise ValueError(f"Versión de backup no soportada: {header.get('export_version')}")
+    return header
+
+def _read_ndjson(header: Dict, lines) -> Iterator[tuple]:
+    yield "header", None, None, _check_header(header), "línea 1"
+    for n, line in enumerate(lines, start=2):
+        if not line.strip():
+            continue
+        where = f"línea {n}"
+        try:
+            item = json.loads(line)
+        except ValueError:
+            yield "invalid", None, None, "JSON inválido", where
+            continue
+        kind = item.get("type") if isinstance(item, dict) else None
+        if kind == "end":
+            return
+        if kind not in ("dataset", "record") or item.get("key") not in KEY_FILES:
+            yield "invalid", item.get("user") if kind else None, None, "línea desconocida", where
+            continue
+        yield kind, item.get("user"), item["key"], item.get("data"), where
+
+def _read_zip(f: BinaryIO) -> Iterator[tuple]:
+    with zipfile.ZipFile(f) as zf:
+        try:
+            header = json.loads(zf.read("manifest.json"))
+        except KeyError:
+            raise ValueError("El zip no tiene manifest.json")
+        yield "header", None, None, _check_header(header), "manifest.json"
+        for name in zf.namelist():
+            username, _, fname = name.rpartition("/")
+            if name == "manifest.json" or fname not in USER_FILES or not username:
+                continue
+            key = USER_FILES[fname]
+            with zf.open(name) as entry:
+                if not fname.endswith(".jsonl"):
+                    try:
+                        yield "dataset", username, key, json.load(entry), name
+                    except ValueError:
+                        yield "invalid", username, key, "JSON inválido", name
+                    continue
+                for n, line in enumerate(io.TextIOWrapper(entry, encoding="utf-8"), start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield "record", username, key, json.loads(line), f"{name}:{n}"
+                    except ValueError:
+                        yield "invalid", username, key, "JSON inválido", f"{name}:{n}"
+
+def _read_legacy(backup: Dict) -> Iterator[tuple]:
+    if not isinstance(backup, dict) or "export_version" not in backup:
+        raise ValueError("No es un backup de Life RPG")
+    yield "header", None, None, {"export_version": backup["export_version"], "since": None}, "versión 1.0"
+    for key in KEY_FILES:
+        if key not in backup:
+            continue
+        if key in RECORD_SCHEMAS:
+            for n, record in enumerate(backup[key]):
+                yield "record", None, key, record, f"{key}[{n}]"
+        else:
+            yield "dataset", None, key, backup[key], key
+
+# ---------------------------------------------------------
+#  Aplicación por usuario
+# ---------------------------------------------------------
+
+class UserImport:
+    """
+    Lo importado para un usuario: los archivos JSON en memoria y el historial
+    como líneas JSON en archivos temporales, sin repetidos. `write` lo
+    combina con lo existente y lo escribe en un solo lote.
+    """
+
+    def __init__(self, username: str, replace: bool):
+        self.username = username
+        self.replace = replace
+        self.datasets: Dict[str, Dict] = {}
+        self.history: Dict[str, object] = {}
+        self.seen: Dict[str, set] = {}
+        self.counts = {key: {"imported": 0, "duplicates": 0} for key in KEY_FILES}
+        self.invalid = 0
+        self.new_user = False
+        # Último momento importado por dataset y los que no vinieron en orden
+        self.latest: Dict[str, str] = {}
+        self.unordered: set = set()
+
+    def add_dataset(self, key: str, data):
+        self.datasets[key] = data
+        self.counts[key]["imported"] = 1
+
+    def add_record(self, key: str, record: Dict):
+        seen = self.seen.setdefault(key, set())
+        identity = record_key(key, record)
+        if identity in seen:
+            self.counts[key]["duplicates"] += 1
+            return
+        seen.add(identity)
+        if key not in self.history:
+            self.history[key] = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES, mode="w+", encoding="utf-8")
+        self.history[key].write(json.dumps(record) + "\n")
+        self.counts[key]["imported"] += 1
+        when = record_time(record)
+        if when < self.latest.get(key, ""):
+            self.unordered.add(key)
+        else:
+            self.latest[key] = when
+
+    def keys(self) -> list:
+        """Archivos a escribir: los que trae el backup al fusionar; todos al reemplazar o si el usuario es nuevo"""
+        if self.replace or self.new_user:
+            return list(KEY_FILES)
+        return [key for key in KEY_FILES if key in self.datasets or key in self.history]
+
+    def _history_lines(self, key: str) -> Iterator[str]:
+        spool = self.history.get(key)
+        if spool is None:
+            return
+        spool.seek(0)
+        for line in spool:
+            yield line.rstrip("\n")
+
+    def _merged_history(self, key: str, existing: str | None) -> Iterator[str]:
+        """
+        Existente + importado sin lo ya existente, intercalados por fecha.
+        heapq.merge necesita los dos lados en orden: el que no lo está (un
+        archivo editado a mano, un backup de otra herramienta) se ordena
+        antes, de forma estable, en memoria.
+        """
+        if self.replace:
+            yield from self._history_lines(key)
+            return
+        existing_lines = in_time_order(list(text_lines(existing)))
+        existing_keys = {record_key(key, json.loads(line)) for line in existing_lines}
+        repeated = len(existing_keys & self.seen.get(key, set()))
+        self.counts[key]["duplicates"] += repeated
+        self.counts[key]["imported"] -= repeated
+        imported = (line for line in self._history_lines(key) if record_key(key, json.loads(line)) not in existing_keys)
+        if key in self.unordered:
+            imported = sorted(imported, key=line_time)
+        yield from heapq.merge(existing_lines, imported, key=line_time)
+
+    def files(self, backend) -> Iterator[Tuple[str, str]]:
+        """(archivo, contenido) de a uno, leyendo lo existente solo al fusionar"""
+        for key in self.keys():
+            fname = KEY_FILES[key]
+            existing = None if self.replace else backend.get(self.username, fname)[0]
+            if key in RECORD_SCHEMAS:
+                yield fname, join_lines(self._merged_history(key, existing))
+            elif key not in self.datasets:
+                # Reemplazo sin ese archivo en el backup, o usuario nuevo
+                yield fname, existing or serialize_user_file(fname, DEFAULT_DATA[fname])
+            elif self.replace:
+                yield fname, serialize_user_file(fname, self.datasets[key])
+            else:
+                current = json.loads(existing) if existing else None
+                yield fname, serialize_user_file(fname, merge_dataset(key, current, self.datasets[key]))
+
+    def write(self, backend, dry_run: bool = False) -> bool:
+        """Escribe todo en un lote; en seco solo calcula la fusión (y sus totales)"""
+        self.new_user = backend.get(self.username, "profile.json")[0] is None
+        if dry_run:
+            for _ in self.files(backend):
+                pass
+            return True
+        mode = "reemplazo" if self.replace else "fusión"
+        return backend.put_files(self.username, self.files(backend), f"Import backup for {self.username} ({mode})")
+
+    def close(self):
+        for spool in self.history.values():
+            spool.close()
+
+def import_backup(f: BinaryIO, backend, replace: bool = False, users: Iterable[str] | None = None,
+                  target: str | None = None, skip_invalid: bool = False, dry_run: bool = False) -> Dict:
+    """
+    Importa un backup leído de a un registro: valida cada dataset y registro,
+    descarta repetidos (por `id`, o misión y día en el mission_log) y escribe
+    cada usuario en un solo lote (un commit en GitHub) al terminar de leerlo.
+    Al fusionar lo existente se conserva y solo se agrega lo nuevo; al
+    reemplazar los archivos del usuario quedan como en el backup. Un usuario
+    con registros inválidos no se escribe salvo con `skip_invalid`, que los
+    omite. `users` filtra usuarios del backup y `target` importa el único
+    usuario que queda (o el de la versión 1.0) con otro nombre.
+    """
+    users = set(users) if users else None
+    report = {"users": {}, "invalid": 0, "errors": [], "written": [], "failed": []}
+    done = set()
+    current: UserImport | None = None
+    unattributed = 0
+
+    def error(where: str, message: str):
+        report["invalid"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append(f"{where}: {message}")
+
+    def finish(state: UserImport):
+        try:
+            ok = not state.invalid or skip_invalid
+            ok = ok and state.write(backend, dry_run)
+        finally:
+            state.close()
+        report["users"][state.username] = {KEY_FILES[k]: c for k, c in state.counts.items() if k in state.keys()}
+        report["written" if ok else "failed"].append(state.username)
+        done.add(state.username)
+
+    source = None
+    for kind, username, key, data, where in read_backup(f):
+        if kind == "header":
+            if replace and data.get("since"):
+                raise ValueError("Un backup incremental solo se puede fusionar")
+            continue
+        if kind == "invalid" and username is None:
+            # Línea ilegible: cuenta para el usuario en curso (o el siguiente)
+            error(where, data)
+            unattributed += 1
+            if current is not None:
+                current.invalid, unattributed = current.invalid + unattributed, 0
+            continue
+        if users is not None and username is not None and username not in users:
+            continue
+        if target is not None:
+            if source is None:
+                source = username
+            elif username != source:
+                raise ValueError(f"El backup tiene más de un usuario ({source}, {username}): elegir uno")
+            username = target
+        elif username is None:
+            raise ValueError("Backup de versión 1.0 sin usuario: indicar el usuario destino")
+        if current is None or current.username != username:
+            if username in done:
+                raise ValueError(f"{where}: los datos de {username} no están juntos en el backup")
+            if current is not None:
+                finish(current)
+            current = UserImport(username, replace)
+            current.invalid, unattributed = unattributed, 0
+        if kind == "invalid":
+            current.invalid += 1
+            error(where, data)
+            continue
+        schema = RECORD_SCHEMAS.get(key) if kind == "record" else DATASET_SCHEMAS.get(key)
+        problems = schema_errors(schema, data) if schema is not None else ["tipo de dato equivocado"]
+        if problems:
+            current.invalid += 1
+            error(f"{where} ({username}/{key})", "; ".join(problems))
+        elif kind == "record":
+            current.add_record(key, data)
+        else:
+            current.add_dataset(key, data)
+    if current is not None:
+        finish(current)
+    return report
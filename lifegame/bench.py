@@ -0,0 +1,374 @@
+"""
+Benchmarks de los caminos calientes sobre datos sintéticos, sin Streamlit.
+
+    python -m lifegame bench [--missions 20] [--years 3] [--check] [--baseline FILE]
+
+`generate_user` produce un usuario determinista (misma semilla, mismos
+datos) con N misiones y años de mission_log, diario, decisiones, eventos y
+canjes. Cada benchmark reproduce en frío lo que paga un rerun tras invalidar
+sus vistas memoizadas (ver lifegame.state), contra un MemoryBackend para
+medir el costo de (de)serializar sin red.
+"""
+
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List
+
+from lifegame.agenda import agenda_missions, build_agenda
+from lifegame.columnar import column_stats, heatmap, MissionLogColumns, streaks
+from lifegame.defaults import (
+    DEFAULT_ATTRIBUTES,
+    DEFAULT_CONFIG,
+    DEFAULT_PROFILE,
+    DEFAULT_REWARDS,
+    USER_FILES,
+)
+from lifegame.engine import (
+    completions_index,
+    decision_stats,
+    events_index,
+    HistoryIndex,
+    missions_for_date,
+    month_summaries,
+    recompute_profile,
+    UserState,
+)
+from lifegame.render import build_month_grid_html
+from lifegame.schema import upgrade_dataset
+from lifegame.search import searchable_documents, SearchIndex
+from lifegame.storage import MemoryBackend, read_user_data, serialize_user_file, write_user_data
+
+BENCH_USER = "bench"
+
+# Dataset por defecto, con el que se calibraron los umbrales
+DEFAULT_MISSIONS = 20
+DEFAULT_YEARS = 3
+DEFAULT_SEED = 42
+DEFAULT_END = date(2026, 1, 1)
+
+# Mediana máxima (ms) por benchmark para el dataset por defecto; ~5x lo medido
+# en un portátil, para que solo salten regresiones de complejidad
+THRESHOLDS_MS = {
+    "load_all_user_data": 250,
+    "save_all_user_data": 300,
+    "today_missions": 10,
+    "month_view": 20,
+    "stats_tab": 10,
+    "columnar_stats": 10,
+    "recompute_profile": 25,
+    "search_index_build": 600,
+    "search_query": 10,
+    "history_page": 5,
+}
+
+# Tolerancia frente a un baseline guardado con --save; diferencias de menos
+# de BASELINE_MIN_DELTA_MS son ruido del reloj en los benchmarks de <1 ms
+BASELINE_TOLERANCE = 1.25
+BASELINE_MIN_DELTA_MS = 1.0
+
+# =========================================================
+#  GENERADOR DE DATOS
+# =========================================================
+
+WORDS = (
+    "hoy entrené temprano y luego estudié algoritmos mientras pensaba en el proyecto "
+    "la reunión con el equipo fue productiva aunque dormí poco y me costó concentrarme "
+    "salí a caminar leí un capítulo del libro cociné algo sano y llamé a mi familia "
+    "meditación ejercicio lectura escritura ahorro inversión música dibujo idiomas código"
+).split()
+
+MISSION_TYPES = [
+    ("daily", "everyday"),
+    ("daily", "everyday"),
+    ("daily", "weekdays"),
+    ("daily", "weekends"),
+    ("weekly", "monday"),
+    ("weekly", "tuesday"),
+    ("monthly", "first_day"),
+    ("epic", None),
+]
+
+def _text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+def _hex_id(rng: random.Random, prefix: str) -> str:
+    return f"{prefix}_{rng.getrandbits(64):016x}"
+
+def _timestamp(day: date, rng: random.Random) -> str:
+    return datetime(day.year, day.month, day.day, rng.randint(6, 22), rng.randint(0, 59), rng.randint(0, 59)).isoformat()
+
+def generate_user(
+    missions: int = DEFAULT_MISSIONS,
+    years: int = DEFAULT_YEARS,
+    seed: int = DEFAULT_SEED,
+    end: date = DEFAULT_END,
+) -> Dict[str, Dict]:
+    """
+    Datasets de un usuario sintético, {clave: {"data": ..., "sha": None}},
+    con historial diario entre `end - years` y `end`. Determinista por semilla.
+    """
+    rng = random.Random(seed)
+    start = end - timedelta(days=365 * years)
+    attribute_ids = [attr["id"] for attr in DEFAULT_ATTRIBUTES["attributes"]]
+
+    mission_list = []
+    for i in range(missions):
+        mission_type, recurrence = MISSION_TYPES[i % len(MISSION_TYPES)]
+        mission_start = start + timedelta(days=rng.randint(0, 365 * years // 2))
+        ends = mission_type == "epic" or rng.random() < 0.2
+        mission_list.append({
+            "id": f"m_{i:04d}",
+            "name": f"Misión {i} {rng.choice(WORDS)}",
+            "description": _text(rng, 8),
+            "type": mission_type,
+            "base_xp": rng.choice([5, 10, 15, 20, 30, 50]),
+            "tokens_reward": rng.randint(1, 5),
+            "attribute_id": rng.choice(attribute_ids),
+            "start_date": mission_start.isoformat(),
+            "end_date": (mission_start + timedelta(days=rng.randint(30, 365))).isoformat() if ends else None,
+            "recurrence": recurrence,
+            "priority": rng.choice(["low", "medium", "high"]),
+            "time_cost": rng.choice([10, 15, 30, 45, 60]),
+        })
+
+    mission_log, journal, decisions, events, redemptions = [], [], [], [], []
+    rewards = [dict(r) for r in DEFAULT_REWARDS["rewards"]]
+    tokens = 0
+    day = start
+    while day < end:
+        for mission in missions_for_date(mission_list, {}, day):
+            if rng.random() < 0.6:
+                mission_log.append({
+                    "mission_id": mission["id"],
+                    "date": day.isoformat(),
+                    "status": "completed",
+                    "xp_awarded": mission["base_xp"],
+                    "tokens_awarded": mission["tokens_reward"],
+                    "timestamp": _timestamp(day, rng),
+                    "notes": _text(rng, 4) if rng.random() < 0.2 else "",
+                })
+                tokens += mission["tokens_reward"]
+        if rng.random() < 0.7:
+            journal.append({
+                "id": _hex_id(rng, "j"),
+                "date": day.isoformat(),
+                "timestamp": _timestamp(day, rng),
+                "text": _text(rng, rng.randint(20, 120)),
+                "attribute_ids": rng.sample(attribute_ids, rng.randint(0, 2)),
+                "xp_awarded": rng.choice([0, 0, 5, 10]),
+                "mood": rng.choice(["😔", "😐", "😊", "🤩"]),
+            })
+        if rng.random() < 0.3:
+            payoffs = [(rng.randint(0, 10), rng.randint(0, 10)) for _ in range(2)]
+            name_a, name_b = _text(rng, 3), _text(rng, 3)
+            regret = rng.random() < 0.2
+            decisions.append({
+                "id": _hex_id(rng, "d"),
+                "timestamp": _timestamp(day, rng),
+                "situation": _text(rng, 12),
+                "options": [
+                    {"name": name, "short_term_payoff": s, "long_term_payoff": lt, "total_score": s + lt}
+                    for name, (s, lt) in zip((name_a, name_b), payoffs)
+                ],
+                "chosen_option": rng.choice([f"A: {name_a}", f"B: {name_b}", "Todavía no decido"]),
+                "reason": _text(rng, 10),
+                "regret_check": True if regret else None,
+                "regret_notes": "Arrepentimiento registrado" if regret else None,
+            })
+        for _ in range(rng.choice([0, 0, 0, 1, 1, 2])):
+            hour = rng.randint(7, 20)
+            events.append({
+                "id": _hex_id(rng, "ev"),
+                "title": _text(rng, 3),
+                "date": day.isoformat(),
+                "start_time": f"{hour:02d}:00",
+                "end_time": f"{hour + 1:02d}:00",
+                "notes": "",
+                "type": "event",
+            })
+        reward = rng.choice(rewards)
+        if rng.random() < 0.15 and tokens >= reward["cost_tokens"]:
+            tokens -= reward["cost_tokens"]
+            redemptions.append({
+                "id": _hex_id(rng, "red"),
+                "reward_id": reward["id"],
+                "date": day.isoformat(),
+                "tokens_spent": reward["cost_tokens"],
+                "timestamp": _timestamp(day, rng),
+            })
+        day += timedelta(days=1)
+
+    profile = dict(DEFAULT_PROFILE, created_date=start.isoformat(), last_active_date=(end - timedelta(days=1)).isoformat())
+    datasets = {
+        "profile": {"data": profile, "sha": None},
+        "config": {"data": dict(DEFAULT_CONFIG), "sha": None},
+        "attributes": {"data": {"attributes": [dict(a) for a in DEFAULT_ATTRIBUTES["attributes"]]}, "sha": None},
+        "missions": {"data": {"missions": mission_list}, "sha": None},
+        "calendar": {"data": {"events": events}, "sha": None},
+        "rewards": {"data": {"rewards": rewards, "redemptions": redemptions}, "sha": None},
+        "mission_log": {"data": mission_log, "sha": None},
+        "journal": {"data": journal, "sha": None},
+        "decisions": {"data": decisions, "sha": None},
+    }
+    recompute_profile(UserState(BENCH_USER, datasets))
+    # En la versión actual del esquema, como lo que escribe la app
+    for key, dataset in datasets.items():
+        upgrade_dataset(key, dataset["data"])
+    return datasets
+
+def dataset_sizes(datasets: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Registros y KB serializados por archivo"""
+    sizes = {}
+    for fname, key in USER_FILES.items():
+        data = datasets[key]["data"]
+        records = len(data) if isinstance(data, list) else sum(len(v) for v in data.values() if isinstance(v, list))
+        sizes[key] = {"records": records, "kb": round(len(serialize_user_file(fname, data).encode("utf-8")) / 1024, 1)}
+    return sizes
+
+# =========================================================
+#  BENCHMARKS
+# =========================================================
+
+def month_view(datasets: Dict[str, Dict], today: date) -> str:
+    """Lo que calcula state.month_grid_html con las cachés vacías"""
+    missions = datasets["missions"]["data"]["missions"]
+    completions = completions_index(datasets["mission_log"]["data"])
+    events = events_index(datasets["calendar"]["data"]["events"])
+
+    def day_missions(day: date) -> List[Dict]:
+        # state.get_missions_for_date sin su memo
+        return missions_for_date(missions, completions.get(day.isoformat(), {}), day)
+
+    summaries = month_summaries(today.year, today.month, 0, day_missions, events)
+    return build_month_grid_html(today.year, today.month, summaries, today, 0)
+
+def build_benchmarks(datasets: Dict[str, Dict], today: date) -> Dict[str, Callable]:
+    """{nombre: función sin argumentos} sobre los datasets dados"""
+    backend = MemoryBackend()
+    write_user_data(BENCH_USER, datasets, backend=backend)
+    state = UserState(BENCH_USER, datasets)
+    index = SearchIndex()
+    index.sync(searchable_documents(datasets))
+    query = " ".join(WORDS[:3])
+    log_columns = MissionLogColumns.from_records(datasets["mission_log"]["data"])
+    columns_text = log_columns.to_text()
+
+    # La agenda se precalcula al cambiar de día; el rerun solo la marca (state.get_today_missions)
+    agenda = build_agenda(state, today)
+
+    def today_missions():
+        completions = completions_index(datasets["mission_log"]["data"])
+        return agenda_missions(agenda, completions.get(today.isoformat(), {}))
+
+    def stats_tab():
+        # Como la pestaña: columnas que el hub ya tiene en memoria (UserHub.columns)
+        return column_stats(log_columns), decision_stats(datasets["decisions"]["data"])
+
+    def columnar_stats():
+        # Desde mission_log.cols guardado: sin parsear el JSONL
+        columns = MissionLogColumns.from_text(columns_text)
+        year = heatmap(columns, today - timedelta(days=364), today + timedelta(days=1))
+        return column_stats(columns), streaks(columns, today), year
+
+    def search_index_build():
+        fresh = SearchIndex()
+        fresh.sync(searchable_documents(datasets))
+        return fresh
+
+    def history_page():
+        return HistoryIndex(datasets["journal"]["data"], "timestamp").newest_first()
+
+    return {
+        "load_all_user_data": lambda: read_user_data(BENCH_USER, backend),
+        "save_all_user_data": lambda: write_user_data(BENCH_USER, datasets, backend=backend),
+        "today_missions": today_missions,
+        "month_view": lambda: month_view(datasets, today),
+        "stats_tab": stats_tab,
+        "columnar_stats": columnar_stats,
+        "recompute_profile": lambda: recompute_profile(state),
+        "search_index_build": search_index_build,
+        "search_query": lambda: index.search(query),
+        "history_page": history_page,
+    }
+
+def measure(fn: Callable, repeat: int) -> Dict[str, float]:
+    """Tiempos (ms) de `repeat` llamadas y pico de memoria (KB) de una más"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    # Aparte: tracemalloc hace todo varias veces más lento
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "min_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "max_ms": round(max(times), 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+def run_benchmarks(
+    missions: int = DEFAULT_MISSIONS,
+    years: int = DEFAULT_YEARS,
+    seed: int = DEFAULT_SEED,
+    repeat: int = 5,
+    only: List[str] | None = None,
+) -> Dict:
+    """Genera el dataset, corre los benchmarks y devuelve el reporte"""
+    started = time.perf_counter()
+    datasets = generate_user(missions, years, seed)
+    generate_ms = (time.perf_counter() - started) * 1000
+    today = DEFAULT_END - timedelta(days=1)
+    benchmarks = build_benchmarks(datasets, today)
+    return {
+        "params": {"missions": missions, "years": years, "seed": seed, "repeat": repeat},
+        "generate_ms": round(generate_ms, 1),
+        "sizes": dataset_sizes(datasets),
+        "results": {
+            name: measure(fn, repeat)
+            for name, fn in benchmarks.items()
+            if not only or name in only
+        },
+    }
+
+def check_report(report: Dict, baseline: Dict | None = None, tolerance: float = BASELINE_TOLERANCE) -> List[str]:
+    """
+    Regresiones del reporte: medianas por encima de THRESHOLDS_MS (solo con
+    el dataset por defecto) o de `tolerance` × la mediana del baseline.
+    """
+    failures = []
+    params = report["params"]
+    default_size = (params["missions"], params["years"], params["seed"]) == (DEFAULT_MISSIONS, DEFAULT_YEARS, DEFAULT_SEED)
+    for name, result in report["results"].items():
+        median = result["median_ms"]
+        limit = THRESHOLDS_MS.get(name)
+        if default_size and limit is not None and median > limit:
+            failures.append(f"{name}: {median:.1f} ms > umbral {limit} ms")
+        if baseline is None:
+            continue
+        previous = baseline["results"].get(name)
+        if previous and median > previous["median_ms"] * tolerance and median - previous["median_ms"] > BASELINE_MIN_DELTA_MS:
+            failures.append(f"{name}: {median:.1f} ms > {tolerance:.2f} × baseline {previous['median_ms']:.1f} ms")
+    return failures
+
+def format_report(report: Dict) -> str:
+    params = report["params"]
+    lines = [f"Usuario sintético: {params['missions']} misiones, {params['years']} años, semilla {params['seed']} (generado en {report['generate_ms']:.0f} ms)"]
+    lines += [f"  {key:<12} {size['records']:>7} registros {size['kb']:>9.1f} KB" for key, size in report["sizes"].items()]
+    lines.append("")
+    lines.append(f"{'benchmark':<22} {'min':>9} {'mediana':>9} {'max':>9} {'pico KB':>9} {'umbral':>8}")
+    for name, result in report["results"].items():
+        limit = THRESHOLDS_MS.get(name)
+        lines.append(
+            f"{name:<22} {result['min_ms']:>9.2f} {result['median_ms']:>9.2f} {result['max_ms']:>9.2f} "
+            f"{result['peak_kb']:>9.1f} {limit if limit is not None else '-':>8}"
+        )
+    return "\n".join(lines)
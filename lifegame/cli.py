@@ -0,0 +1,449 @@
+"""
+CLI del motor de juego, sin Streamlit.
+
+    python -m lifegame [--data-dir DIR] stats USER [--json] [--heatmap]
+    python -m lifegame [--data-dir DIR] recompute (USER | --all) [--dry-run]
+    python -m lifegame [--data-dir DIR] replay USER [--log FILE] [--write]
+    python -m lifegame [--data-dir DIR] complete USER CSV [--dry-run]
+    python -m lifegame bench [--missions N] [--years N] [--check] [--baseline FILE] [--save FILE]
+    python -m lifegame mock-github [--port N] [--latency-ms MS] [--rate-limit N] [--fail-rate P]
+    python -m lifegame loadtest [--sessions N] [--concurrency N] [--users N] [--backend local|mock]
+    python -m lifegame rebalance [--drain OWNER/REPO@RAMA ...] [--dry-run] [--overwrite]
+    python -m lifegame [--data-dir DIR] export (USER ... | --all) [--format zip|ndjson.gz|ndjson] [--since FECHA] [-o FILE]
+    python -m lifegame [--data-dir DIR] import FILE [--user USER ...] [--as USER] [--replace] [--skip-invalid] [--dry-run]
+    python -m lifegame [--data-dir DIR] columns (USER ... | --all) [--dry-run]
+
+Sin --data-dir (ni LIFEGAME_DATA_DIR) se usa el repo de GitHub configurado
+con LIFEGAME_GITHUB_TOKEN y LIFEGAME_GITHUB_REPO (y LIFEGAME_GITHUB_SHARDS
+si los datos están repartidos entre varios repos o ramas).
+"""
+
+import argparse
+import csv
+import json
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import List
+
+from lifegame import bench
+from lifegame.agenda import game_day
+from lifegame.backup import backend_files, EXPORT_FORMATS, export_filename, import_backup, write_export
+from lifegame.columnar import column_stats, heatmap, load_columns, streaks, write_columns
+from lifegame.engine import (
+    complete_mission,
+    completions_index,
+    recompute_profile,
+    UserState,
+)
+from lifegame.sharding import hash_ring, parse_shards, plan_moves
+from lifegame.storage import (
+    get_backend,
+    github_ensure_branch,
+    github_list_users,
+    github_shards,
+    GitHubBackend,
+    LocalBackend,
+    migrate_user,
+    parse_user_file,
+    read_user_data,
+    write_user_data,
+)
+
+# Archivos que modifica recalcular o completar misiones
+PROFILE_KEYS = ["profile", "attributes"]
+
+def load_state(backend, username: str) -> UserState:
+    return UserState(username, read_user_data(username, backend))
+
+def print_profile(state: UserState):
+    profile = state["profile"]["data"]
+    print(f"  Nivel {profile['current_level']} · {profile['current_xp']} XP · {profile['total_tokens']} tokens")
+
+# Mapa de calor de `stats --heatmap`: semanas y un carácter por día, de
+# ninguna misión completada a las del día con más, como en GitHub
+HEATMAP_WEEKS = 52
+HEATMAP_LEVELS = "·░▒▓█"
+WEEKDAY_LABELS = "LMXJVSD"
+
+def format_heatmap(counts: List[int], start: date) -> List[str]:
+    """Una fila por día de la semana (lunes primero) y una columna por semana, como en GitHub"""
+    offset = start.weekday()
+    weeks = (offset + len(counts) + 6) // 7
+    grid = [[" "] * weeks for _ in range(7)]
+    top = max(counts, default=0) or 1
+    for n, count in enumerate(counts):
+        position = offset + n
+        grid[position % 7][position // 7] = HEATMAP_LEVELS[-(-count * (len(HEATMAP_LEVELS) - 1) // top)]
+    return [f"  {label} {''.join(row)}" for label, row in zip(WEEKDAY_LABELS, grid)]
+
+def cmd_stats(backend, args) -> int:
+    state = UserState(args.user, read_user_data(args.user, backend, ["profile", "config", "journal", "decisions"]))
+    # El mission_log sale de su copia columnar si está al día (ver
+    # lifegame.columnar); si no, se reconstruye en memoria sin guardarla:
+    # `stats` solo lee, y la copia la regenera `columns`
+    columns, _ = load_columns(args.user, backend)
+    today = game_day(datetime.now(), state["config"]["data"]["daily_reset_time"])
+    stats = column_stats(columns)
+    streak = streaks(columns, today)
+    profile = state["profile"]["data"]
+    stats.update({
+        "total_journal": len(state["journal"]["data"]),
+        "total_decisions": len(state["decisions"]["data"]),
+        "current_streak": streak["current"],
+        "longest_streak": streak["longest"],
+        "level": profile["current_level"],
+        "current_xp": profile["current_xp"],
+        "total_tokens": profile["total_tokens"],
+    })
+    start = today - timedelta(days=today.weekday() + 7 * (HEATMAP_WEEKS - 1))
+    counts = heatmap(columns, start, today + timedelta(days=1)) if args.heatmap else None
+    if args.json:
+        if counts is not None:
+            stats["heatmap"] = {"start": start.isoformat(), "counts": counts}
+        print(json.dumps(stats, indent=2))
+        return 0
+    print(f"{args.user}")
+    print_profile(state)
+    print(f"  Días activos: {stats['days_active']}")
+    print(f"  Misiones completadas: {stats['total_missions']} ({stats['avg_missions']:.1f}/día)")
+    print(f"  Racha: {stats['current_streak']} días (máxima {stats['longest_streak']})")
+    print(f"  XP total (misiones): {stats['total_xp']}")
+    print(f"  Tokens ganados: {stats['total_tokens_earned']}")
+    print(f"  Entradas de diario: {stats['total_journal']}")
+    print(f"  Decisiones: {stats['total_decisions']}")
+    if counts is not None:
+        print(f"  Misiones completadas por día desde {start.isoformat()}:")
+        print("\n".join(format_heatmap(counts, start)))
+    return 0
+
+def cmd_recompute(backend, args) -> int:
+    users = backend.list_users() if args.all else [args.user]
+    failed = 0
+    for username in users:
+        state = load_state(backend, username)
+        result = recompute_profile(state)
+        print(f"{username}: {result['replayed']} misiones reproducidas")
+        print_profile(state)
+        if not args.dry_run and not write_user_data(username, state.datasets, PROFILE_KEYS, backend):
+            failed += 1
+    return 1 if failed else 0
+
+def cmd_replay(backend, args) -> int:
+    state = load_state(backend, args.user)
+    if args.log:
+        with open(args.log, encoding="utf-8") as f:
+            state["mission_log"]["data"] = parse_user_file("mission_log.jsonl", f.read())
+    result = recompute_profile(state)
+    print(f"{args.user}: {result['replayed']} misiones reproducidas")
+    print_profile(state)
+    if not args.write:
+        return 0
+    keys = PROFILE_KEYS + (["mission_log"] if args.log else [])
+    return 0 if write_user_data(args.user, state.datasets, keys, backend) else 1
+
+def cmd_complete(backend, args) -> int:
+    state = load_state(backend, args.user)
+    completed = completions_index(state["mission_log"]["data"])
+    added = skipped = 0
+    with open(args.csv, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            mission_id = row["mission_id"].strip()
+            day = date.fromisoformat(row["date"].strip())
+            if mission_id in completed.get(day.isoformat(), {}):
+                skipped += 1
+                continue
+            try:
+                log_entry = complete_mission(state, mission_id, day, (row.get("notes") or "").strip())
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+            completed.setdefault(day.isoformat(), {})[mission_id] = log_entry
+            added += 1
+    print(f"{args.user}: {added} misiones completadas, {skipped} ya registradas")
+    print_profile(state)
+    if args.dry_run or not added:
+        return 0
+    keys = PROFILE_KEYS + ["mission_log"]
+    return 0 if write_user_data(args.user, state.datasets, keys, backend) else 1
+
+def cmd_bench(backend, args) -> int:
+    # Siempre sobre un MemoryBackend con datos sintéticos; `backend` no se usa
+    report = bench.run_benchmarks(args.missions, args.years, args.seed, args.repeat, args.only)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2) if args.json else bench.format_report(report))
+    if not (args.check or args.baseline):
+        return 0
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        dataset = ("missions", "years", "seed")
+        if any(baseline["params"][k] != report["params"][k] for k in dataset):
+            print("Error: el baseline se generó con otros parámetros", file=sys.stderr)
+            return 2
+    failures = bench.check_report(report, baseline, args.tolerance)
+    for failure in failures:
+        print(f"REGRESIÓN {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+def cmd_mock_github(backend, args) -> int:
+    # Import diferido: http.server y el generador solo hacen falta aquí
+    from lifegame.mockgithub import local_users, MockGitHubServer, synthetic_users
+    server = MockGitHubServer(
+        args.host,
+        args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit,
+        rate_window_seconds=args.rate_window,
+        fail_rate=args.fail_rate,
+        seed=args.seed,
+        default_repo=args.repo,
+    )
+    users = local_users(args.data_dir) if args.data_dir else {}
+    users.update(synthetic_users(args.synthetic_users, args.missions, args.years))
+    if users:
+        server.seed_users(args.repo, users)
+    print(f"Mock de GitHub en {server.base_url} (repo {args.repo}, {len(users)} usuarios precargados)")
+    print(f"  LIFEGAME_API_BASE={server.base_url} LIFEGAME_GITHUB_REPO={args.repo} LIFEGAME_GITHUB_TOKEN=<cualquiera>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+def cmd_loadtest(backend, args) -> int:
+    # Import diferido: carga Streamlit y su AppTest
+    from lifegame.loadtest import format_report, run_load_test
+    mock_options = {}
+    if args.backend == "mock":
+        mock_options = {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "fail_rate": args.fail_rate,
+            "seed": 0,
+            "limit_scale": args.limit_scale,
+        }
+    report = run_load_test(
+        sessions=args.sessions,
+        concurrency=args.concurrency,
+        users=args.users,
+        backend=args.backend,
+        missions=args.missions,
+        years=args.years,
+        missions_to_complete=args.complete,
+        think_seconds=args.think_ms / 1000,
+        data_dir=args.data_dir,
+        **mock_options,
+    )
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 1 if report["sessions_failed"] else 0
+
+def cmd_rebalance(backend, args) -> int:
+    if not isinstance(backend, GitHubBackend):
+        print("Error: rebalance solo aplica al backend de GitHub (sin --data-dir)", file=sys.stderr)
+        return 2
+    shards = github_shards()
+    ring = hash_ring(tuple(shards))
+    drained = [shard for shard in parse_shards(args.drain or []) if shard not in shards]
+    placement = {}
+    for shard in shards + drained:
+        for username in github_list_users(shard):
+            placement.setdefault(username, []).append(shard)
+
+    counts = Counter(ring.shard_for(username) for username in placement)
+    for shard in shards:
+        print(f"  {shard}: {counts[shard]} usuarios")
+    moves = plan_moves(placement, ring)
+    for username, source, target in moves:
+        print(f"  {username}: {source} -> {target}")
+    print(f"{len(moves)} carpetas de {len(placement)} usuarios fuera de su shard")
+    if args.dry_run or not moves:
+        return 0
+
+    for shard in shards:
+        github_ensure_branch(shard)
+    failed = [(username, source) for username, source, target in moves if not migrate_user(username, source, target, args.overwrite)]
+    for username, source in failed:
+        print(f"Error: no se pudo mover {username} desde {source}", file=sys.stderr)
+    return 1 if failed else 0
+
+def cmd_export(backend, args) -> int:
+    users = backend.list_users() if args.all else args.users
+    if not users:
+        print("Error: indicar usuarios o --all", file=sys.stderr)
+        return 2
+    since = args.since.isoformat() if args.since else None
+    output = args.output or export_filename(args.format, since, "todos" if args.all else "_".join(users))
+    # Un usuario y un archivo a la vez: la memoria no crece con la cantidad de usuarios
+    sources = ((username, backend_files(username, backend)) for username in users)
+    if output == "-":
+        manifest = write_export(sys.stdout.buffer, sources, args.format, since)
+    else:
+        with open(output, "wb") as f:
+            manifest = write_export(f, sources, args.format, since)
+    for username, counts in manifest["users"].items():
+        records = sum(n for fname, n in counts.items() if fname.endswith(".jsonl"))
+        print(f"  {username}: {len(counts)} archivos, {records} registros de historial", file=sys.stderr)
+    if output != "-":
+        print(f"Backup escrito en {output}", file=sys.stderr)
+    return 0
+
+def cmd_import(backend, args) -> int:
+    try:
+        with open(args.file, "rb") as f:
+            report = import_backup(f, backend, args.replace, args.users, args.target, args.skip_invalid, args.dry_run)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    for error in report["errors"]:
+        print(f"  {error}", file=sys.stderr)
+    if report["invalid"] > len(report["errors"]):
+        print(f"  ... y {report['invalid'] - len(report['errors'])} más", file=sys.stderr)
+    for username, counts in report["users"].items():
+        status = "con errores" if username in report["failed"] else ("válido" if args.dry_run else "importado")
+        documents = [fname for fname in counts if not fname.endswith(".jsonl")]
+        print(f"{username}: {status}" + (f" ({', '.join(documents)})" if documents else ""))
+        for fname, c in counts.items():
+            if fname.endswith(".jsonl"):
+                print(f"  {fname}: {c['imported']} nuevos, {c['duplicates']} repetidos")
+    if report["written"] and not args.replace and not args.dry_run:
+        print("El perfil no se recalcula al fusionar: ver `recompute`")
+    return 1 if report["failed"] else 0
+
+def cmd_columns(backend, args) -> int:
+    users = backend.list_users() if args.all else args.users
+    if not users:
+        print("Error: indicar usuarios o --all", file=sys.stderr)
+        return 2
+    failed = 0
+    for username in users:
+        columns, fresh = load_columns(username, backend)
+        if fresh:
+            status = "al día"
+        elif args.dry_run:
+            status = "desactualizado"
+        elif write_columns(username, columns, backend):
+            status = "reconstruido"
+        else:
+            status = "error al guardar"
+            failed += 1
+        print(f"{username}: {len(columns)} registros, {status}")
+    return 1 if failed else 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="lifegame", description="Life RPG: motor de juego sin interfaz")
+    parser.add_argument("--data-dir", help="directorio local con data/<usuario>/ (por defecto LIFEGAME_DATA_DIR o GitHub)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("stats", help="estadísticas de un usuario")
+    p.add_argument("user")
+    p.add_argument("--json", action="store_true", help="salida en JSON")
+    p.add_argument("--heatmap", action="store_true", help=f"misiones completadas por día en las últimas {HEATMAP_WEEKS} semanas")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("recompute", help="recalcula nivel, XP y tokens desde el historial")
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument("user", nargs="?")
+    target.add_argument("--all", action="store_true", help="todos los usuarios")
+    p.add_argument("--dry-run", action="store_true", help="no guardar los cambios")
+    p.set_defaults(func=cmd_recompute)
+
+    p = sub.add_parser("replay", help="reproduce un mission_log (el guardado o --log) sobre el perfil")
+    p.add_argument("user")
+    p.add_argument("--log", help="archivo JSONL a reproducir en lugar del mission_log guardado")
+    p.add_argument("--write", action="store_true", help="guardar el resultado")
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser("complete", help="completa misiones en lote desde un CSV (mission_id,date,notes)")
+    p.add_argument("user")
+    p.add_argument("csv")
+    p.add_argument("--dry-run", action="store_true", help="no guardar los cambios")
+    p.set_defaults(func=cmd_complete)
+
+    p = sub.add_parser("bench", help="benchmarks de los caminos calientes con un usuario sintético")
+    p.add_argument("--missions", type=int, default=bench.DEFAULT_MISSIONS, help="misiones del usuario sintético")
+    p.add_argument("--years", type=int, default=bench.DEFAULT_YEARS, help="años de historial")
+    p.add_argument("--seed", type=int, default=bench.DEFAULT_SEED)
+    p.add_argument("--repeat", type=int, default=5, help="repeticiones por benchmark")
+    p.add_argument("--only", nargs="+", choices=list(bench.THRESHOLDS_MS), help="correr solo estos benchmarks")
+    p.add_argument("--json", action="store_true", help="reporte en JSON")
+    p.add_argument("--save", help="guardar el reporte JSON (para usarlo como --baseline)")
+    p.add_argument("--check", action="store_true", help="fallar si una mediana supera su umbral")
+    p.add_argument("--baseline", help="reporte previo contra el que comparar las medianas")
+    p.add_argument("--tolerance", type=float, default=bench.BASELINE_TOLERANCE, help="factor tolerado frente al baseline")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("mock-github", help="servidor local que imita la API de GitHub (con --data-dir lo precarga)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--repo", default="demo/lifegame", help="owner/repo precargado")
+    p.add_argument("--latency-ms", type=float, default=0, help="latencia fija por petición")
+    p.add_argument("--jitter-ms", type=float, default=0, help="latencia extra aleatoria (uniforme)")
+    p.add_argument("--rate-limit", type=int, default=5000, help="peticiones por token y ventana")
+    p.add_argument("--rate-window", type=int, default=3600, help="segundos de la ventana del rate limit")
+    p.add_argument("--fail-rate", type=float, default=0.0, help="probabilidad de responder 500/502/503")
+    p.add_argument("--seed", type=int, help="semilla de la latencia y los fallos")
+    p.add_argument("--synthetic-users", type=int, default=0, help="precargar N usuarios sintéticos bench_<i>")
+    p.add_argument("--missions", type=int, default=bench.DEFAULT_MISSIONS, help="misiones de los usuarios sintéticos")
+    p.add_argument("--years", type=int, default=bench.DEFAULT_YEARS, help="años de historial de los usuarios sintéticos")
+    p.set_defaults(func=cmd_mock_github)
+
+    p = sub.add_parser("loadtest", help="sesiones simuladas concurrentes contra la app (usuarios sintéticos)")
+    p.add_argument("--sessions", type=int, default=20, help="sesiones a simular")
+    p.add_argument("--concurrency", type=int, default=5, help="sesiones a la vez")
+    p.add_argument("--users", type=int, help="usuarios distintos (por defecto uno por sesión)")
+    p.add_argument("--backend", choices=["local", "mock"], default="local", help="directorio local (o --data-dir) o mock de GitHub")
+    p.add_argument("--missions", type=int, default=bench.DEFAULT_MISSIONS, help="misiones de cada usuario")
+    p.add_argument("--years", type=int, default=1, help="años de historial de cada usuario")
+    p.add_argument("--complete", type=int, default=3, help="misiones a completar por sesión")
+    p.add_argument("--think-ms", type=float, default=0, help="pausa antes de cada interacción")
+    p.add_argument("--latency-ms", type=float, default=50, help="latencia del mock de GitHub")
+    p.add_argument("--jitter-ms", type=float, default=25, help="latencia extra aleatoria del mock")
+    p.add_argument("--fail-rate", type=float, default=0.0, help="probabilidad de 5xx del mock")
+    p.add_argument("--limit-scale", type=float, default=10.0, help="multiplica los límites de peticiones a GitHub (1 = los reales)")
+    p.add_argument("--json", action="store_true", help="reporte en JSON")
+    p.set_defaults(func=cmd_loadtest)
+
+    p = sub.add_parser("rebalance", help="mueve data/<usuario>/ al shard que le toca según LIFEGAME_GITHUB_SHARDS")
+    p.add_argument("--drain", action="append", metavar="OWNER/REPO@RAMA", help="shard retirado del que sacar usuarios (repetible)")
+    p.add_argument("--dry-run", action="store_true", help="solo muestra el plan")
+    p.add_argument("--overwrite", action="store_true", help="pisa archivos del destino con contenido distinto")
+    p.set_defaults(func=cmd_rebalance)
+
+    p = sub.add_parser("export", help="backup de uno o varios usuarios en zip o NDJSON")
+    target = p.add_mutually_exclusive_group()
+    target.add_argument("users", nargs="*", default=[], metavar="user")
+    target.add_argument("--all", action="store_true", help="todos los usuarios")
+    p.add_argument("--format", choices=EXPORT_FORMATS, default="zip")
+    p.add_argument("--since", type=date.fromisoformat, help="solo el historial desde esta fecha (AAAA-MM-DD)")
+    p.add_argument("--output", "-o", help="archivo de salida ('-' para stdout; por defecto lifegame_<usuarios>_<fecha>.<formato>)")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="restaura un backup (zip, NDJSON o JSON 1.0) validándolo registro a registro")
+    p.add_argument("file")
+    p.add_argument("--user", action="append", dest="users", metavar="USER", help="importar solo este usuario del backup (repetible)")
+    p.add_argument("--as", dest="target", metavar="USER", help="importar el único usuario del backup (o un JSON 1.0) con este nombre")
+    p.add_argument("--replace", action="store_true", help="dejar los archivos como en el backup en lugar de fusionar")
+    p.add_argument("--skip-invalid", action="store_true", help="omitir los registros inválidos en lugar de no importar al usuario")
+    p.add_argument("--dry-run", action="store_true", help="solo validar y contar")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("columns", help="reconstruye mission_log.cols (copia columnar para estadísticas) si no está al día")
+    target = p.add_mutually_exclusive_group()
+    target.add_argument("users", nargs="*", default=[], metavar="user")
+    target.add_argument("--all", action="store_true", help="todos los usuarios")
+    p.add_argument("--dry-run", action="store_true", help="solo informa cuáles están desactualizados")
+    p.set_defaults(func=cmd_columns)
+
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    backend = LocalBackend(args.data_dir) if args.data_dir else get_backend()
+    return args.func(backend, args)
@@ -0,0 +1,305 @@
+"""
+Formato columnar compacto del mission_log para estadísticas.
+
+El mission_log.jsonl repite en cada línea las claves y la fecha ISO
+completa, y cada análisis lo vuelve a parsear a dicts. MissionLogColumns
+guarda lo que usan las estadísticas como arrays de enteros empaquetados:
+misión y estado codificados contra un diccionario, fecha como ordinal de
+día (UNDATED para las líneas antiguas sin fecha), XP y tokens. Las
+columnas se ven como ndarrays de NumPy (dependencia de Streamlit y de
+requirements.txt) sin copiar, con np.frombuffer sobre el mismo buffer, y
+las estadísticas, rachas y el mapa de calor se calculan vectorizados; sin
+NumPy se usan bucles sobre los mismos arrays, que no son más rápidos que
+recorrer los dicts.
+
+El JSONL sigue siendo la fuente de verdad. La copia columnar se guarda al
+lado como mission_log.cols con la SHA del JSONL del que salió; load_columns
+compara esa SHA con la del listado de la carpeta (sin descargar el JSONL)
+y solo reconstruye desde el JSONL si no coincide. UserHub.columns la
+mantiene al día en memoria agregando los registros nuevos con append, y
+UserHub.save la guarda junto con cada mission_log distinto; `columns` de la
+CLI regenera las que cambiaron por otras vías. Este módulo no importa
+Streamlit.
+"""
+
+import base64
+import json
+import sys
+import zlib
+from array import array
+from datetime import date
+from typing import Dict, Iterable, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from lifegame.storage import parse_user_file
+
+COLUMNS_FILE = "mission_log.cols"
+COLUMNS_VERSION = 2
+MAGIC = b"LGCOLS\x00\x01"
+
+# (nombre, typecode de array); los de 1 byte al final para que las columnas
+# de 4 bytes queden alineadas en el buffer
+COLUMNS = (("mission", "i"), ("day", "i"), ("xp", "i"), ("tokens", "i"), ("status", "b"))
+DTYPES = {"i": "<i4", "b": "i1"}
+ALIGNMENT = 8
+
+# Día de las líneas antiguas sin fecha (los ordinales empiezan en 1): cuentan
+# como registros y como un día activo más, igual que en engine.system_stats,
+# pero no para rachas ni para el mapa de calor
+UNDATED = 0
+
+def _padding(n: int) -> int:
+    return -n % ALIGNMENT
+
+class MissionLogColumns:
+    """
+    Columnas del mission_log, en el orden del JSONL; las líneas antiguas que
+    no tienen fecha (ver lifegame.schema) llevan el día UNDATED. `missions` y `statuses` son
+    los diccionarios: la columna guarda el índice en ellos.
+    Las columnas cargadas con from_bytes son vistas de solo lectura del
+    buffer hasta el primer append, que las copia a arrays propios.
+    """
+
+    def __init__(self, missions: List[str] | None = None, statuses: List[str] | None = None, source: str | None = None):
+        self.missions = missions or []
+        self.statuses = statuses or []
+        self.source = source
+        self.columns: Dict[str, object] = {name: array(typecode) for name, typecode in COLUMNS}
+        self._mission_codes = {mission_id: code for code, mission_id in enumerate(self.missions)}
+        self._status_codes = {status: code for code, status in enumerate(self.statuses)}
+        self._days: Dict[str, int] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], source: str | None = None) -> "MissionLogColumns":
+        columns = cls(source=source)
+        for record in records:
+            columns.append(record)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.columns["day"])
+
+    def _code(self, codes: Dict[str, int], values: List[str], value: str) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def append(self, record: Dict):
+        if not isinstance(self.columns["day"], array):
+            self.columns = {name: array(typecode, self.columns[name].tobytes()) for name, typecode in COLUMNS}
+        day = self._days.get(record["date"])
+        if day is None:
+            day = date.fromisoformat(record["date"]).toordinal() if record["date"] else UNDATED
+            self._days[record["date"]] = day
+        columns = self.columns
+        columns["mission"].append(self._code(self._mission_codes, self.missions, record["mission_id"]))
+        columns["day"].append(day)
+        columns["xp"].append(record["xp_awarded"])
+        columns["tokens"].append(record["tokens_awarded"])
+        columns["status"].append(self._code(self._status_codes, self.statuses, record["status"]))
+
+    def matches(self, n: int, record: Dict) -> bool:
+        """Si la fila `n` salió de `record` (misión, día y estado)"""
+        day = date.fromisoformat(record["date"]).toordinal() if record["date"] else UNDATED
+        columns = self.columns
+        return (
+            self.missions[columns["mission"][n]] == record["mission_id"]
+            and columns["day"][n] == day
+            and self.statuses[columns["status"][n]] == record["status"]
+        )
+
+    def status_code(self, status: str) -> int | None:
+        return self._status_codes.get(status)
+
+    def arrays(self) -> Dict[str, "np.ndarray"]:
+        """
+        Columnas como ndarrays sin copiar. Mientras haya vistas vivas sobre
+        columnas propias, append falla con BufferError (no se puede mover un
+        array exportado), así que conviene usarlas y soltarlas.
+        """
+        if np is None:
+            raise RuntimeError("NumPy no está instalado")
+        return {name: np.frombuffer(self.columns[name], dtype=DTYPES[typecode]) for name, typecode in COLUMNS}
+
+    # ---------------------------------------------------------
+    #  Serialización
+    # ---------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """
+        MAGIC, largo de la cabecera (uint32), cabecera JSON con los
+        diccionarios y el offset de cada columna, y las columnas en
+        little-endian, cada una alineada a 8 bytes.
+        """
+        offsets, chunks, offset = {}, [], 0
+        for name, typecode in COLUMNS:
+            column = array(typecode, self.columns[name].tobytes())
+            if sys.byteorder == "big":
+                column.byteswap()
+            data = column.tobytes()
+            offsets[name] = [typecode, offset]
+            chunks.append(data + b"\0" * _padding(len(data)))
+            offset += len(chunks[-1])
+        header = json.dumps({
+            "version": COLUMNS_VERSION,
+            "source": self.source,
+            "rows": len(self),
+            "missions": self.missions,
+            "statuses": self.statuses,
+            "columns": offsets,
+        }).encode("utf-8")
+        header += b" " * _padding(len(MAGIC) + 4 + len(header))
+        return b"".join([MAGIC, len(header).to_bytes(4, "little"), header, *chunks])
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes) -> "MissionLogColumns":
+        view = memoryview(buffer)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError("No es un mission_log columnar")
+        start = len(MAGIC) + 4
+        header_len = int.from_bytes(view[len(MAGIC):start], "little")
+        header = json.loads(bytes(view[start:start + header_len]))
+        if header["version"] != COLUMNS_VERSION:
+            raise ValueError(f"Versión de formato columnar no soportada: {header['version']}")
+        columns = cls(header["missions"], header["statuses"], header["source"])
+        data = start + header_len
+        for name, (typecode, offset) in header["columns"].items():
+            size = header["rows"] * array(typecode).itemsize
+            column = view[data + offset:data + offset + size].cast(typecode)
+            if sys.byteorder == "big":
+                column = array(typecode, column.tobytes())
+                column.byteswap()
+            columns.columns[name] = column
+        return columns
+
+    def to_text(self) -> str:
+        # Los backends guardan texto: zlib + base64 (los ordinales y códigos comprimen muy bien)
+        return base64.b64encode(zlib.compress(self.to_bytes(), 6)).decode("ascii")
+
+    @classmethod
+    def from_text(cls, content: str) -> "MissionLogColumns":
+        return cls.from_bytes(zlib.decompress(base64.b64decode(content)))
+
+# =========================================================
+#  SINCRONÍA CON EL JSONL
+# =========================================================
+
+def read_columns(username: str, backend, sha: str | None) -> MissionLogColumns | None:
+    """La copia guardada si salió del mission_log con esa SHA; si no, None"""
+    cached, _ = backend.get(username, COLUMNS_FILE)
+    if not cached:
+        return None
+    try:
+        columns = MissionLogColumns.from_text(cached)
+    except (ValueError, zlib.error):
+        return None
+    return columns if columns.source == sha else None
+
+def load_columns(username: str, backend) -> tuple:
+    """
+    (columnas, al_día): la copia guardada si salió del mission_log actual;
+    si no (o si no hay), las reconstruye desde el JSONL sin guardarlas. Con
+    la copia al día el JSONL no se descarga: su SHA sale del listado.
+    """
+    shas = backend.file_shas(username)
+    if COLUMNS_FILE in shas:
+        columns = read_columns(username, backend, shas.get("mission_log.jsonl"))
+        if columns is not None:
+            return columns, True
+    content, sha = backend.get(username, "mission_log.jsonl")
+    return MissionLogColumns.from_records(parse_user_file("mission_log.jsonl", content), source=sha), False
+
+def write_columns(username: str, columns: MissionLogColumns, backend, sha: str | None = None) -> str | None:
+    """Guarda la copia columnar; sin `sha` pide la actual al backend. Devuelve la SHA nueva (None si falla)"""
+    if sha is None:
+        _, sha = backend.get(username, COLUMNS_FILE)
+    return backend.put(username, COLUMNS_FILE, columns.to_text(), sha)
+
+# =========================================================
+#  ESTADÍSTICAS
+# =========================================================
+
+def column_stats(columns: MissionLogColumns) -> Dict:
+    """Lo mismo que engine.system_stats calcula del mission_log (las líneas sin fecha cuentan como un día)"""
+    total = len(columns)
+    if np is not None:
+        arrays = columns.arrays()
+        days_active = int(np.unique(arrays["day"]).size)
+        total_xp = int(arrays["xp"].sum(dtype=np.int64))
+        total_tokens = int(arrays["tokens"].sum(dtype=np.int64))
+    else:
+        days_active = len(set(columns.columns["day"]))
+        total_xp = sum(columns.columns["xp"])
+        total_tokens = sum(columns.columns["tokens"])
+    return {
+        "days_active": days_active,
+        "total_missions": total,
+        "total_xp": total_xp,
+        "total_tokens_earned": total_tokens,
+        "avg_missions": total / days_active if days_active > 0 else 0,
+    }
+
+def completed_days(columns: MissionLogColumns, before: date | None = None) -> List[int]:
+    """Ordinales de los días con alguna misión completada (anteriores a `before`), ordenados"""
+    code = columns.status_code("completed")
+    if code is None:
+        return []
+    limit = before.toordinal() if before else None
+    if np is not None:
+        arrays = columns.arrays()
+        mask = (arrays["status"] == code) & (arrays["day"] != UNDATED)
+        if limit is not None:
+            mask &= arrays["day"] < limit
+        return np.unique(arrays["day"][mask]).tolist()
+    days = {day for day, status in zip(columns.columns["day"], columns.columns["status"]) if status == code}
+    return sorted(day for day in days if day != UNDATED and (limit is None or day < limit))
+
+def streaks(columns: MissionLogColumns, day: date) -> Dict:
+    """
+    Racha actual (días seguidos con misiones hasta `day` - 1, como
+    agenda.current_streak), la más larga y el último día activo.
+    """
+    days = completed_days(columns, before=day)
+    if not days:
+        return {"current": 0, "longest": 0, "last_active": None}
+    if np is not None:
+        ordinals = np.asarray(days)
+        breaks = np.flatnonzero(np.diff(ordinals) != 1)
+        starts = np.concatenate(([0], breaks + 1))
+        ends = np.concatenate((breaks, [len(ordinals) - 1]))
+        runs = (ends - starts + 1).tolist()
+    else:
+        runs = [1]
+        for previous, current in zip(days, days[1:]):
+            if current == previous + 1:
+                runs[-1] += 1
+            else:
+                runs.append(1)
+    return {
+        "current": runs[-1] if days[-1] == day.toordinal() - 1 else 0,
+        "longest": max(runs),
+        "last_active": date.fromordinal(days[-1]).isoformat(),
+    }
+
+def heatmap(columns: MissionLogColumns, start: date, end: date) -> List[int]:
+    """Misiones completadas por día en [start, end)"""
+    first, last = start.toordinal(), end.toordinal()
+    code = columns.status_code("completed")
+    if code is None or last <= first:
+        return [0] * max(0, last - first)
+    if np is not None:
+        arrays = columns.arrays()
+        day = arrays["day"]
+        selected = day[(arrays["status"] == code) & (day >= first) & (day < last)]
+        return np.bincount(selected - first, minlength=last - first).tolist()
+    counts = [0] * (last - first)
+    for day, status in zip(columns.columns["day"], columns.columns["status"]):
+        if status == code and first <= day < last:
+            counts[day - first] += 1
+    return counts
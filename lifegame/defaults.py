@@ -0,0 +1,113 @@
+"""Datos por defecto de cada usuario y archivos que los persisten."""
+
+from datetime import date
+
+# =========================================================
+#  DATOS POR DEFECTO
+# =========================================================
+
+DEFAULT_PROFILE = {
+    "current_level": 1,
+    "current_xp": 0,
+    "xp_base_per_level": 100,
+    "total_tokens": 0,
+    "streak_days": 0,
+    "last_active_date": None,
+    # Último día de juego cerrado y misiones arrastradas (lifegame.agenda)
+    "agenda": None,
+    "created_date": date.today().isoformat(),
+    "player_name": "",
+    "player_bio": "",
+    "player_goals": "",
+    "player_motivation": "",
+}
+
+DEFAULT_CONFIG = {
+    "xp_formula": "linear",
+    "xp_base_per_level": 100,
+    "calendar_start_week_on": "monday",
+    "default_view": "month",
+    "theme": "minimal",
+    "language": "es",
+    "notifications_enabled": True,
+    "auto_save": True,
+    "daily_reset_time": "06:00",
+    "daily_time_budget": 120,
+    "attribute_max_share": 0.5,
+    "attribute_weights": {},
+    "reward_plan_horizon_days": 14,
+    "reward_plan_max_copies": 3,
+    "cache_size_mb": 100,
+    "history_window_days": 90,
+    "debug_mode": False,
+}
+
+DEFAULT_ATTRIBUTES = {
+    "attributes": [
+        {"id": "strength", "name": "Fuerza", "current_xp": 0, "description": "Fuerza física y resistencia", "color": "#FF6B6B", "icon": "💪"},
+        {"id": "intelligence", "name": "Inteligencia", "current_xp": 0, "description": "Capacidad mental y aprendizaje", "color": "#4ECDC4", "icon": "🧠"},
+        {"id": "vitality", "name": "Vitalidad", "current_xp": 0, "description": "Energía y salud general", "color": "#45B7D1", "icon": "❤️"},
+        {"id": "discipline", "name": "Disciplina", "current_xp": 0, "description": "Autocontrol y consistencia", "color": "#96CEB4", "icon": "⚡"},
+        {"id": "creativity", "name": "Creatividad", "current_xp": 0, "description": "Pensamiento innovador y artístico", "color": "#FFEAA7", "icon": "🎨"},
+        {"id": "social", "name": "Social", "current_xp": 0, "description": "Habilidades sociales y relaciones", "color": "#DDA0DD", "icon": "👥"},
+        {"id": "wisdom", "name": "Sabiduría", "current_xp": 0, "description": "Experiencia y juicio", "color": "#98D8C8", "icon": "🦉"},
+    ]
+}
+
+# Minutos de una misión sin tiempo estimado
+DEFAULT_TIME_COST = 30
+
+DEFAULT_MISSIONS = {
+    "missions": [
+        {
+            "id": "m_daily_routine",
+            "name": "Rutina Matutina",
+            "description": "Meditación, ejercicio y planificación del día",
+            "type": "daily",
+            "base_xp": 15,
+            "tokens_reward": 2,
+            "attribute_id": "discipline",
+            "start_date": date.today().isoformat(),
+            "end_date": None,
+            "recurrence": "everyday",
+            "priority": "high",
+            "time_cost": 30
+        }
+    ]
+}
+
+DEFAULT_CALENDAR = {"events": []}
+
+DEFAULT_REWARDS = {
+    "rewards": [
+        {
+            "id": "r_break",
+            "name": "Descanso Premium - 30 min sin culpa",
+            "description": "Tiempo de ocio totalmente justificado",
+            "cost_tokens": 10,
+            "category": "leisure",
+            "preference": 3
+        },
+        {
+            "id": "r_treat",
+            "name": "Premio Especial",
+            "description": "Algo que realmente disfrutes",
+            "cost_tokens": 25,
+            "category": "reward",
+            "preference": 4
+        }
+    ],
+    "redemptions": []
+}
+
+USER_FILES = {
+    "profile.json": "profile",
+    "config.json": "config",
+    "attributes.json": "attributes",
+    "missions.json": "missions",
+    "calendar.json": "calendar",
+    "rewards.json": "rewards",
+    "mission_log.jsonl": "mission_log",
+    "journal.jsonl": "journal",
+    "decisions.jsonl": "decisions",
+}
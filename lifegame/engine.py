@@ -0,0 +1,630 @@
+"""
+Lógica del juego sin dependencias de Streamlit: recurrencias, niveles,
+optimizador de misiones, planificador de recompensas e índices en memoria.
+"""
+
+import bisect
+import calendar
+import uuid
+from datetime import datetime, date, timedelta
+from typing import Any, Callable, Dict, List
+
+from lifegame.profiling import traced
+from lifegame.schema import stamp
+
+# =========================================================
+#  LÓGICA DEL JUEGO
+# =========================================================
+
+def is_mission_active_today(mission: Dict, target_date: date) -> bool:
+    """Determina si una misión está activa para una fecha específica"""
+    start_date = datetime.fromisoformat(mission["start_date"]).date()
+    end_date = datetime.fromisoformat(mission["end_date"]).date() if mission["end_date"] else None
+    
+    if target_date < start_date:
+        return False
+    
+    if end_date and target_date > end_date:
+        return False
+    
+    mission_type = mission["type"]
+    recurrence = mission["recurrence"]
+    
+    if mission_type == "daily":
+        if recurrence == "everyday":
+            return True
+        elif recurrence == "weekdays" and target_date.weekday() < 5:
+            return True
+        elif recurrence == "weekends" and target_date.weekday() >= 5:
+            return True
+    
+    elif mission_type == "weekly":
+        # Misiones semanales específicas
+        if recurrence == "monday" and target_date.weekday() == 0:
+            return True
+        elif recurrence == "tuesday" and target_date.weekday() == 1:
+            return True
+        # ... otros días de la semana
+    
+    elif mission_type == "monthly":
+        # Misiones mensuales (ej: día 1 de cada mes)
+        if recurrence == "first_day" and target_date.day == 1:
+            return True
+    
+    elif mission_type in ["epic", "one_off"]:
+        # Misiones épicas o únicas - siempre activas dentro de su rango de fechas
+        return True
+    
+    return False
+
+def check_level_up(profile: Dict):
+    """Verifica si el usuario subió de nivel"""
+    xp_needed = profile["xp_base_per_level"]
+    
+    while profile["current_xp"] >= xp_needed:
+        profile["current_level"] += 1
+        profile["current_xp"] -= xp_needed
+        # Opcional: incrementar xp necesario para siguiente nivel
+        # xp_needed = int(xp_needed * 1.2)
+
+# =========================================================
+#  ESTADO DE USUARIO (API SIN STREAMLIT)
+# =========================================================
+
+class UserState:
+    """
+    Datos de un usuario fuera de Streamlit, con la misma forma que
+    st.session_state: {clave: {"data": ..., "sha": ...}} para cada clave de
+    USER_FILES. Las funciones de esta sección aceptan un UserState o
+    directamente st.session_state.
+    """
+
+    def __init__(self, username: str, datasets: Dict[str, Dict]):
+        self.username = username
+        self.datasets = datasets
+
+    def __getitem__(self, key: str) -> Dict:
+        return self.datasets[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.datasets
+
+@traced("engine")
+def completions_index(mission_log: List[Dict]) -> Dict[str, Dict[str, Dict]]:
+    """Índice {fecha: {mission_id: primer registro del día}} del mission_log"""
+    index: Dict[str, Dict[str, Dict]] = {}
+    for log in mission_log:
+        index.setdefault(log["date"], {}).setdefault(log["mission_id"], log)
+    return index
+
+@traced("engine")
+def missions_for_date(missions: List[Dict], day_log: Dict[str, Dict], target_date: date) -> List[Dict]:
+    """Misiones activas en una fecha, marcadas como completadas o no"""
+    return mark_completed([m for m in missions if is_mission_active_today(m, target_date)], day_log)
+
+def events_index(events: List[Dict]) -> Dict[str, List[Dict]]:
+    """Índice {fecha: [eventos ordenados por hora]} del calendario"""
+    index: Dict[str, List[Dict]] = {}
+    for event in events:
+        index.setdefault(event["date"], []).append(event)
+    for day_events in index.values():
+        day_events.sort(key=lambda x: x["start_time"])
+    return index
+
+def month_summaries(year: int, month: int, first_weekday: int, day_missions: Callable[[date], List[Dict]],
+                    events: Dict[str, List[Dict]]) -> Dict[date, tuple]:
+    """
+    {día: (completadas, misiones, títulos de eventos)} de cada día de la
+    grilla del mes, con `day_missions(día)` como missions_for_date
+    """
+    summaries = {}
+    for week in calendar.Calendar(first_weekday).monthdatescalendar(year, month):
+        for day_date in week:
+            missions = day_missions(day_date)
+            summaries[day_date] = (
+                sum(1 for m in missions if m["completed"]),
+                len(missions),
+                [e["title"] for e in events.get(day_date.isoformat(), [])],
+            )
+    return summaries
+
+def mark_completed(missions: List[Dict], day_log: Dict[str, Dict]) -> List[Dict]:
+    """Copias de las misiones con `completed` y `completion_data` según el log del día"""
+    day_missions = []
+    for mission in missions:
+        log = day_log.get(mission["id"])
+        mission_copy = mission.copy()
+        mission_copy["completed"] = bool(log) and log["status"] == "completed"
+        mission_copy["completion_data"] = log
+        day_missions.append(mission_copy)
+    return day_missions
+
+@traced("engine")
+def complete_mission(state, mission_id: str, target_date: date, notes: str = "", timestamp: str | None = None) -> Dict:
+    """Completa una misión en `target_date`, otorga recompensas y devuelve el registro"""
+    mission = next((m for m in state["missions"]["data"]["missions"] if m["id"] == mission_id), None)
+    if mission is None:
+        raise ValueError(f"Misión desconocida: {mission_id}")
+    
+    log_entry = stamp("mission_log", {
+        "mission_id": mission_id,
+        "date": target_date.isoformat(),
+        "status": "completed",
+        "xp_awarded": mission["base_xp"],
+        "tokens_awarded": mission["tokens_reward"],
+        "timestamp": timestamp or datetime.now().isoformat(),
+        "notes": notes,
+    })
+    
+    # Agregar al log
+    state["mission_log"]["data"].append(log_entry)
+    
+    # Actualizar perfil
+    profile = state["profile"]["data"]
+    profile["current_xp"] += mission["base_xp"]
+    profile["total_tokens"] += mission["tokens_reward"]
+    
+    # Actualizar atributo si existe
+    if mission["attribute_id"]:
+        for attr in state["attributes"]["data"]["attributes"]:
+            if attr["id"] == mission["attribute_id"]:
+                attr["current_xp"] += mission["base_xp"]
+                break
+    
+    # Verificar si subió de nivel
+    check_level_up(profile)
+    return log_entry
+
+@traced("engine")
+def recompute_profile(state) -> Dict[str, Any]:
+    """
+    Reconstruye nivel, XP, tokens y XP de atributos reproduciendo el historial
+    desde cero: mission_log (en orden de timestamp), XP del diario y canjes.
+    Corrige cualquier deriva entre el perfil guardado y su historial.
+    """
+    profile = state["profile"]["data"]
+    missions_by_id = {m["id"]: m for m in state["missions"]["data"]["missions"]}
+    attributes = state["attributes"]["data"]["attributes"]
+    attr_xp = {attr["id"]: 0 for attr in attributes}
+    
+    total_xp = 0
+    tokens = 0
+    replayed = 0
+    for log in sorted(state["mission_log"]["data"], key=lambda x: x["timestamp"]):
+        if log.get("status") != "completed":
+            continue
+        xp = log["xp_awarded"]
+        total_xp += xp
+        tokens += log["tokens_awarded"]
+        replayed += 1
+        mission = missions_by_id.get(log["mission_id"])
+        if mission and mission["attribute_id"] in attr_xp:
+            attr_xp[mission["attribute_id"]] += xp
+    
+    total_xp += sum(entry["xp_awarded"] for entry in state["journal"]["data"])
+    tokens -= sum(r["tokens_spent"] for r in state["rewards"]["data"]["redemptions"])
+    
+    profile["current_level"] = 1
+    profile["current_xp"] = total_xp
+    profile["total_tokens"] = tokens
+    check_level_up(profile)
+    for attr in attributes:
+        attr["current_xp"] = attr_xp[attr["id"]]
+    
+    return {
+        "replayed": replayed,
+        "total_xp": total_xp,
+        "level": profile["current_level"],
+        "tokens": tokens,
+    }
+
+@traced("engine")
+def system_stats(state) -> Dict[str, Any]:
+    """Estadísticas globales del historial del usuario"""
+    mission_log = state["mission_log"]["data"]
+    total_missions = len(mission_log)
+    days_active = len(set(log["date"] for log in mission_log))
+    return {
+        "days_active": days_active,
+        "total_missions": total_missions,
+        "total_xp": sum(log["xp_awarded"] for log in mission_log),
+        "total_tokens_earned": sum(log["tokens_awarded"] for log in mission_log),
+        "total_journal": len(state["journal"]["data"]),
+        "total_decisions": len(state["decisions"]["data"]),
+        "avg_missions": total_missions / days_active if days_active > 0 else 0,
+    }
+
+@traced("engine")
+def decision_stats(decisions: List[Dict]) -> Dict[str, Any]:
+    """Métricas del análisis de patrones de decisiones"""
+    total_decisions = len(decisions)
+    if not total_decisions:
+        return {"total_decisions": 0}
+    return {
+        "total_decisions": total_decisions,
+        "regret_decisions": sum(1 for d in decisions if d['regret_check']),
+        "avg_short_term": sum(
+            max(opt['short_term_payoff'] for opt in d['options'])
+            for d in decisions
+        ) / total_decisions,
+        "avg_long_term": sum(
+            max(opt['long_term_payoff'] for opt in d['options'])
+            for d in decisions
+        ) / total_decisions,
+    }
+
+# =========================================================
+#  OPTIMIZADOR DE MISIONES (PORTAFOLIO DE HÁBITOS)
+# =========================================================
+
+PRIORITY_WEIGHTS = {"low": 0.8, "medium": 1.0, "high": 1.25}
+
+def mission_value(mission: Dict, attribute_weights: Dict[str, float] | None = None) -> float:
+    """XP ponderada que aporta una misión: base_xp × peso del atributo × prioridad"""
+    weights = attribute_weights or {}
+    attr_weight = weights.get(mission["attribute_id"], 1.0)
+    priority_weight = PRIORITY_WEIGHTS.get(mission["priority"], 1.0)
+    return mission["base_xp"] * attr_weight * priority_weight
+
+def _group_knapsack(items: List[tuple], capacity: int):
+    """
+    Mochila 0/1 exacta para un grupo de misiones.
+    items: lista de (coste_en_unidades, valor).
+    Devuelve (best, take) donde best[t] es el mejor valor usando como máximo t
+    unidades y take[i] es un bytearray con las decisiones para reconstruir.
+    """
+    best = [0.0] * (capacity + 1)
+    take = []
+    for cost, value in items:
+        chosen = bytearray(capacity + 1)
+        if value > 0 and cost <= capacity:
+            for t in range(capacity, cost - 1, -1):
+                candidate = best[t - cost] + value
+                if candidate > best[t]:
+                    best[t] = candidate
+                    chosen[t] = 1
+        take.append(chosen)
+    return best, take
+
+@traced("engine")
+def optimize_mission_portfolio(
+    missions: List[Dict],
+    time_budget: int,
+    attribute_weights: Dict[str, float] | None = None,
+    max_share: float = 0.5,
+    granularity: int = 5,
+) -> Dict[str, Any]:
+    """
+    Elige el conjunto de misiones que maximiza la XP ponderada sin superar el
+    presupuesto de tiempo (minutos), limitando el tiempo dedicado a cada
+    atributo a `max_share` del presupuesto para mantener el balance.
+
+    Es un programa entero resuelto de forma exacta: una mochila 0/1 por
+    atributo y luego una convolución (max, +) entre atributos. Con tiempos
+    discretizados a `granularity` minutos, cientos de misiones se resuelven
+    en milisegundos.
+    """
+    granularity = max(1, int(granularity))
+    capacity = max(0, int(time_budget) // granularity)
+    if max_share >= 1:
+        attr_capacity = capacity
+    else:
+        attr_capacity = min(capacity, int(max_share * time_budget) // granularity)
+
+    groups: Dict[Any, List[Dict]] = {}
+    for mission in missions:
+        groups.setdefault(mission["attribute_id"], []).append(mission)
+
+    def units(mission: Dict) -> int:
+        minutes = mission["time_cost"] or 0
+        return -(-int(minutes) // granularity)
+
+    # Mochila por grupo (las misiones sin atributo no tienen tope de balance)
+    group_tables = []
+    for attr_id, group in groups.items():
+        cap = attr_capacity if attr_id else capacity
+        items = [(units(m), mission_value(m, attribute_weights)) for m in group]
+        best, take = _group_knapsack(items, cap)
+        group_tables.append((attr_id, group, items, best, take))
+
+    # Combinar grupos: total[t] = max_s total_prev[t - s] + best_grupo[s]
+    total = [0.0] * (capacity + 1)
+    splits = []
+    for _, _, _, best, _ in group_tables:
+        new_total = [value + best[0] for value in total]
+        split = [0] * (capacity + 1)
+        for t in range(capacity + 1):
+            for s in range(1, min(t, len(best) - 1) + 1):
+                candidate = total[t - s] + best[s]
+                if candidate > new_total[t]:
+                    new_total[t] = candidate
+                    split[t] = s
+        total = new_total
+        splits.append(split)
+
+    # Reconstrucción de la solución
+    selected = []
+    by_attribute: Dict[Any, int] = {}
+    remaining = capacity
+    for (attr_id, group, items, best, take), split in zip(reversed(group_tables), reversed(splits)):
+        t = split[remaining]
+        remaining -= t
+        for i in range(len(items) - 1, -1, -1):
+            if take[i][t]:
+                selected.append(group[i])
+                t -= items[i][0]
+
+    selected.reverse()
+    total_minutes = 0
+    for mission in selected:
+        minutes = mission["time_cost"] or 0
+        total_minutes += minutes
+        attr_id = mission["attribute_id"]
+        by_attribute[attr_id] = by_attribute.get(attr_id, 0) + minutes
+
+    return {
+        "selected": selected,
+        "total_minutes": total_minutes,
+        "total_value": sum(mission_value(m, attribute_weights) for m in selected),
+        "by_attribute": by_attribute,
+    }
+
+# =========================================================
+#  PLANIFICADOR DE RECOMPENSAS (MOCHILA ACOTADA)
+# =========================================================
+
+@traced("engine")
+def project_token_income(missions: List[Dict], mission_log: List[Dict], start: date, days: int) -> List[int]:
+    """
+    Proyecta los tokens que se ganarían cada día desde `start` durante `days`
+    días si se completan todas las misiones programadas. Las misiones ya
+    completadas en `start` no cuentan.
+    """
+    completed_on_start = {
+        log["mission_id"] for log in mission_log
+        if log["date"] == start.isoformat() and log["status"] == "completed"
+    }
+    income = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        income.append(sum(
+            m["tokens_reward"] for m in missions
+            if is_mission_active_today(m, day)
+            and not (offset == 0 and m["id"] in completed_on_start)
+        ))
+    return income
+
+@traced("engine")
+def plan_reward_redemptions(
+    rewards: List[Dict],
+    balance: int,
+    daily_income: List[int] | None = None,
+    max_copies: int = 3,
+) -> Dict[str, Any]:
+    """
+    Elige qué recompensas canjear (y cuántas veces cada una) para maximizar la
+    preferencia total con los tokens disponibles más los proyectados.
+
+    Mochila acotada con descomposición binaria de copias. La programación
+    dinámica se indexa por preferencia acumulada (mínimo coste para cada
+    valor) en lugar de por tokens: las preferencias son enteros pequeños, así
+    que el coste no depende de que el saldo sea de decenas de miles.
+    """
+    daily_income = daily_income or []
+    budget = balance + sum(daily_income)
+
+    # Descomposición binaria: k copias -> paquetes de 1, 2, 4, ..., resto
+    packs = []
+    for reward in rewards:
+        cost = reward["cost_tokens"]
+        preference = int(reward["preference"])
+        if cost <= 0 or preference <= 0 or cost > budget:
+            continue
+        copies = min(int(reward.get("max_copies", max_copies)), budget // cost)
+        size = 1
+        while copies > 0:
+            take = min(size, copies)
+            packs.append((reward, take, cost * take, preference * take))
+            copies -= take
+            size *= 2
+
+    # Cota superior de la relajación lineal: acota el eje de preferencias
+    max_value = 0
+    remaining = budget
+    for _, _, cost, value in sorted(packs, key=lambda p: p[3] / p[2], reverse=True):
+        if cost <= remaining:
+            remaining -= cost
+            max_value += value
+        else:
+            max_value += value * remaining // cost
+            break
+
+    unreachable = budget + 1
+    min_cost = [0] + [unreachable] * max_value
+    choices = []
+    reach = 0
+    for _, _, cost, value in packs:
+        chosen = bytearray(max_value + 1)
+        reach = min(reach + value, max_value)
+        for v in range(reach, value - 1, -1):
+            candidate = min_cost[v - value] + cost
+            if candidate < min_cost[v]:
+                min_cost[v] = candidate
+                chosen[v] = 1
+        choices.append(chosen)
+
+    best_value = max(v for v in range(max_value + 1) if min_cost[v] <= budget)
+
+    counts: Dict[str, int] = {}
+    by_id = {}
+    v = best_value
+    for (reward, take, _, value), chosen in zip(reversed(packs), reversed(choices)):
+        if chosen[v]:
+            counts[reward["id"]] = counts.get(reward["id"], 0) + take
+            by_id[reward["id"]] = reward
+            v -= value
+
+    # Secuencia: primero lo más barato, en el primer día con saldo suficiente
+    units = sorted(
+        (by_id[rid] for rid, n in counts.items() for _ in range(n)),
+        key=lambda r: (r["cost_tokens"], -r["preference"]),
+    )
+    schedule = []
+    available = balance
+    day = 0
+    for reward in units:
+        while available < reward["cost_tokens"] and day < len(daily_income):
+            available += daily_income[day]
+            day += 1
+        available -= reward["cost_tokens"]
+        schedule.append({"reward": reward, "day_offset": max(day - 1, 0)})
+
+    return {
+        "counts": counts,
+        "schedule": schedule,
+        "total_preference": best_value,
+        "total_cost": min_cost[best_value],
+        "budget": budget,
+    }
+
+# =========================================================
+#  CATÁLOGO DE RECOMPENSAS (ÍNDICE Y AGREGADOS)
+# =========================================================
+
+class RewardCatalog:
+    """
+    Índice en memoria sobre rewards.json.
+
+    - Recompensas indexadas por id; al eliminar una recompensa se marca como
+      `deleted` (lápida) para que el historial siga resolviendo su nombre.
+    - Canjes ordenados por timestamp; los nuevos se insertan con bisect.
+    - Gasto total, por recompensa y por categoría mantenidos en cada canje.
+    """
+
+    def __init__(self, rewards_data: Dict):
+        self.data = rewards_data
+        self.by_id = {r["id"]: r for r in rewards_data["rewards"]}
+
+        redemptions = rewards_data["redemptions"]
+        keys = [r["timestamp"] for r in redemptions]
+        if any(a > b for a, b in zip(keys, keys[1:])):
+            redemptions.sort(key=lambda r: r["timestamp"])
+            keys.sort()
+        self._keys = keys
+
+        self.total_spent = 0
+        self.spend_by_reward: Dict[str, int] = {}
+        self.spend_by_category: Dict[str, int] = {}
+        for redemption in redemptions:
+            self._account(redemption)
+
+    def _account(self, redemption: Dict):
+        spent = redemption["tokens_spent"]
+        reward = self.get(redemption["reward_id"])
+        self.total_spent += spent
+        self.spend_by_reward[reward["id"]] = self.spend_by_reward.get(reward["id"], 0) + spent
+        category = reward["category"]
+        self.spend_by_category[category] = self.spend_by_category.get(category, 0) + spent
+
+    def get(self, reward_id: str) -> Dict:
+        """Devuelve la recompensa (o una lápida si ya no existe)"""
+        reward = self.by_id.get(reward_id)
+        if reward is None:
+            return {"id": reward_id, "name": "Recompensa eliminada", "cost_tokens": 0, "category": "other", "deleted": True}
+        return reward
+
+    def active(self) -> List[Dict]:
+        return [r for r in self.data["rewards"] if not r.get("deleted")]
+
+    def add(self, reward: Dict):
+        self.data["rewards"].append(reward)
+        self.by_id[reward["id"]] = reward
+
+    def delete(self, reward_id: str, day: date):
+        reward = self.by_id.get(reward_id)
+        if reward is not None:
+            reward["deleted"] = True
+            reward["deleted_date"] = day.isoformat()
+
+    def redeem(self, reward_id: str, profile: Dict, day: date) -> Dict:
+        """Canjea una recompensa en el día de juego `day`, descuenta tokens y actualiza los agregados"""
+        reward = self.by_id[reward_id]
+        profile["total_tokens"] -= reward["cost_tokens"]
+        redemption = {
+            "id": f"red_{uuid.uuid4().hex}",
+            "reward_id": reward["id"],
+            "date": day.isoformat(),
+            "tokens_spent": reward["cost_tokens"],
+            "timestamp": datetime.now().isoformat()
+        }
+        position = bisect.bisect_right(self._keys, redemption["timestamp"])
+        self._keys.insert(position, redemption["timestamp"])
+        self.data["redemptions"].insert(position, redemption)
+        self._account(redemption)
+        return redemption
+
+    def recent(self, limit: int = 10) -> List[Dict]:
+        """Últimos canjes, del más reciente al más antiguo"""
+        return self.data["redemptions"][:-limit - 1:-1]
+
+# =========================================================
+#  HISTORIAL PAGINADO (KEYSET)
+# =========================================================
+
+HISTORY_PAGE_SIZE = 10
+
+class HistoryIndex:
+    """
+    Índice ordenado por fecha sobre una lista JSONL (en orden de inserción).
+
+    Guarda claves (fecha, id, posición) ordenadas; los registros nuevos que se
+    agregan al final de la lista se indexan incrementalmente con insort, y una
+    página solo materializa los registros que muestra: la vista guarda lo ya
+    mostrado y cada "Cargar más" pide solo los siguientes más antiguos. Las
+    claves no cambian al agregar registros, así que un cursor sigue valiendo.
+    `out_of_order` cuenta los registros agregados con fecha anterior a la más
+    reciente, que caen entre los ya mostrados.
+    """
+
+    def __init__(self, records: List[Dict], sort_field: str):
+        self.records = records
+        self.sort_field = sort_field
+        self.keys: List[tuple] = []
+        self.indexed = 0
+        self.out_of_order = 0
+        self.refresh()
+
+    def _key(self, position: int) -> tuple:
+        record = self.records[position]
+        return (record[self.sort_field], record.get("id", ""), position)
+
+    def refresh(self):
+        """Indexa los registros agregados desde la última vez"""
+        new_keys = [self._key(i) for i in range(self.indexed, len(self.records))]
+        if self.indexed == 0:
+            self.keys = sorted(new_keys)
+        else:
+            for key in new_keys:
+                if self.keys and key < self.keys[-1]:
+                    self.out_of_order += 1
+                bisect.insort(self.keys, key)
+        self.indexed = len(self.records)
+
+    def newest_key(self) -> tuple | None:
+        return self.keys[-1] if self.keys else None
+
+    def newest_first(self, cursor: tuple | None = None, limit: int = HISTORY_PAGE_SIZE):
+        """
+        Los `limit` registros anteriores a `cursor` (los más recientes si no
+        hay cursor), del más reciente al más antiguo. Devuelve (registros,
+        cursor de la página siguiente, hay_más).
+        """
+        end = bisect.bisect_left(self.keys, cursor) if cursor else len(self.keys)
+        start = max(0, end - limit)
+        page = [self.records[key[2]] for key in reversed(self.keys[start:end])]
+        return page, self.keys[start] if start < end else cursor, start > 0
+
+    def newer_than(self, key: tuple | None) -> List[Dict]:
+        """Registros posteriores a `key` (agregados tras mostrarla), del más reciente al más antiguo"""
+        start = bisect.bisect_right(self.keys, key) if key else 0
+        return [self.records[k[2]] for k in reversed(self.keys[start:])]
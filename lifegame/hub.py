@@ -0,0 +1,351 @@
+"""
+Datos de un usuario compartidos entre todas sus sesiones.
+
+Si un usuario tiene la app abierta en varios dispositivos, sus sesiones usan
+el mismo UserHub (ver state.user_hub): un único juego de datasets cargado una
+sola vez, escrituras a GitHub serializadas con la SHA compartida y un
+contador de revisión por dataset con el que cada sesión detecta los cambios
+hechos por las demás. Este módulo no importa Streamlit.
+"""
+
+import threading
+from concurrent.futures import as_completed, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from lifegame.agenda import (
+    AGENDA_SCHEDULER,
+    build_agenda,
+    covers,
+    game_day,
+    next_reset,
+    read_recent_log,
+    recent_log,
+    RECENT_DAYS,
+    roll_over,
+    write_recent_log,
+)
+from lifegame.backup import session_files, write_export
+from lifegame.columnar import MissionLogColumns, read_columns, write_columns
+from lifegame.defaults import USER_FILES
+from lifegame.engine import completions_index, UserState
+from lifegame.memory import is_compacted, restore_dataset, UserMemory
+from lifegame.metrics import timed_operation
+from lifegame.search import SEARCH_INDEX_FILE, search_sources, SearchIndex
+from lifegame.storage import read_user_data, read_user_file, write_user_data
+
+# Datasets pequeños que necesita el primer render; el historial (JSONL) y el
+# índice de búsqueda crecen con el uso y se cargan en segundo plano.
+HOT_KEYS = ["profile", "config", "attributes", "missions", "calendar", "rewards"]
+COLD_KEYS = ["mission_log", "journal", "decisions", "search_index"]
+
+def read_search_index(username: str, backend) -> Dict:
+    """Índice de búsqueda persistido (opcional, se reconstruye si no existe)"""
+    content, sha = backend.get(username, SEARCH_INDEX_FILE)
+    return {"data": SearchIndex.from_json(content), "sha": sha}
+
+class HistoryLoader:
+    """
+    Descarga los datasets fríos en un hilo y deja cada uno en `results` a
+    medida que llega; UserHub.collect los incorpora.
+    """
+
+    def __init__(self, username: str, backend, keys: List[str] = COLD_KEYS):
+        self.username = username
+        self.pending = set(keys)
+        self.results: Dict[str, Dict] = {}
+        self.errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, args=(backend, list(keys)), daemon=True)
+        self._thread.start()
+
+    def _fetch(self, key: str, backend) -> Dict:
+        if key == "search_index":
+            return read_search_index(self.username, backend)
+        fname = next(fname for fname, k in USER_FILES.items() if k == key)
+        return read_user_file(self.username, fname, backend)
+
+    def _run(self, backend, keys: List[str]):
+        with timed_operation("load_history"), ThreadPoolExecutor(max_workers=len(keys) or 1) as pool:
+            futures = {pool.submit(self._fetch, key, backend): key for key in keys}
+            for future in as_completed(futures):
+                key = futures[future]
+                with self._lock:
+                    try:
+                        self.results[key] = future.result()
+                    except Exception as e:
+                        self.errors[key] = str(e)
+                    self.pending.discard(key)
+
+    def take(self):
+        """Datasets llegados desde la última llamada y si ya no queda nada pendiente"""
+        with self._lock:
+            results, self.results = self.results, {}
+            return results, not self.pending
+
+class UserHub:
+    """
+    Datasets de un usuario, compartidos por referencia entre sus sesiones.
+    Las acciones de varios pasos y el guardado se hacen con `lock` tomado.
+    """
+
+    def __init__(self, username: str):
+        self.username = username
+        self.lock = threading.RLock()
+        self.datasets: Dict[str, Dict] = {}
+        self.revisions: Dict[str, int] = {}
+        self.loader: HistoryLoader | None = None
+        self.search_synced = False
+        # Documentos editados antes del primer sync (ver state.get_search_index)
+        self.search_edited = False
+        # mission_log en columnas (ver columns) y el dataset del que salieron
+        self._columns: MissionLogColumns | None = None
+        self._columns_dataset: Dict | None = None
+        self._columns_sha: str | None = None
+        # Registros de los últimos días (ver agenda.recent_log): la agenda no espera al historial
+        self.recent: Dict | None = None
+        self._recent_sha: str | None = None
+        self.memory = UserMemory(self.lock)
+        self.next_reset: datetime | None = None
+        self._agenda: Dict | None = None
+        self._agenda_revision = None
+        self._load_lock = threading.Lock()
+        AGENDA_SCHEDULER.register(self)
+
+    def _changed(self, keys):
+        for key in keys:
+            self.revisions[key] = self.revisions.get(key, 0) + 1
+
+    def ensure_loaded(self, backend):
+        """
+        Carga única: la primera sesión lee los datasets calientes y lanza la
+        carga del historial; las que llegan a la vez esperan y los reutilizan.
+        """
+        with self._load_lock:
+            missing = [key for key in HOT_KEYS if key not in self.datasets]
+            if missing:
+                with timed_operation("load_hot"), ThreadPoolExecutor(max_workers=1) as pool:
+                    recent = pool.submit(read_recent_log, self.username, backend)
+                    datasets = read_user_data(self.username, backend, missing)
+                    recent, recent_sha = recent.result()
+                with self.lock:
+                    self.datasets.update(datasets)
+                    self.recent, self._recent_sha = recent, recent_sha
+                    self._changed(datasets)
+            with self.lock:
+                cold = [key for key in COLD_KEYS if key not in self.datasets]
+                if cold and self.loader is None:
+                    self.loader = HistoryLoader(self.username, backend, cold)
+
+    def reload(self, backend):
+        """Vuelve a leer todo desde el backend (descarta cambios sin guardar)"""
+        with self._load_lock, timed_operation("reload"):
+            datasets = read_user_data(self.username, backend)
+            datasets["search_index"] = read_search_index(self.username, backend)
+            with self.lock:
+                self.datasets = datasets
+                self.loader = None
+                self.search_synced = False
+                self.search_edited = False
+                self._changed(datasets)
+
+    def collect(self):
+        """Incorpora el historial que ya llegó; barato si no hay carga en curso"""
+        with self.lock:
+            if self.loader is None:
+                return
+            results, finished = self.loader.take()
+            self.datasets.update(results)
+            self._changed(results)
+            if "search_index" in results:
+                self.search_synced = False
+            if finished and not self.loader.errors:
+                self.loader = None
+
+    def agenda(self, now: datetime | None = None) -> Dict | None:
+        """
+        Agenda del día de juego actual, compartida por las sesiones. Al pasar
+        la hora de reset cierra el día anterior (roll_over) y la rehace; None
+        mientras no hayan llegado la configuración, las misiones y el historial
+        (o registros recientes que cubran desde la agenda anterior).
+        """
+        now = now or datetime.now()
+        with self.lock:
+            if "config" not in self.datasets:
+                return None
+            reset_time = self.datasets["config"]["data"]["daily_reset_time"]
+            self.next_reset = next_reset(now, reset_time)
+            if not all(key in self.datasets for key in ("profile", "missions")):
+                return None
+            day = game_day(now, reset_time)
+            # Se rehace al cambiar de día o de misiones (una recarga también las cambia)
+            revision = (day, self.revisions.get("missions"))
+            if self._agenda is not None and self._agenda_revision == revision:
+                return self._agenda
+            previous = (self.datasets["profile"]["data"]["agenda"] or {}).get("date")
+            # roll_over necesita el historial desde la agenda anterior (todo si no hay)
+            since = min(date.fromisoformat(previous), day) if previous else None
+            if "mission_log" in self.datasets:
+                if previous != day.isoformat():
+                    self.restore("mission_log", since=since)
+                state = UserState(self.username, self.datasets)
+            elif covers(self.recent, since):
+                # Sin el historial todavía: alcanza con los registros recientes
+                recent = {"data": self.recent["records"], "sha": self.recent["source"]}
+                state = UserState(self.username, dict(self.datasets, mission_log=recent))
+            else:
+                return None
+            if roll_over(state, day):
+                self._changed(["profile"])
+            self._agenda = build_agenda(state, day)
+            self._agenda_revision = revision
+            return self._agenda
+
+    def day_log(self, day: date) -> Dict[str, Dict]:
+        """Registros de un día por misión: del historial o, mientras llega, de los recientes"""
+        with self.lock:
+            if "mission_log" in self.datasets:
+                self.restore("mission_log", since=day)
+                records = self.datasets["mission_log"]["data"]
+            elif covers(self.recent, day):
+                records = self.recent["records"]
+            else:
+                return {}
+            return completions_index(records).get(day.isoformat(), {})
+
+    def errors(self) -> Dict[str, str]:
+        loader = self.loader
+        return loader.errors if loader is not None else {}
+
+    def retry(self, backend):
+        """Vuelve a pedir solo lo que falló; lo ya cargado puede tener cambios sin guardar"""
+        with self.lock:
+            missing = [key for key in COLD_KEYS if key not in self.datasets]
+            self.loader = HistoryLoader(self.username, backend, missing)
+
+    def snapshot(self):
+        """(datasets, revisiones) actuales, para enlazar una sesión"""
+        with self.lock:
+            return dict(self.datasets), dict(self.revisions)
+
+    def publish(self, *keys: str) -> Dict[str, int]:
+        """Registra cambios hechos por una sesión; devuelve las revisiones nuevas"""
+        with self.lock:
+            self._changed(keys)
+            return {key: self.revisions[key] for key in keys}
+
+    def restore(self, *keys: str, since=None) -> Dict[str, int]:
+        """Rehidrata el historial compactado; devuelve las revisiones de lo rehidratado"""
+        restored = []
+        with self.lock:
+            for key in keys:
+                dataset = self.datasets.get(key)
+                if dataset is not None and is_compacted(dataset, since):
+                    restore_dataset(key, dataset)
+                    restored.append(key)
+            self._changed(restored)
+            return {key: self.revisions[key] for key in restored}
+
+    def save(self, backend) -> bool:
+        """Guarda lo cargado; el historial aún en camino no se toca"""
+        with self.lock, timed_operation("save"):
+            keys = [key for key in USER_FILES.values() if key in self.datasets]
+            log = self.datasets.get("mission_log")
+            log_sha = log["sha"] if log is not None else None
+            if log is not None:
+                # Al día con lo que se va a guardar, mientras la SHA vieja aún sirve para leer la copia
+                self.columns(backend)
+            ok = write_user_data(self.username, self.datasets, keys, backend)
+            if log is not None and log["sha"] != log_sha:
+                self.save_columns(backend)
+                self.save_recent(backend)
+            return self.save_search_index(backend) and ok
+
+    def export(self, out, fmt: str = "zip", since: str | None = None) -> Dict:
+        """Backup de lo cargado (incluido lo no guardado) escrito en `out`; ver lifegame.backup"""
+        with self.lock, timed_operation("export"):
+            return write_export(out, [(self.username, session_files(self.datasets))], fmt, since)
+
+    def columns(self, backend) -> MissionLogColumns:
+        """
+        mission_log en columnas (ver lifegame.columnar), al día con lo
+        cargado. Se mantienen en memoria y solo se les agregan los registros
+        nuevos; la primera vez salen de mission_log.cols si es de la SHA
+        cargada. Solo se rehacen desde los registros (rehidratando la parte
+        compactada) si el mission_log se reemplazó o perdió registros.
+        """
+        with self.lock:
+            dataset = self.datasets["mission_log"]
+            columns = self._columns if self._columns_dataset is dataset else None
+            if columns is None and dataset["sha"]:
+                columns = read_columns(self.username, backend, dataset["sha"])
+            archive = dataset.get("archive")
+            archived = archive.count if archive is not None else 0
+            data = dataset["data"]
+            if columns is not None:
+                rows = len(columns) - archived
+                # La última fila conocida tiene que seguir siendo la misma
+                if not (0 <= rows <= len(data) and (rows == 0 or columns.matches(len(columns) - 1, data[rows - 1]))):
+                    columns = None
+            if columns is None:
+                records = archive.records() + data if archive is not None else data
+                columns = MissionLogColumns.from_records(records, source=dataset["sha"])
+            else:
+                for record in data[len(columns) - archived:]:
+                    columns.append(record)
+            self._columns, self._columns_dataset = columns, dataset
+            return columns
+
+    def save_columns(self, backend) -> bool:
+        """
+        Guarda mission_log.cols con la SHA del mission_log recién guardado.
+        Es una copia derivada: si falla, load_columns la reconstruye desde
+        el JSONL y el guardado no se da por fallido.
+        """
+        with self.lock:
+            columns = self.columns(backend)
+            columns.source = self.datasets["mission_log"]["sha"]
+            # La SHA guardada puede ser vieja si la CLI reescribió el archivo
+            new_sha = write_columns(self.username, columns, backend, self._columns_sha)
+            if not new_sha and self._columns_sha is not None:
+                new_sha = write_columns(self.username, columns, backend)
+            self._columns_sha = new_sha
+            return bool(new_sha)
+
+    def save_recent(self, backend) -> bool:
+        """
+        Guarda mission_log.recent.json con la SHA del mission_log recién
+        guardado. Como mission_log.cols, es derivado: si falla, la próxima
+        carga espera al historial.
+        """
+        with self.lock:
+            reset_time = self.datasets["config"]["data"]["daily_reset_time"]
+            since = game_day(datetime.now(), reset_time) - timedelta(days=RECENT_DAYS)
+            self.restore("mission_log", since=since)
+            log = self.datasets["mission_log"]
+            recent = recent_log(log["data"], since, log["sha"])
+            new_sha = write_recent_log(self.username, recent, backend, self._recent_sha)
+            if not new_sha and self._recent_sha is not None:
+                new_sha = write_recent_log(self.username, recent, backend)
+            self.recent, self._recent_sha = recent, new_sha
+            return bool(new_sha)
+
+    def save_search_index(self, backend) -> bool:
+        with self.lock:
+            if "search_index" not in self.datasets:
+                return True
+            self.restore("search_index")
+            dataset = self.datasets["search_index"]
+            index = dataset["data"]
+            # Solo si está sincronizado refleja los archivos recién guardados
+            sources = search_sources(self.datasets) if self.search_synced else index.sources
+            if not index.dirty and index.sources == sources:
+                return True
+            previous, index.sources = index.sources, sources
+            new_sha = backend.put(self.username, SEARCH_INDEX_FILE, index.to_json(), dataset["sha"])
+            if new_sha:
+                dataset["sha"] = new_sha
+                index.dirty = False
+            else:
+                index.sources = previous
+            return bool(new_sha)
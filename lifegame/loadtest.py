@@ -0,0 +1,378 @@
+"""
+Prueba de carga de la app con sesiones simuladas (streamlit.testing AppTest).
+
+    python -m lifegame loadtest --sessions 40 --concurrency 10 --users 10
+    python -m lifegame loadtest --backend mock --latency-ms 80 --fail-rate 0.01
+
+Cada sesión recorre un guion realista: login, dashboard (esperando el
+historial), completar misiones, vista de mes del calendario, una entrada de
+diario y guardar. Las sesiones corren en hilos del mismo proceso, como en el
+servidor de Streamlit, así que comparten los UserHub (st.cache_resource) de
+los usuarios repetidos y el presupuesto de lifegame.memory. Los usuarios son
+sintéticos (lifegame.bench) y viven en un directorio temporal o en el mock
+de GitHub (lifegame.mockgithub).
+"""
+
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List
+from unittest.mock import MagicMock
+from urllib import parse
+
+import streamlit as st
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.pages_manager import PagesManager
+from streamlit.runtime.secrets import Secrets
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Button, TextInput
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+from streamlit.testing.v1.util import patch_config_options
+
+from lifegame import storage
+from lifegame.bench import generate_user
+from lifegame.memory import get_memory_manager, MB
+from lifegame.metrics import REGISTRY
+from lifegame.scheduler import SCHEDULER
+from lifegame.storage import LocalBackend, write_user_data
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+PASSWORD = "bench"
+
+# Reruns de espera al historial antes de darlo por fallido
+HISTORY_POLLS = 100
+HISTORY_POLL_SECONDS = 0.05
+
+# AppTest siempre hace reruns completos; en el servidor un clic dentro de un
+# fragment solo reejecuta el fragment y st.rerun(scope="fragment") es válido
+FRAGMENT_RERUN_ERROR = 'scope="fragment"'
+
+def rss_bytes() -> int:
+    """Memoria residente del proceso (Linux: /proc; si no, el pico de getrusage)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+# =========================================================
+#  APPTEST CONCURRENTE
+# =========================================================
+
+def _not_fragment_rerun(record: logging.LogRecord) -> bool:
+    exc = record.exc_info[1] if record.exc_info else None
+    return exc is None or FRAGMENT_RERUN_ERROR not in str(exc)
+
+@contextmanager
+def shared_app_runtime(auth: Dict[str, str]):
+    """
+    Runtime simulado, st.secrets y config de prueba para todo el proceso.
+    AppTest los monta y desmonta en cada run (globales del módulo), lo que
+    rompe las sesiones que corren a la vez en otros hilos.
+    """
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    saved_secrets = st.secrets
+    secrets = Secrets()
+    secrets._secrets = {"auth": auth}
+    error_logger = logging.getLogger("streamlit.error_util")
+    Runtime._instance = runtime
+    st.secrets = secrets
+    error_logger.addFilter(_not_fragment_rerun)
+    try:
+        with patch_config_options({"global.appTest": True}):
+            yield
+    finally:
+        error_logger.removeFilter(_not_fragment_rerun)
+        st.secrets = saved_secrets
+        Runtime._instance = None
+
+class SessionAppTest(AppTest):
+    """AppTest.run sin tocar los globales; requiere shared_app_runtime (streamlit 1.39)"""
+
+    def _run(self, widget_state=None, timeout=None):
+        pages_manager = PagesManager(self._script_path, setup_watcher=False)
+        script_runner = LocalScriptRunner(self._script_path, self.session_state, pages_manager, args=self.args, kwargs=self.kwargs)
+        self._tree = script_runner.run(widget_state, self.query_params, timeout or self.default_timeout, self._page_hash)
+        self._tree._runner = self
+        self.query_params = parse.parse_qs(script_runner.event_data[-1]["client_state"].query_string)
+        return self
+
+# =========================================================
+#  DATOS Y BACKEND
+# =========================================================
+
+def seed_users(count: int, missions: int, years: int) -> Dict[str, Dict]:
+    """{usuario: datasets} sintéticos bench_<i> (semilla = i)"""
+    return {f"bench_{i}": generate_user(missions, years, seed=i) for i in range(count)}
+
+def setup_local(users: Dict[str, Dict], data_dir: str | None = None) -> str:
+    data_dir = data_dir or tempfile.mkdtemp(prefix="lifegame-loadtest-")
+    backend = LocalBackend(data_dir)
+    for username, datasets in users.items():
+        write_user_data(username, datasets, backend=backend)
+    os.environ["LIFEGAME_DATA_DIR"] = data_dir
+    return data_dir
+
+def setup_mock(users: Dict[str, Dict], **server_options):
+    """Mock de GitHub en un puerto libre, precargado; la app lo usa vía API_BASE"""
+    from lifegame.defaults import USER_FILES
+    from lifegame.mockgithub import MockGitHubServer
+    repo = "loadtest/lifegame"
+    server = MockGitHubServer(default_repo=repo, **server_options)
+    server.seed_users(repo, {
+        username: {fname: storage.serialize_user_file(fname, datasets[key]["data"]) for fname, key in USER_FILES.items()}
+        for username, datasets in users.items()
+    })
+    base_url = server.start()
+    os.environ.pop("LIFEGAME_DATA_DIR", None)
+    os.environ.update(LIFEGAME_API_BASE=base_url, LIFEGAME_GITHUB_TOKEN="loadtest", LIFEGAME_GITHUB_REPO=repo)
+    storage.API_BASE = base_url
+    return server
+
+# =========================================================
+#  SESIÓN SIMULADA
+# =========================================================
+
+class SimulatedSession:
+    """Un jugador: un AppTest y la latencia de cada rerun, por paso del guion"""
+
+    def __init__(self, username: str, missions_to_complete: int = 3, think_seconds: float = 0.0, timeout: float = 60):
+        self.username = username
+        self.missions_to_complete = missions_to_complete
+        self.think_seconds = think_seconds
+        self.at = SessionAppTest(APP_PATH, default_timeout=timeout)
+        self.timings: List[tuple] = []
+        self.errors: List[str] = []
+        self.retries = 0
+
+    def _run(self, step: str, action=None):
+        """Un rerun medido; `action` prepara el widget (click, input, ...)"""
+        if self.think_seconds:
+            time.sleep(self.think_seconds)
+        started = time.perf_counter()
+        (action() if action else self.at).run()
+        if any(FRAGMENT_RERUN_ERROR in e.message for e in self.at.exception):
+            self.at.run()
+        self.timings.append((step, time.perf_counter() - started))
+        unexpected = [e.message for e in self.at.exception if FRAGMENT_RERUN_ERROR not in e.message]
+        self.errors += [f"{step}: {message}" for message in unexpected]
+
+    def _forget_login_widgets(self):
+        # Tras el login el árbol conserva los widgets de la pantalla anterior,
+        # que AppTest intentaría reenviar en el siguiente rerun
+        for key, node in list(self.at.main.children.items()):
+            if isinstance(node, (TextInput, Button)):
+                del self.at.main.children[key]
+
+    def login(self):
+        self._run("open")
+        # Con muchas sesiones a la vez AppTest devuelve a veces un árbol vacío
+        # en el primer run (sin excepción); se reintenta y se cuenta aparte
+        while len(self.at.text_input) < 2 and self.retries < 2:
+            self.retries += 1
+            self._run("open")
+        self.at.text_input[0].input(self.username)
+        self.at.text_input[1].input(PASSWORD)
+        self._run("login", lambda: self.at.button[0].click())
+        self._forget_login_widgets()
+        if not self.at.session_state["authenticated"]:
+            raise RuntimeError(f"{self.username}: login fallido")
+
+    def dashboard(self):
+        self._run("dashboard")
+        # El fragment que sondea el historial no corre solo en AppTest
+        for _ in range(HISTORY_POLLS):
+            if "mission_log" in self.at.session_state:
+                return
+            time.sleep(HISTORY_POLL_SECONDS)
+            self._run("history_poll")
+        self.errors.append("dashboard: el historial no terminó de cargar")
+
+    def complete_missions(self):
+        for _ in range(self.missions_to_complete):
+            pending = [b for b in self.at.button if (b.key or "").startswith("complete_")]
+            if not pending:
+                return
+            self._run("complete_mission", pending[0].click)
+
+    def navigate(self, page: str, step: str):
+        self._run(step, lambda: self.at.sidebar.radio[0].set_value(page))
+
+    def journal_entry(self):
+        self.navigate("📔 Diario", "journal")
+        if not self.at.text_area:
+            self.errors.append("journal: sin formulario")
+            return
+        self.at.text_area[0].input(f"Prueba de carga de {self.username}: entrené, estudié y escribí.")
+        submit = next(b for b in self.at.button if b.label == "Guardar Registro")
+        self._run("journal_save", submit.click)
+
+    def save(self):
+        button = next(b for b in self.at.sidebar.button if "Guardar Todo" in b.label)
+        self._run("save", button.click)
+
+    def script(self):
+        try:
+            self.login()
+            self.dashboard()
+            self.complete_missions()
+            self.navigate("📅 Calendario", "calendar_month")
+            self.journal_entry()
+            self.save()
+        except Exception as e:
+            last_step = self.timings[-1][0] if self.timings else "start"
+            self.errors.append(f"después de {last_step}: {type(e).__name__}: {e}")
+
+# =========================================================
+#  EJECUCIÓN Y REPORTE
+# =========================================================
+
+def run_load_test(
+    sessions: int = 20,
+    concurrency: int = 5,
+    users: int | None = None,
+    backend: str = "local",
+    missions: int = 20,
+    years: int = 1,
+    missions_to_complete: int = 3,
+    think_seconds: float = 0.0,
+    data_dir: str | None = None,
+    limit_scale: float = 10.0,
+    **mock_options,
+) -> Dict:
+    """
+    Corre `sessions` sesiones, `concurrency` a la vez, repartidas en
+    `users` usuarios (por defecto uno por sesión). Devuelve el reporte.
+    Contra el mock, los límites de lifegame.scheduler se multiplican por
+    `limit_scale`: las sesiones no tienen pausas y comprimen el tiempo.
+    """
+    users = users or sessions
+    datasets = seed_users(users, missions, years)
+    server = setup_mock(datasets, **mock_options) if backend == "mock" else None
+    if server is None:
+        setup_local(datasets, data_dir)
+    else:
+        SCHEDULER.configure(limit_scale)
+    del datasets
+
+    # Los AppTest se crean fuera de un script run; Streamlit lo avisa por cada uno
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    usernames = [f"bench_{i % users}" for i in range(sessions)]
+    simulated = [SimulatedSession(name, missions_to_complete, think_seconds) for name in usernames]
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    running = [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    def run(session: SimulatedSession):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            session.script()
+        finally:
+            with lock:
+                running[0] -= 1
+
+    auth = {name: PASSWORD for name in set(usernames)}
+    with shared_app_runtime(auth), ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, simulated))
+    elapsed = time.perf_counter() - started
+    # Los AppTest siguen vivos: la memoria incluye el estado de todas las sesiones
+    rss_after = rss_bytes()
+    manager = get_memory_manager()
+    report = build_report(simulated, elapsed)
+    report["params"] = {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "peak_concurrency": peak[0],
+        "users": users,
+        "backend": backend,
+        "missions": missions,
+        "years": years,
+    }
+    report["memory"] = {
+        "rss_before_mb": round(rss_before / MB, 1),
+        "rss_after_mb": round(rss_after / MB, 1),
+        "per_session_mb": round((rss_after - rss_before) / MB / sessions, 2),
+        "history_mb": round(manager.usage() / MB, 1),
+        "history_budget_mb": round(manager.budget / MB),
+    }
+    if server is not None:
+        report["github"] = dict(server.stats)
+        report["github_queue_wait_p95_ms"] = round(REGISTRY.rolling_summary()["github_wait_p95_ms"], 1)
+        report["params"]["limit_scale"] = limit_scale
+        server.stop()
+    return report
+
+def build_report(simulated: List[SimulatedSession], elapsed: float) -> Dict:
+    by_step: Dict[str, List[float]] = {}
+    for session in simulated:
+        for step, seconds in session.timings:
+            by_step.setdefault(step, []).append(seconds * 1000)
+    all_ms = [ms for values in by_step.values() for ms in values]
+    completed = sum(1 for session in simulated if not session.errors)
+
+    def latency(values: List[float]) -> Dict:
+        return {
+            "count": len(values),
+            "p50_ms": round(percentile(values, 0.50), 1),
+            "p95_ms": round(percentile(values, 0.95), 1),
+            "p99_ms": round(percentile(values, 0.99), 1),
+            "mean_ms": round(statistics.fmean(values), 1) if values else 0.0,
+        }
+
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "sessions_ok": completed,
+        "sessions_failed": len(simulated) - completed,
+        "harness_retries": sum(session.retries for session in simulated),
+        "reruns_per_s": round(len(all_ms) / elapsed, 2) if elapsed else 0.0,
+        "sessions_per_min": round(completed / elapsed * 60, 1) if elapsed else 0.0,
+        "reruns": latency(all_ms),
+        "steps": {step: latency(values) for step, values in by_step.items()},
+        "errors": [error for session in simulated for error in session.errors][:20],
+    }
+
+def format_report(report: Dict) -> str:
+    params = report["params"]
+    memory = report["memory"]
+    lines = [
+        f"{params['sessions']} sesiones ({params['users']} usuarios, {params['concurrency']} concurrentes, "
+        f"pico {params['peak_concurrency']}) contra backend {params['backend']}",
+        f"  {report['elapsed_s']:.1f} s · {report['sessions_ok']} completas · {report['sessions_failed']} con errores"
+        f" · {report['harness_retries']} reintentos de AppTest",
+        f"  {report['reruns_per_s']:.1f} reruns/s · {report['sessions_per_min']:.1f} sesiones/min",
+        f"  RSS {memory['rss_before_mb']:.0f} → {memory['rss_after_mb']:.0f} MB ({memory['per_session_mb']:.2f} MB/sesión), "
+        f"historial {memory['history_mb']:.1f}/{memory['history_budget_mb']} MB",
+        "",
+        f"{'paso':<18} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9}",
+    ]
+    for step, stats in list(report["steps"].items()) + [("TOTAL", report["reruns"])]:
+        lines.append(f"{step:<18} {stats['count']:>6} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}")
+    if report.get("github"):
+        lines += ["", "GitHub simulado: " + ", ".join(f"{k}: {v}" for k, v in sorted(report["github"].items()))]
+        lines.append(f"  espera en la cola de peticiones p95: {report['github_queue_wait_p95_ms']:.1f} ms (límites x{report['params']['limit_scale']:g})")
+    if report["errors"]:
+        lines += ["", "Errores:"] + [f"  {error[:200]}" for error in report["errors"]]
+    return "\n".join(lines)
@@ -0,0 +1,332 @@
+"""
+Memoria acotada por proceso para el historial de las sesiones.
+
+Cada usuario cargado (ver lifegame.hub) registra sus datasets fríos
+(mission_log, journal, decisions y el índice de búsqueda) en un UserMemory.
+Cuando la memoria estimada de todos los usuarios supera el presupuesto, los
+menos usados e inactivos compactan su historial: los registros anteriores a
+la ventana se guardan como JSONL comprimido en el propio dataset y las
+vistas derivadas de sus sesiones se descartan. Si con los inactivos no
+alcanza, se compacta también la parte fuera de la ventana de los activos,
+salvo los datasets que sus páginas acaban de rehidratar (ver UserMemory.pin):
+compactarlos solo para que el rerun siguiente los vuelva a descomprimir
+cuesta un zlib de ida y vuelta por rerun sin bajar la memoria.
+storage.write_user_file guarda la parte compactada tal cual, y
+restore_dataset la devuelve a dicts cuando una página la necesita.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List
+
+from lifegame.agenda import game_day
+from lifegame.defaults import DEFAULT_CONFIG
+from lifegame.search import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Un usuario con alguna sesión activa hace menos de esto solo se compacta si
+# con los inactivos no alcanza, y sin tocar las vistas de sus sesiones
+IDLE_SECONDS = 60
+
+# Como mucho un aviso por intervalo mientras se siga por encima del presupuesto
+OVER_BUDGET_LOG_SECONDS = 60
+
+# Sesiones sin actividad desde hace más de esto dejan de contar como vivas
+SESSION_TTL_SECONDS = 3600
+
+# Bytes en memoria por byte de JSON (dicts, str e ints de Python), medido
+# sobre registros típicos de mission_log y journal
+PY_OBJECT_OVERHEAD = 3
+
+# Estimación por entrada de posting (con su término en doc_terms) y por
+# documento del índice de búsqueda
+POSTING_BYTES = 110
+DOC_META_BYTES = 500
+
+# Registros muestreados para estimar el tamaño medio de un registro
+SIZE_SAMPLE = 32
+
+def default_budget_mb() -> int:
+    """Presupuesto de todo el proceso; lo fija quien corre el servidor, no los usuarios"""
+    return int(os.environ.get("LIFEGAME_CACHE_MB", DEFAULT_CONFIG["cache_size_mb"]))
+
+def record_date(record: Dict) -> str:
+    return (record.get("date") or record.get("timestamp", ""))[:10]
+
+# =========================================================
+#  REPRESENTACIÓN COMPACTA
+# =========================================================
+
+class CompactLog:
+    """
+    Texto JSONL (o JSON) comprimido con zlib; ~20x menos que los dicts.
+
+    No se usan columnas (lifegame.columnar.MissionLogColumns): la parte
+    compactada se guarda tal cual y se rehidrata a los registros completos,
+    y las columnas solo conservan misión, día, estado, XP y tokens del
+    mission_log (no notas, timestamps ni el texto del diario y las
+    decisiones). Aun así el mission_log comprimido ocupa menos: ~15 bytes
+    por registro contra ~17 de las columnas sin comprimir.
+    """
+
+    __slots__ = ("blob", "count")
+
+    def __init__(self, text: str, count: int):
+        self.blob = zlib.compress(text.encode("utf-8"), 6)
+        self.count = count
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "CompactLog":
+        # Mismo formato que storage.serialize_user_file para guardar sin rehidratar
+        return cls("\n".join(json.dumps(item) for item in records), len(records))
+
+    def text(self) -> str:
+        return zlib.decompress(self.blob).decode("utf-8")
+
+    def records(self) -> List[Dict]:
+        return [json.loads(line) for line in self.text().splitlines() if line.strip()]
+
+    def lines(self, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """Líneas no vacías, descomprimiendo de a `chunk_size` bytes"""
+        decompressor = zlib.decompressobj()
+        pending = b""
+        for start in range(0, len(self.blob), chunk_size):
+            pending += decompressor.decompress(self.blob[start:start + chunk_size])
+            *complete, pending = pending.split(b"\n")
+            for line in complete:
+                if line.strip():
+                    yield line.decode("utf-8")
+        pending += decompressor.flush()
+        for line in pending.split(b"\n"):
+            if line.strip():
+                yield line.decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.blob)
+
+def compact_history(dataset: Dict, cutoff: str):
+    """
+    Comprime el prefijo de registros anteriores a `cutoff` (fecha ISO). Solo
+    el prefijo, para que archivo + registros vivos conserven el orden original.
+    """
+    records = dataset["data"]
+    n = 0
+    while n < len(records) and record_date(records[n]) < cutoff:
+        n += 1
+    if not n:
+        return
+    archived = records[:n]
+    archive = dataset.get("archive")
+    if archive is not None:
+        archived = archive.records() + archived
+    dataset["archive"] = CompactLog.from_records(archived)
+    dataset["archived_before"] = cutoff
+    dataset["data"] = records[n:]
+
+def compact_search_index(dataset: Dict):
+    index = dataset["data"]
+    if index is None:
+        return
+    dataset["archive"] = CompactLog(index.to_json(), len(index.doc_sig))
+    dataset["archived_dirty"] = index.dirty
+    dataset["data"] = None
+
+def is_compacted(dataset: Dict, since: date | None = None) -> bool:
+    """True si faltan registros de `since` en adelante (o cualquiera, sin `since`)"""
+    if dataset.get("archive") is None:
+        return False
+    archived_before = dataset.get("archived_before")
+    return since is None or archived_before is None or since.isoformat() < archived_before
+
+def restore_dataset(key: str, dataset: Dict):
+    """Devuelve la parte compactada a dicts, delante de los registros vivos"""
+    archive = dataset.pop("archive")
+    dataset.pop("archived_before", None)
+    if key == "search_index":
+        index = SearchIndex.from_json(archive.text())
+        index.dirty = dataset.pop("archived_dirty", False)
+        dataset["data"] = index
+    else:
+        dataset["data"] = archive.records() + dataset["data"]
+
+# =========================================================
+#  SESIONES Y PRESUPUESTO
+# =========================================================
+
+class UserMemory:
+    """
+    Historial de un usuario visto por el gestor. `lock` es el del hub del
+    usuario, de modo que compactar y rehidratar no se cruzan con sus sesiones.
+    """
+
+    def __init__(self, lock):
+        self.lock = lock
+        self.datasets: Dict[str, Dict] = {}
+        self.sessions: Dict[str, tuple] = {}
+        self.window_days = DEFAULT_CONFIG["history_window_days"]
+        # La ventana se cuenta en días de juego, como el resto del historial
+        self.reset_time = DEFAULT_CONFIG["daily_reset_time"]
+        # Tope propio (config cache_size_mb): se compacta al superarlo aunque
+        # el total del proceso quepa, pero no amplía el presupuesto del proceso
+        self.share = DEFAULT_CONFIG["cache_size_mb"] * MB
+        self.last_used = time.monotonic()
+        # Dataset -> cuándo lo rehidrató entero alguna página del usuario
+        self.pinned: Dict[str, float] = {}
+        self.nbytes = 0
+        self._record_bytes: Dict[str, tuple] = {}
+
+    def _dataset_bytes(self, key: str, dataset: Dict) -> int:
+        archive = dataset.get("archive")
+        nbytes = archive.nbytes if archive is not None else 0
+        data = dataset["data"]
+        if data is None:
+            return nbytes
+        if key == "search_index":
+            entries = sum(len(posting) for posting in data.postings.values())
+            return nbytes + entries * POSTING_BYTES + len(data.doc_meta) * DOC_META_BYTES
+        if not data:
+            return nbytes
+        cached = self._record_bytes.get(key)
+        if cached is None or cached[0] is not data:
+            step = max(1, len(data) // SIZE_SAMPLE)
+            sample = data[::step]
+            cached = (data, sum(len(json.dumps(r)) for r in sample) / len(sample))
+            self._record_bytes[key] = cached
+        return nbytes + int(len(data) * cached[1] * PY_OBJECT_OVERHEAD)
+
+    def register_session(self, session_id: str, caches: List):
+        """Vistas derivadas de una sesión, que se descartan al compactar"""
+        now = time.monotonic()
+        with self.lock:
+            self.sessions[session_id] = (now, caches)
+            for sid, (last_seen, _) in list(self.sessions.items()):
+                if now - last_seen > SESSION_TTL_SECONDS:
+                    del self.sessions[sid]
+        self.last_used = now
+
+    def pin(self, *keys: str):
+        """Datasets que una página usa enteros; no se compactan mientras el usuario siga activo"""
+        now = time.monotonic()
+        for key in keys:
+            self.pinned[key] = now
+
+    def is_pinned(self, key: str, now: float) -> bool:
+        return now - self.pinned.get(key, float("-inf")) < IDLE_SECONDS
+
+    def measure(self) -> int:
+        self.nbytes = sum(self._dataset_bytes(key, dataset) for key, dataset in self.datasets.items())
+        return self.nbytes
+
+    def compact(self, active: bool = False) -> int:
+        """
+        Compacta el historial fuera de la ventana y descarta las vistas
+        derivadas. Con `active` (usuario en uso) solo compacta el historial
+        que sus páginas no rehidrataron hace poco: el índice de búsqueda,
+        las vistas y lo fijado con `pin` se usan en los reruns en curso.
+        Devuelve cuántos datasets compactó.
+        """
+        cutoff = (game_day(datetime.now(), self.reset_time) - timedelta(days=self.window_days)).isoformat()
+        now = time.monotonic()
+        compacted = 0
+        with self.lock:
+            for key, dataset in self.datasets.items():
+                if active and (key == "search_index" or self.is_pinned(key, now)):
+                    continue
+                archive = dataset.get("archive")
+                if key != "search_index":
+                    compact_history(dataset, cutoff)
+                else:
+                    compact_search_index(dataset)
+                compacted += dataset.get("archive") is not archive
+            if not active:
+                for _, caches in self.sessions.values():
+                    for cache in caches:
+                        cache.clear()
+            self._record_bytes.clear()
+            self.measure()
+        return compacted
+
+class MemoryManager:
+    """LRU de usuarios con un presupuesto de memoria para todo el proceso"""
+
+    def __init__(self, budget_mb: int):
+        self.budget = budget_mb * MB
+        self._users: "OrderedDict[int, weakref.ref]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._logged_at = 0.0
+
+    def touch(self, user: UserMemory):
+        """Marca al usuario como el más reciente"""
+        user.last_used = time.monotonic()
+        with self._lock:
+            self._users[id(user)] = weakref.ref(user)
+            self._users.move_to_end(id(user))
+
+    def users(self) -> List[UserMemory]:
+        """Usuarios vivos, del menos al más reciente"""
+        with self._lock:
+            alive = []
+            for key, ref in list(self._users.items()):
+                user = ref()
+                if user is None:
+                    del self._users[key]
+                else:
+                    alive.append(user)
+            return alive
+
+    def usage(self) -> int:
+        return sum(user.nbytes for user in self.users())
+
+    def session_count(self) -> int:
+        return sum(len(user.sessions) for user in self.users())
+
+    def enforce(self) -> int:
+        """
+        Compacta a los usuarios que superan su propio tope y después (LRU
+        primero) hasta entrar en el presupuesto: los inactivos por completo
+        y, si no alcanza, el historial fuera de la ventana de los activos.
+        Devuelve cuántos datasets compactó.
+        """
+        users = self.users()
+        total = sum(user.nbytes for user in users)
+        now = time.monotonic()
+        compacted = 0
+        for user in users:
+            if user.nbytes > user.share:
+                before = user.nbytes
+                compacted += user.compact(now - user.last_used < IDLE_SECONDS)
+                total -= before - user.nbytes
+        for active in (False, True):
+            for user in users:
+                if total <= self.budget:
+                    break
+                if (now - user.last_used < IDLE_SECONDS) != active:
+                    continue
+                before = user.nbytes
+                compacted += user.compact(active)
+                total -= before - user.nbytes
+        if total > self.budget and now - self._logged_at >= OVER_BUDGET_LOG_SECONDS:
+            self._logged_at = now
+            logger.warning("Historial en memoria (%.1f MB) por encima del presupuesto (%.0f MB)", total / MB, self.budget / MB)
+        return compacted
+
+_manager: MemoryManager | None = None
+_manager_lock = threading.Lock()
+
+def get_memory_manager() -> MemoryManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = MemoryManager(default_budget_mb())
+        return _manager
@@ -0,0 +1,251 @@
+"""
+Métricas del proceso: uso de la API de GitHub (peticiones, estados,
+latencias, espera en cola, bytes, X-RateLimit-Remaining), duración de
+reruns por página y latencia de carga y guardado.
+
+Se exponen en formato de texto de Prometheus en un archivo
+(LIFEGAME_METRICS_FILE) o en un endpoint HTTP local
+(LIFEGAME_METRICS_PORT, ruta /metrics), y como resumen móvil para la app
+(`rolling_summary`). Este módulo no importa Streamlit.
+"""
+
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Ventana del resumen en la app y cada cuánto se reescribe el archivo
+ROLLING_WINDOW_SECONDS = 15 * 60
+EXPORT_INTERVAL_SECONDS = 15
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class MetricsRegistry:
+    """Contadores, gauges e histogramas con etiquetas, más eventos recientes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[tuple, float]] = {}
+        self.gauges: Dict[str, Dict[tuple, float]] = {}
+        self.histograms: Dict[str, Dict[tuple, Histogram]] = {}
+        self.help: Dict[str, str] = {}
+        self.recent: deque = deque()
+        self._last_export = 0.0
+
+    def _key(self, labels: Dict[str, str]) -> tuple:
+        return tuple(sorted(labels.items()))
+
+    def inc(self, name: str, labels: Dict[str, str] | None = None, value: float = 1):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            key = self._key(labels or {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: Dict[str, str] | None = None):
+        with self._lock:
+            self.gauges.setdefault(name, {})[self._key(labels or {})] = value
+
+    def observe(self, name: str, value: float, labels: Dict[str, str] | None = None):
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            key = self._key(labels or {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    def event(self, kind: str, **fields):
+        """Evento para el resumen móvil; se descartan los de fuera de la ventana"""
+        now = time.time()
+        with self._lock:
+            self.recent.append((now, kind, fields))
+            while self.recent and now - self.recent[0][0] > ROLLING_WINDOW_SECONDS:
+                self.recent.popleft()
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines += [f"# HELP {name} {self.help.get(name, name)}", f"# TYPE {name} counter"]
+                lines += [f"{name}{_labels(dict(key))} {value:g}" for key, value in sorted(series.items())]
+            for name, series in sorted(self.gauges.items()):
+                lines += [f"# HELP {name} {self.help.get(name, name)}", f"# TYPE {name} gauge"]
+                lines += [f"{name}{_labels(dict(key))} {value:g}" for key, value in sorted(series.items())]
+            for name, series in sorted(self.histograms.items()):
+                lines += [f"# HELP {name} {self.help.get(name, name)}", f"# TYPE {name} histogram"]
+                for key, hist in sorted(series.items()):
+                    labels = dict(key)
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels({**labels, 'le': f'{bound:g}'})} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {hist.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {hist.sum:.6f}")
+                    lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def rolling_summary(self) -> Dict:
+        """Resumen de los últimos ROLLING_WINDOW_SECONDS para mostrar en la app"""
+        now = time.time()
+        with self._lock:
+            events = [(t, kind, fields) for t, kind, fields in self.recent if now - t <= ROLLING_WINDOW_SECONDS]
+            remaining = self.gauges.get("lifegame_github_ratelimit_remaining", {}).get((), None)
+        github = [f for _, kind, f in events if kind == "github"]
+        reruns: Dict[str, List[float]] = {}
+        for _, kind, f in events:
+            if kind == "rerun":
+                reruns.setdefault(f["page"], []).append(f["seconds"])
+        operations: Dict[str, List[float]] = {}
+        for _, kind, f in events:
+            if kind == "operation":
+                operations.setdefault(f["operation"], []).append(f["seconds"])
+        latencies = [f["seconds"] for f in github]
+        waits = [f["wait"] for f in github]
+        minutes = ROLLING_WINDOW_SECONDS / 60
+        return {
+            "window_minutes": minutes,
+            "github_requests": len(github),
+            "github_per_minute": len(github) / minutes,
+            "github_errors": sum(1 for f in github if f["status"] >= 400),
+            "github_p50_ms": percentile(latencies, 0.5) * 1000,
+            "github_p95_ms": percentile(latencies, 0.95) * 1000,
+            "github_wait_p95_ms": percentile(waits, 0.95) * 1000,
+            "ratelimit_remaining": remaining,
+            "reruns": {
+                page: {"count": len(values), "p50_ms": percentile(values, 0.5) * 1000, "p95_ms": percentile(values, 0.95) * 1000}
+                for page, values in sorted(reruns.items())
+            },
+            "operations": {
+                op: {"count": len(values), "p50_ms": percentile(values, 0.5) * 1000, "p95_ms": percentile(values, 0.95) * 1000}
+                for op, values in sorted(operations.items())
+            },
+        }
+
+REGISTRY = MetricsRegistry()
+REGISTRY.help.update({
+    "lifegame_github_requests_total": "Peticiones a la API de GitHub por método y estado",
+    "lifegame_github_bytes_total": "Bytes enviados y recibidos de la API de GitHub",
+    "lifegame_github_request_seconds": "Latencia de las peticiones a la API de GitHub",
+    "lifegame_github_queue_wait_seconds": "Espera en la cola del planificador antes de cada petición",
+    "lifegame_github_ratelimit_remaining": "Último X-RateLimit-Remaining recibido",
+    "lifegame_github_ratelimit_reset": "Último X-RateLimit-Reset recibido (epoch)",
+    "lifegame_rerun_seconds": "Duración de los reruns por página",
+    "lifegame_operation_seconds": "Latencia de carga y guardado de datos de usuario",
+})
+
+# =========================================================
+#  OBSERVACIONES
+# =========================================================
+
+def observe_github(method: str, status: int, seconds: float, nbytes: int, headers=None, wait: float = 0.0):
+    """Llamado por storage.github_request tras cada petición; `wait` es la espera en la cola"""
+    REGISTRY.inc("lifegame_github_requests_total", {"method": method, "status": str(status)})
+    REGISTRY.inc("lifegame_github_bytes_total", {"method": method}, nbytes)
+    REGISTRY.observe("lifegame_github_request_seconds", seconds, {"method": method})
+    REGISTRY.observe("lifegame_github_queue_wait_seconds", wait, {"method": method})
+    headers = headers or {}
+    if "X-RateLimit-Remaining" in headers:
+        REGISTRY.set("lifegame_github_ratelimit_remaining", float(headers["X-RateLimit-Remaining"]))
+    if "X-RateLimit-Reset" in headers:
+        REGISTRY.set("lifegame_github_ratelimit_reset", float(headers["X-RateLimit-Reset"]))
+    REGISTRY.event("github", method=method, status=status, seconds=seconds, wait=wait)
+
+def observe_rerun(page: str, seconds: float):
+    REGISTRY.observe("lifegame_rerun_seconds", seconds, {"page": page})
+    REGISTRY.event("rerun", page=page, seconds=seconds)
+    maybe_export()
+
+def observe_operation(operation: str, seconds: float):
+    """Carga o guardado completo (load_hot, load_history, reload, save)"""
+    REGISTRY.observe("lifegame_operation_seconds", seconds, {"operation": operation})
+    REGISTRY.event("operation", operation=operation, seconds=seconds)
+
+class timed_operation:
+    """Context manager: observe_operation con la duración del bloque"""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe_operation(self.operation, time.perf_counter() - self.started)
+        return False
+
+# =========================================================
+#  EXPORTACIÓN
+# =========================================================
+
+def maybe_export(force: bool = False):
+    """Reescribe LIFEGAME_METRICS_FILE como mucho cada EXPORT_INTERVAL_SECONDS"""
+    path = os.environ.get("LIFEGAME_METRICS_FILE")
+    if not path:
+        return
+    now = time.monotonic()
+    if not force and now - REGISTRY._last_export < EXPORT_INTERVAL_SECONDS:
+        return
+    REGISTRY._last_export = now
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(REGISTRY.render_prometheus())
+    os.replace(tmp, path)
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server: ThreadingHTTPServer | None = None
+_server_lock = threading.Lock()
+
+def start_metrics_server() -> ThreadingHTTPServer | None:
+    """Sirve /metrics en 127.0.0.1:LIFEGAME_METRICS_PORT (una vez por proceso)"""
+    global _server
+    port = os.environ.get("LIFEGAME_METRICS_PORT")
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(("127.0.0.1", int(port)), MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+        return _server
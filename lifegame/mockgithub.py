@@ -0,0 +1,476 @@
+"""
+Servidor local que imita la parte de la API de GitHub que usa la app, para
+pruebas de carga y de integración sin gastar cuota.
+
+    python -m lifegame mock-github --port 8765 --latency-ms 80 --rate-limit 5000
+    LIFEGAME_API_BASE=http://127.0.0.1:8765 LIFEGAME_GITHUB_TOKEN=x \\
+        LIFEGAME_GITHUB_REPO=demo/lifegame streamlit run app.py
+
+Implementa la Contents API (GET/PUT/DELETE de archivos y listado de
+carpetas) y la Git Data API (blobs, trees, commits y refs) sobre un repo en
+memoria por owner/repo. Como GitHub: las SHAs de archivo son SHAs de blob de
+git, un PUT sin `sha` sobre un archivo existente da 422 y con una `sha` vieja
+409, y mover una ref sin fast-forward da 422. Se puede inyectar latencia,
+límite de peticiones (cabeceras X-RateLimit-* y 403 al agotarlo) y errores
+5xx aleatorios. Este módulo no importa Streamlit.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, unquote, urlparse
+
+from lifegame.defaults import USER_FILES
+from lifegame.storage import serialize_user_file
+
+DEFAULT_BRANCH = "main"
+
+# Errores que devuelve la inyección de fallos, como los de GitHub en un mal día
+INJECTED_STATUSES = (500, 502, 503)
+
+def blob_sha(data: bytes) -> str:
+    """SHA de blob de git, la misma que devuelve GitHub para un archivo"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+def object_sha(kind: str, payload: Dict) -> str:
+    return hashlib.sha1(f"{kind}\0{json.dumps(payload, sort_keys=True)}".encode("utf-8")).hexdigest()
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+# =========================================================
+#  REPO EN MEMORIA
+# =========================================================
+
+class MockRepo:
+    """
+    Objetos de git simplificados: un tree es un dict plano {ruta: sha de
+    blob} y un commit apunta a un tree y a sus padres.
+    """
+
+    def __init__(self, branch: str = DEFAULT_BRANCH):
+        self.lock = threading.Lock()
+        self.blobs: Dict[str, bytes] = {}
+        self.trees: Dict[str, Dict[str, str]] = {}
+        self.commits: Dict[str, Dict] = {}
+        self.refs: Dict[str, str] = {}
+        self._clock = 0
+        self.refs[f"heads/{branch}"] = self.create_commit("Initial commit", self.create_tree({}), [])
+
+    def create_blob(self, data: bytes) -> str:
+        sha = blob_sha(data)
+        self.blobs[sha] = data
+        return sha
+
+    def create_tree(self, files: Dict[str, str]) -> str:
+        sha = object_sha("tree", files)
+        self.trees[sha] = dict(files)
+        return sha
+
+    def create_commit(self, message: str, tree: str, parents: List[str]) -> str:
+        if tree not in self.trees:
+            raise ApiError(422, "Tree SHA does not exist")
+        if any(parent not in self.commits for parent in parents):
+            raise ApiError(422, "Parent SHA does not exist or is not a commit object")
+        self._clock += 1
+        commit = {"message": message, "tree": tree, "parents": list(parents), "clock": self._clock}
+        sha = object_sha("commit", commit)
+        self.commits[sha] = commit
+        return sha
+
+    def is_ancestor(self, ancestor: str, sha: str) -> bool:
+        pending = [sha]
+        seen = set()
+        while pending:
+            current = pending.pop()
+            if current == ancestor:
+                return True
+            if current not in seen:
+                seen.add(current)
+                pending.extend(self.commits[current]["parents"])
+        return False
+
+    def head(self, ref: str) -> str:
+        name = ref if ref.startswith("heads/") else f"heads/{ref}"
+        if name not in self.refs:
+            raise ApiError(404, "Not Found")
+        return self.refs[name]
+
+    def files(self, ref: str = DEFAULT_BRANCH) -> Dict[str, str]:
+        return self.trees[self.commits[self.head(ref)]["tree"]]
+
+    def commit_files(self, branch: str, changes: Dict[str, bytes | None], message: str) -> str:
+        """Commit sobre la punta de `branch` (None borra la ruta); devuelve su SHA"""
+        parent = self.head(branch)
+        files = dict(self.files(branch))
+        for path, data in changes.items():
+            if data is None:
+                files.pop(path, None)
+            else:
+                files[path] = self.create_blob(data)
+        sha = self.create_commit(message, self.create_tree(files), [parent])
+        self.refs[f"heads/{branch}"] = sha
+        return sha
+
+    def load_files(self, files: Dict[str, str], message: str = "Seed data"):
+        self.commit_files(DEFAULT_BRANCH, {path: content.encode("utf-8") for path, content in files.items()}, message)
+
+# =========================================================
+#  API
+# =========================================================
+
+def content_entry(path: str, sha: str, data: bytes | None = None) -> Dict:
+    entry = {
+        "type": "file",
+        "name": path.rsplit("/", 1)[-1],
+        "path": path,
+        "sha": sha,
+        "size": len(data) if data is not None else 0,
+    }
+    if data is not None:
+        entry["encoding"] = "base64"
+        entry["content"] = base64.encodebytes(data).decode("ascii")
+    return entry
+
+class MockGitHubApi:
+    """Enrutado y semántica de la API, independiente del transporte HTTP"""
+
+    def __init__(self, default_repo: str | None = None):
+        self.repos: Dict[str, MockRepo] = {}
+        self._lock = threading.Lock()
+        if default_repo:
+            self.repo(default_repo)
+
+    def repo(self, full_name: str) -> MockRepo:
+        with self._lock:
+            if full_name not in self.repos:
+                self.repos[full_name] = MockRepo()
+            return self.repos[full_name]
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: Dict) -> tuple:
+        """(status, cuerpo JSON) de una petición"""
+        match = re.match(r"^/repos/([^/]+/[^/]+)/(contents|git)(?:/(.*))?$", path)
+        if not match:
+            raise ApiError(404, "Not Found")
+        repo = self.repo(match.group(1))
+        rest = match.group(3) or ""
+        with repo.lock:
+            if match.group(2) == "contents":
+                return self.contents(repo, method, rest.strip("/"), query, body)
+            return self.git(repo, method, rest, query, body)
+
+    # ---------------------------------------------------------
+    #  Contents API
+    # ---------------------------------------------------------
+
+    def contents(self, repo: MockRepo, method: str, path: str, query: Dict[str, str], body: Dict) -> tuple:
+        branch = query.get("ref") or body.get("branch") or DEFAULT_BRANCH
+        files = repo.files(branch)
+        if method == "GET":
+            if path in files:
+                sha = files[path]
+                return 200, content_entry(path, sha, repo.blobs[sha])
+            prefix = f"{path}/" if path else ""
+            entries = {}
+            for file_path, sha in files.items():
+                if not file_path.startswith(prefix):
+                    continue
+                name, _, below = file_path[len(prefix):].partition("/")
+                if below:
+                    entries[name] = {"type": "dir", "name": name, "path": prefix + name, "sha": object_sha("dir", {"path": prefix + name}), "size": 0}
+                else:
+                    entries[name] = content_entry(file_path, sha)
+            if not entries:
+                raise ApiError(404, "Not Found")
+            return 200, [entries[name] for name in sorted(entries)]
+
+        if method in ("PUT", "DELETE"):
+            if "message" not in body:
+                raise ApiError(422, 'Invalid request.\n\n"message" wasn\'t supplied.')
+            current = files.get(path)
+            sha = body.get("sha")
+            if method == "DELETE" and current is None:
+                raise ApiError(404, "Not Found")
+            if current is not None and not sha:
+                raise ApiError(422, 'Invalid request.\n\n"sha" wasn\'t supplied.')
+            if current is not None and sha != current:
+                raise ApiError(409, f"{path} does not match {sha}")
+            if method == "DELETE":
+                commit = repo.commit_files(branch, {path: None}, body["message"])
+                return 200, {"content": None, "commit": {"sha": commit, "message": body["message"]}}
+            try:
+                data = base64.b64decode(body.get("content", ""), validate=True)
+            except ValueError:
+                raise ApiError(422, "content is not valid Base64")
+            commit = repo.commit_files(branch, {path: data}, body["message"])
+            new_sha = repo.files(branch)[path]
+            return (200 if current else 201), {
+                "content": content_entry(path, new_sha),
+                "commit": {"sha": commit, "message": body["message"]},
+            }
+        raise ApiError(404, "Not Found")
+
+    # ---------------------------------------------------------
+    #  Git Data API
+    # ---------------------------------------------------------
+
+    def git(self, repo: MockRepo, method: str, rest: str, query: Dict[str, str], body: Dict) -> tuple:
+        kind, _, name = rest.partition("/")
+        if kind == "blobs":
+            if method == "POST":
+                encoding = body.get("encoding", "utf-8")
+                content = body.get("content", "")
+                data = base64.b64decode(content) if encoding == "base64" else content.encode("utf-8")
+                return 201, {"sha": repo.create_blob(data), "url": f"/git/blobs/{blob_sha(data)}"}
+            if name in repo.blobs:
+                data = repo.blobs[name]
+                return 200, {"sha": name, "size": len(data), "encoding": "base64", "content": base64.encodebytes(data).decode("ascii")}
+        elif kind == "trees":
+            if method == "POST":
+                return 201, self.create_tree(repo, body)
+            if name in repo.trees:
+                return 200, self.tree_body(repo, name)
+        elif kind == "commits":
+            if method == "POST":
+                sha = repo.create_commit(body.get("message", ""), body.get("tree", ""), body.get("parents", []))
+                return 201, self.commit_body(repo, sha)
+            if name in repo.commits:
+                return 200, self.commit_body(repo, name)
+        elif kind in ("ref", "refs"):
+            if method == "GET":
+                return 200, self.ref_body(name, repo.head(name))
+            if method == "POST" and kind == "refs":
+                ref = body.get("ref", "").removeprefix("refs/")
+                if ref in repo.refs:
+                    raise ApiError(422, "Reference already exists")
+                if body.get("sha") not in repo.commits:
+                    raise ApiError(422, "Object does not exist")
+                repo.refs[ref] = body["sha"]
+                return 201, self.ref_body(ref, body["sha"])
+            if method == "PATCH" and kind == "refs":
+                current = repo.head(name)
+                sha = body.get("sha")
+                if sha not in repo.commits:
+                    raise ApiError(422, "Object does not exist")
+                if not body.get("force") and not repo.is_ancestor(current, sha):
+                    raise ApiError(422, "Update is not a fast forward")
+                repo.refs[name] = sha
+                return 200, self.ref_body(name, sha)
+        raise ApiError(404, "Not Found")
+
+    def create_tree(self, repo: MockRepo, body: Dict) -> Dict:
+        base = body.get("base_tree")
+        if base and base not in repo.trees:
+            raise ApiError(422, "base_tree is not a valid tree oid")
+        files = dict(repo.trees[base]) if base else {}
+        for item in body.get("tree", []):
+            path = item["path"]
+            if "content" in item:
+                files[path] = repo.create_blob(item["content"].encode("utf-8"))
+            elif item.get("sha") is None:
+                files.pop(path, None)
+            elif item["sha"] in repo.blobs:
+                files[path] = item["sha"]
+            else:
+                raise ApiError(422, f"Invalid tree info: {path}")
+        return self.tree_body(repo, repo.create_tree(files))
+
+    def tree_body(self, repo: MockRepo, sha: str) -> Dict:
+        files = repo.trees[sha]
+        return {
+            "sha": sha,
+            "tree": [
+                {"path": path, "mode": "100644", "type": "blob", "sha": blob, "size": len(repo.blobs[blob])}
+                for path, blob in sorted(files.items())
+            ],
+            "truncated": False,
+        }
+
+    def commit_body(self, repo: MockRepo, sha: str) -> Dict:
+        commit = repo.commits[sha]
+        return {
+            "sha": sha,
+            "message": commit["message"],
+            "tree": {"sha": commit["tree"]},
+            "parents": [{"sha": parent} for parent in commit["parents"]],
+        }
+
+    def ref_body(self, name: str, sha: str) -> Dict:
+        ref = name if name.startswith("heads/") else f"heads/{name}"
+        return {"ref": f"refs/{ref}", "object": {"type": "commit", "sha": sha}}
+
+# =========================================================
+#  SERVIDOR HTTP CON INYECCIÓN DE FALLOS
+# =========================================================
+
+class RateLimiter:
+    """Límite por token con ventana fija, como el core rate limit de GitHub"""
+
+    def __init__(self, limit: int, window_seconds: int = 3600):
+        self.limit = limit
+        self.window = window_seconds
+        self._used: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def take(self, token: str) -> tuple:
+        """(permitido, usados, epoch de reinicio)"""
+        now = time.time()
+        with self._lock:
+            reset, used = self._used.get(token, (now + self.window, 0))
+            if now >= reset:
+                reset, used = now + self.window, 0
+            allowed = used < self.limit
+            if allowed:
+                used += 1
+            self._used[token] = (reset, used)
+            return allowed, used, int(reset)
+
+class MockGitHubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        rate_limit: int = 5000,
+        rate_window_seconds: int = 3600,
+        fail_rate: float = 0.0,
+        seed: int | None = None,
+        default_repo: str | None = None,
+    ):
+        super().__init__((host, port), MockGitHubHandler)
+        self.api = MockGitHubApi(default_repo)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.limiter = RateLimiter(rate_limit, rate_window_seconds)
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Sirve en un hilo de fondo; devuelve la URL base para LIFEGAME_API_BASE"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def delay_and_fail(self) -> int | None:
+        """Duerme la latencia configurada; devuelve un estado 5xx si toca fallar"""
+        with self._rng_lock:
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            fail = self._rng.random() < self.fail_rate
+            status = self._rng.choice(INJECTED_STATUSES)
+        if delay:
+            time.sleep(delay / 1000)
+        return status if fail else None
+
+    def seed_users(self, repo: str, users: Dict[str, Dict[str, str]]):
+        """Precarga data/<usuario>/<archivo> en `repo` en un solo commit"""
+        self.api.repo(repo).load_files({
+            f"data/{user}/{fname}": content
+            for user, files in users.items()
+            for fname, content in files.items()
+        })
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    server: MockGitHubServer
+    protocol_version = "HTTP/1.1"
+
+    def _dispatch(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        headers = {}
+        server = self.server
+
+        if url.path == "/_mock/stats":
+            return self._send(200, dict(server.stats), headers)
+
+        token = (self.headers.get("Authorization") or "").split(" ", 1)[-1]
+        if not token:
+            return self._send(401, {"message": "Requires authentication"}, headers)
+        allowed, used, reset = server.limiter.take(token)
+        headers.update({
+            "X-RateLimit-Limit": str(server.limiter.limit),
+            "X-RateLimit-Remaining": str(max(0, server.limiter.limit - used)),
+            "X-RateLimit-Used": str(used),
+            "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Resource": "core",
+        })
+        if not allowed:
+            return self._send(403, {"message": "API rate limit exceeded"}, headers)
+
+        injected = server.delay_and_fail()
+        if injected:
+            return self._send(injected, {"message": "Injected failure"}, headers)
+
+        try:
+            body = json.loads(raw) if raw else {}
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            status, payload = server.api.handle(self.command, unquote(url.path), query, body)
+        except ApiError as e:
+            status, payload = e.status, {"message": e.message}
+        except (ValueError, KeyError) as e:
+            status, payload = 400, {"message": f"Problems parsing JSON: {e}"}
+        self._send(status, payload, headers)
+
+    def _send(self, status: int, payload, headers: Dict[str, str]):
+        self.server.stats[f"{self.command} {status}"] += 1
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_PUT = do_POST = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        pass
+
+def local_users(data_dir: str) -> Dict[str, Dict[str, str]]:
+    """{usuario: {archivo: contenido}} de un directorio como el de LocalBackend"""
+    users = {}
+    for user in sorted(os.listdir(data_dir)):
+        folder = os.path.join(data_dir, user)
+        if not os.path.isdir(folder):
+            continue
+        users[user] = {}
+        for fname in sorted(os.listdir(folder)):
+            with open(os.path.join(folder, fname), encoding="utf-8") as f:
+                users[user][fname] = f.read()
+    return users
+
+def synthetic_users(count: int, missions: int, years: int) -> Dict[str, Dict[str, str]]:
+    """Usuarios bench_<i> generados con lifegame.bench (semilla = i)"""
+    from lifegame.bench import generate_user
+    users = {}
+    for i in range(count):
+        datasets = generate_user(missions, years, seed=i)
+        users[f"bench_{i}"] = {fname: serialize_user_file(fname, datasets[key]["data"]) for fname, key in USER_FILES.items()}
+    return users
@@ -0,0 +1,42 @@
+"""
+Páginas de la app. Cada módulo se importa la primera vez que el menú lo
+selecciona; los reruns siguientes reutilizan el módulo ya cargado.
+Las páginas que dependen del historial esperan a que termine de cargarse.
+"""
+
+import importlib
+
+from lifegame.profiling import span
+from lifegame.state import restore_history
+from lifegame.ui import wait_for_history
+
+PAGES = {
+    "🏠 Dashboard": ("dashboard", "page_dashboard"),
+    "📅 Calendario": ("calendar_view", "page_calendar"),
+    "🎯 Misiones": ("missions", "page_missions"),
+    "📔 Diario": ("journal", "page_journal"),
+    "🎲 Decisiones": ("decisions", "page_decisions"),
+    "🔎 Buscar": ("search", "page_search"),
+    "🏆 Recompensas": ("rewards", "page_rewards"),
+    "⚙️ Configuración": ("settings", "page_config"),
+}
+
+# Datasets fríos que cada página necesita completos antes de renderizarse
+PAGE_HISTORY = {
+    "📅 Calendario": ("mission_log",),
+    "📔 Diario": ("journal",),
+    "🎲 Decisiones": ("decisions",),
+    "🔎 Buscar": ("journal", "decisions", "search_index"),
+    "🏆 Recompensas": ("mission_log",),
+    "⚙️ Configuración": ("mission_log", "journal", "decisions", "search_index"),
+}
+
+def render_page(label: str):
+    keys = PAGE_HISTORY.get(label, ())
+    if not wait_for_history(*keys):
+        return
+    restore_history(*keys)
+    module_name, function_name = PAGES[label]
+    with span(function_name, "page"):
+        module = importlib.import_module(f"{__name__}.{module_name}")
+        getattr(module, function_name)()
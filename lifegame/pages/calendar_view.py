@@ -0,0 +1,184 @@
+"""📅 Calendario Estratégico"""
+
+import uuid
+import streamlit as st
+from datetime import date, time, timedelta
+
+from lifegame.profiling import traced
+from lifegame.state import (
+    bump_version,
+    complete_mission,
+    events_by_date,
+    get_missions_for_date,
+    month_grid_html,
+    today_date,
+)
+from lifegame.ui import calendar_grid, render_sidebar_status
+
+def page_calendar():
+    st.header("📅 Calendario Estratégico")
+    
+    # Controles de navegación
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("◀ Mes Anterior"):
+            if st.session_state.calendar_view == "month":
+                st.session_state.current_date = st.session_state.current_date.replace(day=1) - timedelta(days=1)
+            else:
+                st.session_state.current_date -= timedelta(days=7)
+    with col2:
+        # Un clic en la grilla mensual pide cambiar a la vista diaria
+        if "pending_view" in st.session_state:
+            st.session_state.view_selector = st.session_state.pop("pending_view")
+        view_option = st.radio("Vista", ["Mes", "Semana", "Día"], horizontal=True, key="view_selector")
+        st.session_state.calendar_view = view_option.lower()
+    with col3:
+        if st.button("Mes Siguiente ▶"):
+            if st.session_state.calendar_view == "month":
+                next_month = st.session_state.current_date.replace(day=28) + timedelta(days=4)
+                st.session_state.current_date = next_month.replace(day=1)
+            else:
+                st.session_state.current_date += timedelta(days=7)
+    
+    # Reset a hoy
+    if st.button("Hoy"):
+        st.session_state.current_date = today_date()
+    
+    st.write(f"**Vista: {st.session_state.current_date.strftime('%B %Y')}**")
+    
+    if st.session_state.calendar_view == "mes":
+        render_month_view()
+    elif st.session_state.calendar_view == "semana":
+        render_week_view()
+    else:
+        render_day_view()
+
+@traced("view")
+def render_month_view():
+    """Renderiza vista mensual del calendario (clic en un día abre la vista diaria)"""
+    current_date = st.session_state.current_date
+    config = st.session_state["config"]["data"]
+    first_weekday = 6 if config["calendar_start_week_on"] == "sunday" else 0
+    
+    grid_html = month_grid_html(current_date.year, current_date.month, first_weekday, today_date())
+    clicked = calendar_grid(html=grid_html, key="month_grid", default=None)
+    
+    # El componente conserva su último valor: solo se procesa un clic nuevo
+    if clicked and clicked["nonce"] != st.session_state.get("month_grid_nonce"):
+        st.session_state.month_grid_nonce = clicked["nonce"]
+        st.session_state.current_date = date.fromisoformat(clicked["date"])
+        st.session_state.pending_view = "Día"
+        st.rerun()
+
+@traced("view")
+def render_week_view():
+    """Renderiza vista semanal"""
+    current_date = st.session_state.current_date
+    start_of_week = current_date - timedelta(days=current_date.weekday())
+    
+    st.write(f"**Semana del {start_of_week.strftime('%d %b')} al {(start_of_week + timedelta(days=6)).strftime('%d %b %Y')}**")
+    
+    cols = st.columns(7)
+    for i in range(7):
+        day_date = start_of_week + timedelta(days=i)
+        with cols[i]:
+            is_today = day_date == today_date()
+            day_name = day_date.strftime('%a')
+            
+            if is_today:
+                st.markdown(f"**🎯 {day_date.day} {day_name}**")
+            else:
+                st.markdown(f"**{day_date.day} {day_name}**")
+            
+            render_day_content(day_date, detailed=True)
+
+@traced("view")
+def render_day_view():
+    """Renderiza vista diaria detallada"""
+    current_date = st.session_state.current_date
+    is_today = current_date == today_date()
+    
+    st.subheader(f"📅 {current_date.strftime('%A, %d de %B de %Y')} {'(HOY)' if is_today else ''}")
+    
+    # Misiones del día
+    st.write("### 🎯 Misiones del Día")
+    day_missions_panel()
+    
+    # Eventos del calendario
+    st.write("### 🗓️ Eventos Programados")
+    day_events = events_by_date().get(current_date.isoformat(), [])
+    
+    if day_events:
+        for event in day_events:
+            st.write(f"🕒 **{event['start_time']} - {event['end_time']}**: {event['title']}")
+            if event['notes']:
+                st.caption(event['notes'])
+    else:
+        st.info("No hay eventos programados para este día.")
+    
+    # Agregar nuevo evento
+    st.write("### ➕ Agregar Evento")
+    with st.form("add_event_form"):
+        title = st.text_input("Título del evento")
+        event_date = st.date_input("Fecha", value=current_date)
+        start_time = st.time_input("Hora inicio", value=time(8, 0))
+        end_time = st.time_input("Hora fin", value=time(9, 0))
+        notes = st.text_area("Notas")
+        
+        if st.form_submit_button("Agregar Evento"):
+            new_event = {
+                "id": f"ev_{uuid.uuid4().hex}",
+                "title": title,
+                "date": event_date.isoformat(),
+                "start_time": start_time.strftime("%H:%M"),
+                "end_time": end_time.strftime("%H:%M"),
+                "notes": notes,
+                "type": "event"
+            }
+            st.session_state["calendar"]["data"]["events"].append(new_event)
+            bump_version("calendar")
+            st.success("Evento agregado!")
+            st.rerun()
+
+@st.fragment
+def day_missions_panel():
+    """Misiones del día seleccionado, completables sin rerun de toda la app"""
+    current_date = st.session_state.current_date
+    day_missions = get_missions_for_date(current_date)
+    
+    if day_missions:
+        for mission in day_missions:
+            completed = mission.get("completed", False)
+            status = "✅" if completed else "⏳"
+            st.write(f"{status} **{mission['name']}**")
+            st.caption(f"{mission['description']} | XP: {mission['base_xp']} | Tokens: {mission['tokens_reward']}")
+            
+            if not completed and st.button("Completar", key=f"day_view_{mission['id']}"):
+                complete_mission(mission["id"], target_date=current_date)
+                render_sidebar_status()
+                st.rerun(scope="fragment")
+    else:
+        st.info("No hay misiones programadas para este día.")
+
+@traced("view")
+def render_day_content(day_date: date, detailed: bool = False):
+    """Renderiza el contenido de un día en el calendario"""
+    # Misiones y eventos para este día
+    day_missions = get_missions_for_date(day_date)
+    day_events = events_by_date().get(day_date.isoformat(), [])
+    
+    # Mostrar resumen
+    if day_missions:
+        completed = sum(1 for m in day_missions if m.get("completed"))
+        st.caption(f"🎯 {completed}/{len(day_missions)}")
+    
+    if day_events:
+        st.caption(f"🗓️ {len(day_events)}")
+    
+    if detailed:
+        for mission in day_missions[:3]:  # Mostrar máximo 3 misiones
+            status = "✅" if mission.get("completed") else "⏳"
+            st.write(f"{status} {mission['name'][:15]}...")
+        
+        for event in day_events[:2]:  # Mostrar máximo 2 eventos
+            st.write(f"🗓️ {event['title'][:12]}...")
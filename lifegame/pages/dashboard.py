@@ -0,0 +1,137 @@
+"""🏠 Dashboard"""
+
+import streamlit as st
+from typing import List, Dict
+
+from lifegame.engine import optimize_mission_portfolio
+from lifegame.profiling import traced
+from lifegame.state import (
+    complete_mission,
+    get_today_missions,
+    history_ready,
+    restore_history,
+    today_date,
+    today_missions_ready,
+)
+from lifegame.ui import get_mission_class, render_sidebar_status, wait_for_history
+
+def page_dashboard():
+    st.header("🏠 Dashboard")
+    dashboard_panel()
+
+@st.fragment
+def dashboard_panel():
+    """Stats, misiones de hoy y atributos; completar una misión solo rerenderiza este bloque"""
+    profile = st.session_state["profile"]["data"]
+    level = profile["current_level"]
+    xp = profile["current_xp"]
+    base = profile["xp_base_per_level"]
+    
+    # Stats principales
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Nivel", level)
+    with col2:
+        st.metric("XP", f"{xp}/{base}")
+    with col3:
+        st.metric("Tokens", profile["total_tokens"])
+    with col4:
+        st.metric("Racha", f"{profile['streak_days']} días")
+    
+    # Barra de progreso
+    progress = min(xp / base, 1.0) if base > 0 else 0
+    st.progress(progress)
+    
+    st.markdown("---")
+    
+    # Misiones de hoy
+    st.subheader("🎯 Misiones de Hoy")
+    if history_ready("mission_log"):
+        restore_history("mission_log", since=today_date())
+        render_today_missions()
+    elif today_missions_ready():
+        # Agenda y completadas de hoy salen de los registros recientes; completar espera al historial
+        render_today_missions(can_complete=False)
+        wait_for_history("mission_log")
+    else:
+        wait_for_history("mission_log")
+    
+    # Atributos
+    st.markdown("---")
+    st.subheader("📊 Atributos")
+    attributes = st.session_state["attributes"]["data"]["attributes"]
+    
+    cols = st.columns(len(attributes))
+    for idx, attr in enumerate(attributes):
+        with cols[idx]:
+            st.write(f"**{attr['name']}**")
+            st.write(f"XP: {attr['current_xp']}")
+            st.caption(attr['description'])
+
+@traced("view")
+def render_today_missions(can_complete: bool = True):
+    """Misiones de hoy con su estado; completar necesita el mission_log"""
+    today_missions = get_today_missions()
+    
+    if not today_missions:
+        st.info("No tienes misiones para hoy. ¡Crea algunas en la pestaña de Misiones!")
+    else:
+        completed_count = sum(1 for m in today_missions if m.get("completed"))
+        st.write(f"**Progreso: {completed_count}/{len(today_missions)} completadas**")
+        
+        for mission in today_missions:
+            mission_class = get_mission_class(mission["type"])
+            completed = mission.get("completed", False)
+            
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                if completed:
+                    st.markdown(f'<div class="{mission_class} mission-completed">✓ {mission["name"]}</div>', unsafe_allow_html=True)
+                    st.caption(f"{mission['description']} - ✅ Completada")
+                else:
+                    carried = " (pendiente de días anteriores)" if mission.get("carried_over") else ""
+                    st.markdown(f'<div class="{mission_class}">🎯 {mission["name"]}{carried}</div>', unsafe_allow_html=True)
+                    st.caption(f"{mission['description']} - XP: {mission['base_xp']} | Tokens: {mission['tokens_reward']}")
+            
+            with col2:
+                if not completed:
+                    if st.button("Completar", key=f"complete_{mission['id']}", disabled=not can_complete):
+                        complete_mission(mission["id"])
+                        render_sidebar_status()
+                        st.rerun(scope="fragment")
+                else:
+                    st.success("✅")
+        
+        render_mission_plan(today_missions)
+
+@traced("view")
+def render_mission_plan(today_missions: List[Dict]):
+    """Plan óptimo del día según el presupuesto de tiempo del usuario"""
+    config = st.session_state["config"]["data"]
+    pending = [m for m in today_missions if not m.get("completed")]
+    if not pending:
+        return
+    
+    with st.expander("🧮 Plan Óptimo del Día"):
+        time_budget = st.number_input(
+            "Tiempo disponible hoy (min)",
+            min_value=0,
+            max_value=1440,
+            value=int(config["daily_time_budget"]),
+            step=15,
+            key="plan_time_budget"
+        )
+        plan = optimize_mission_portfolio(
+            pending,
+            time_budget,
+            attribute_weights=config["attribute_weights"],
+            max_share=config["attribute_max_share"],
+        )
+        
+        if not plan["selected"]:
+            st.info("Ninguna misión cabe en el tiempo disponible.")
+            return
+        
+        st.write(f"**{len(plan['selected'])} misiones · {plan['total_minutes']} min · {plan['total_value']:.0f} XP ponderada**")
+        for mission in plan["selected"]:
+            st.write(f"🎯 {mission['name']} ({mission['time_cost']} min)")
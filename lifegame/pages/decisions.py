@@ -0,0 +1,172 @@
+"""🎲 Game Theory Lab"""
+
+import uuid
+import streamlit as st
+from datetime import datetime
+from typing import Dict
+
+from lifegame.schema import stamp
+from lifegame.search import decision_document
+from lifegame.state import bump_version, compute_decision_stats, update_search_index
+from lifegame.ui import render_history_page
+
+def page_decisions():
+    st.header("🎲 Game Theory Lab")
+    
+    st.info("""
+    **Teoría de Juegos Aplicada a tu Vida:**
+    Cada decisión es una jugada en un juego repetido contra tu yo futuro.
+    - **Cooperar** = Elegir el payoff a largo plazo
+    - **Traicionar** = Elegir el payoff a corto plazo
+    """)
+    
+    tab1, tab2, tab3 = st.tabs(["Nueva Decisión", "Historial", "Análisis de Patrones"])
+    
+    with tab1:
+        st.subheader("Evaluar Decisión Estratégica")
+        
+        with st.form("decision_form"):
+            situation = st.text_input("Describe la situación decisiva:")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**Opción A**")
+                opt1_name = st.text_input("Nombre Opción A", placeholder="Ej: Trabajar en proyecto")
+                opt1_short = st.slider("Payoff corto plazo A", 1, 10, 3, 
+                                      help="Gratificación inmediata (1=bajo, 10=alto)")
+                opt1_long = st.slider("Payoff largo plazo A", 1, 10, 8,
+                                     help="Beneficio futuro (1=bajo, 10=alto)")
+            
+            with col2:
+                st.write("**Opción B**")
+                opt2_name = st.text_input("Nombre Opción B", placeholder="Ej: Ver redes sociales")
+                opt2_short = st.slider("Payoff corto plazo B", 1, 10, 8)
+                opt2_long = st.slider("Payoff largo plazo B", 1, 10, 2)
+            
+            # Análisis automático
+            total_a = opt1_short + opt1_long
+            total_b = opt2_short + opt2_long
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Puntaje Total A", total_a)
+            with col2:
+                st.metric("Puntaje Total B", total_b)
+            
+            # Determinar dominancia
+            if opt1_short >= opt2_short and opt1_long >= opt2_long:
+                if opt1_short > opt2_short or opt1_long > opt2_long:
+                    st.success("🎯 **Opción A DOMINA** a la Opción B")
+                else:
+                    st.info("⚖️ Las opciones son equivalentes")
+            elif opt2_short >= opt1_short and opt2_long >= opt1_long:
+                if opt2_short > opt1_short or opt2_long > opt1_long:
+                    st.success("🎯 **Opción B DOMINA** a la Opción A")
+                else:
+                    st.info("⚖️ Las opciones son equivalentes")
+            else:
+                st.warning("⚡ **Trade-off**: Cada opción tiene ventajas diferentes")
+            
+            chosen_option = st.radio("¿Cuál opción elegiste?", 
+                                   [f"A: {opt1_name}", f"B: {opt2_name}", "Todavía no decido"])
+            reason = st.text_area("Razón de tu elección:")
+            
+            if st.form_submit_button("Registrar Decisión"):
+                if not situation.strip() or not opt1_name.strip() or not opt2_name.strip():
+                    st.error("Completa todos los campos obligatorios")
+                else:
+                    decision = stamp("decisions", {
+                        "id": f"d_{uuid.uuid4().hex}",
+                        "timestamp": datetime.now().isoformat(),
+                        "situation": situation,
+                        "options": [
+                            {
+                                "name": opt1_name,
+                                "short_term_payoff": opt1_short,
+                                "long_term_payoff": opt1_long,
+                                "total_score": total_a
+                            },
+                            {
+                                "name": opt2_name,
+                                "short_term_payoff": opt2_short,
+                                "long_term_payoff": opt2_long,
+                                "total_score": total_b
+                            }
+                        ],
+                        "chosen_option": chosen_option,
+                        "reason": reason,
+                        "regret_check": None,
+                        "regret_notes": None
+                    })
+                    st.session_state["decisions"]["data"].append(decision)
+                    update_search_index(decision_document(decision))
+                    bump_version("decisions")
+                    st.success("Decisión registrada para análisis futuro!")
+                    st.rerun()
+    
+    with tab2:
+        st.subheader("Historial de Decisiones")
+        
+        def render_decision(decision: Dict):
+            with st.expander(f"{decision['timestamp'][:10]} - {decision['situation'][:50]}..."):
+                st.write(f"**Situación:** {decision['situation']}")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    opt_a = decision["options"][0]
+                    st.write(f"**A: {opt_a['name']}**")
+                    st.write(f"Corto: {opt_a['short_term_payoff']}/10")
+                    st.write(f"Largo: {opt_a['long_term_payoff']}/10")
+                    st.write(f"Total: {opt_a['total_score']}/20")
+                
+                with col2:
+                    opt_b = decision["options"][1]
+                    st.write(f"**B: {opt_b['name']}**")
+                    st.write(f"Corto: {opt_b['short_term_payoff']}/10")
+                    st.write(f"Largo: {opt_b['long_term_payoff']}/10")
+                    st.write(f"Total: {opt_b['total_score']}/20")
+                
+                st.write(f"**Elegiste:** {decision['chosen_option']}")
+                if decision['reason']:
+                    st.write(f"**Razón:** {decision['reason']}")
+                
+                # Check de arrepentimiento
+                if decision['regret_check'] is None:
+                    if st.button("¿Te arrepientes?", key=f"regret_{decision['id']}"):
+                        decision['regret_check'] = True
+                        decision['regret_notes'] = "Arrepentimiento registrado"
+                        bump_version("decisions")
+                        st.rerun()
+                else:
+                    st.write(f"**Arrepentimiento:** {decision['regret_notes'] or 'Sí'}")
+        
+        render_history_page("decisions", "timestamp", render_decision, "Aún no has registrado decisiones.", page_size=20)
+    
+    with tab3:
+        st.subheader("Análisis de Patrones")
+        
+        stats = compute_decision_stats()
+        if stats["total_decisions"] < 3:
+            st.info("Necesitas al menos 3 decisiones registradas para ver análisis.")
+        else:
+            # Estadísticas simples
+            total_decisions = stats["total_decisions"]
+            regret_decisions = stats["regret_decisions"]
+            avg_short_term = stats["avg_short_term"]
+            avg_long_term = stats["avg_long_term"]
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Decisiones", total_decisions)
+            with col2:
+                st.metric("Tasa Arrepentimiento", f"{(regret_decisions/total_decisions)*100:.1f}%")
+            with col3:
+                st.metric("Balance Corto/Largo", f"{avg_short_term:.1f}/{avg_long_term:.1f}")
+            
+            st.write("**Recomendación:**")
+            if avg_short_term > avg_long_term + 2:
+                st.warning("⚠️ Estás priorizando mucho el corto plazo. Considera más decisiones que beneficien a tu yo futuro.")
+            elif avg_long_term > avg_short_term + 2:
+                st.success("✅ Excelente balance! Estás cooperando consistentemente con tu yo futuro.")
+            else:
+                st.info("🔍 Balance equilibrado. Sigue evaluando cada situación individualmente.")
@@ -0,0 +1,105 @@
+"""📔 Registro Diario"""
+
+import uuid
+import streamlit as st
+from datetime import datetime
+from typing import Dict
+
+from lifegame.schema import stamp
+from lifegame.search import journal_document
+from lifegame.state import bump_version, today_date, update_search_index
+from lifegame.ui import render_history_page
+
+def page_journal():
+    st.header("📔 Registro Diario")
+    
+    today = today_date().isoformat()
+    
+    # Entrada del día actual
+    st.subheader("Registro de Hoy")
+    
+    # Verificar si ya existe un registro para hoy
+    existing_entry = next(
+        (entry for entry in st.session_state["journal"]["data"] 
+         if entry["date"] == today),
+        None
+    )
+    
+    with st.form("journal_entry"):
+        if existing_entry:
+            default_text = existing_entry["text"]
+        else:
+            default_text = ""
+        
+        entry_text = st.text_area(
+            "¿Cómo fue tu día? ¿Qué aprendiste? ¿Qué podrías mejorar?",
+            value=default_text,
+            height=200
+        )
+        
+        # Atributos relacionados
+        attributes = st.session_state["attributes"]["data"]["attributes"]
+        attribute_ids = st.multiselect(
+            "Atributos trabajados hoy",
+            [attr["id"] for attr in attributes],
+            default=existing_entry["attribute_ids"] if existing_entry else []
+        )
+        
+        # XP manual por logros no cubiertos por misiones
+        xp_manual = st.number_input(
+            "XP adicional (por logros no estructurados)",
+            0, 200,
+            value=existing_entry["xp_awarded"] if existing_entry else 10
+        )
+        
+        # Estado de ánimo
+        mood = st.select_slider(
+            "Estado de ánimo",
+            options=["😔", "😐", "😊", "🤩"],
+            value=existing_entry["mood"] if existing_entry else "😊"
+        )
+        
+        submitted = st.form_submit_button("Guardar Registro")
+        
+        if submitted:
+            journal_entry = stamp("journal", {
+                "id": existing_entry["id"] if existing_entry else f"j_{uuid.uuid4().hex}",
+                "date": today,
+                "timestamp": datetime.now().isoformat(),
+                "text": entry_text,
+                "attribute_ids": attribute_ids,
+                "xp_awarded": xp_manual,
+                "mood": mood
+            })
+            
+            if existing_entry:
+                # Actualizar entrada existente
+                index = next(
+                    i for i, entry in enumerate(st.session_state["journal"]["data"])
+                    if entry["date"] == today
+                )
+                st.session_state["journal"]["data"][index] = journal_entry
+            else:
+                # Crear nueva entrada
+                st.session_state["journal"]["data"].append(journal_entry)
+                
+                # Otorgar XP manual
+                st.session_state["profile"]["data"]["current_xp"] += xp_manual
+            
+            update_search_index(journal_document(journal_entry))
+            bump_version("journal", "profile")
+            st.success("Registro guardado!")
+            st.rerun()
+    
+    st.markdown("---")
+    
+    # Historial
+    st.subheader("Historial de Registros")
+    
+    def render_entry(entry: Dict):
+        with st.expander(f"{entry['date']} - {entry['mood']} - XP: {entry['xp_awarded']}"):
+            st.write(entry["text"])
+            if entry["attribute_ids"]:
+                st.caption(f"Atributos: {', '.join(entry['attribute_ids'])}")
+    
+    render_history_page("journal", "date", render_entry, "Aún no tienes registros. ¡Comienza hoy!")
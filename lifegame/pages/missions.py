@@ -0,0 +1,147 @@
+"""🎯 Sistema de Misiones"""
+
+import uuid
+import streamlit as st
+from datetime import date, timedelta
+
+from lifegame.defaults import DEFAULT_TIME_COST
+from lifegame.search import mission_document
+from lifegame.state import bump_version, remove_from_search_index, update_search_index
+
+def page_missions():
+    st.header("🎯 Sistema de Misiones")
+    
+    tab1, tab2, tab3 = st.tabs(["Todas las Misiones", "Crear Nueva Misión", "Misiones Épicas"])
+    
+    with tab1:
+        missions = st.session_state["missions"]["data"]["missions"]
+        
+        if not missions:
+            st.info("Aún no hay misiones. Crea tu primera misión!")
+        else:
+            for mission in missions:
+                with st.expander(f"{mission['name']} ({mission['type']})"):
+                    col1, col2 = st.columns([3, 1])
+                    with col1:
+                        st.write(f"**Descripción:** {mission['description']}")
+                        st.write(f"**XP:** {mission['base_xp']} | **Tokens:** {mission['tokens_reward']}")
+                        st.write(f"**Tiempo estimado:** {mission['time_cost']} min")
+                        st.write(f"**Fecha inicio:** {mission['start_date']}")
+                        if mission['end_date']:
+                            st.write(f"**Fecha fin:** {mission['end_date']}")
+                        if mission['attribute_id']:
+                            st.write(f"**Atributo:** {mission['attribute_id']}")
+                    
+                    with col2:
+                        if st.button("Eliminar", key=f"del_{mission['id']}"):
+                            st.session_state["missions"]["data"]["missions"] = [
+                                m for m in missions if m["id"] != mission["id"]
+                            ]
+                            remove_from_search_index(f"mission:{mission['id']}")
+                            bump_version("missions")
+                            st.rerun()
+    
+    with tab2:
+        st.subheader("Crear Nueva Misión")
+        
+        with st.form("create_mission"):
+            name = st.text_input("Nombre de la misión *")
+            description = st.text_area("Descripción")
+            mission_type = st.selectbox("Tipo", ["daily", "weekly", "monthly", "epic", "one_off"])
+            base_xp = st.number_input("XP base", 1, 1000, 10)
+            tokens_reward = st.number_input("Tokens de recompensa", 0, 100, 2)
+            time_cost = st.number_input("Tiempo estimado (min)", 0, 1440, DEFAULT_TIME_COST, step=5)
+            
+            # Atributos
+            attributes = st.session_state["attributes"]["data"]["attributes"]
+            attribute_id = st.selectbox(
+                "Atributo relacionado", 
+                [""] + [attr["id"] for attr in attributes]
+            )
+            
+            # Fechas
+            col1, col2 = st.columns(2)
+            with col1:
+                start_date = st.date_input("Fecha inicio", value=date.today())
+            with col2:
+                end_date = st.date_input("Fecha fin (opcional)", value=None)
+            
+            # Recurrencia según tipo
+            if mission_type == "daily":
+                recurrence = st.selectbox("Recurrencia", ["everyday", "weekdays", "weekends"])
+            elif mission_type == "weekly":
+                recurrence = st.selectbox("Día de la semana", [
+                    "monday", "tuesday", "wednesday", "thursday", 
+                    "friday", "saturday", "sunday"
+                ])
+            elif mission_type == "monthly":
+                recurrence = st.selectbox("Tipo mensual", ["first_day", "last_day"])
+            else:
+                recurrence = "once"
+            
+            priority = st.selectbox("Prioridad", ["low", "medium", "high"])
+            
+            if st.form_submit_button("Crear Misión"):
+                if not name.strip():
+                    st.error("El nombre es obligatorio")
+                else:
+                    new_mission = {
+                        "id": f"m_{uuid.uuid4().hex}",
+                        "name": name.strip(),
+                        "description": description,
+                        "type": mission_type,
+                        "base_xp": base_xp,
+                        "tokens_reward": tokens_reward,
+                        "attribute_id": attribute_id if attribute_id else None,
+                        "start_date": start_date.isoformat(),
+                        "end_date": end_date.isoformat() if end_date else None,
+                        "recurrence": recurrence,
+                        "priority": priority,
+                        "time_cost": time_cost
+                    }
+                    st.session_state["missions"]["data"]["missions"].append(new_mission)
+                    update_search_index(mission_document(new_mission))
+                    bump_version("missions")
+                    st.success("Misión creada exitosamente!")
+                    st.rerun()
+    
+    with tab3:
+        st.subheader("Misiones Épicas")
+        st.info("""
+        Las Misiones Épicas son tus grandes objetivos a largo plazo. 
+        Estas se dividen en misiones más pequeñas que aparecen en tu día a día.
+        
+        **Ejemplos:**
+        - Aprender un nuevo idioma
+        - Escribir un libro
+        - Cambiar de carrera
+        - Lograr una meta física específica
+        """)
+        
+        epic_missions = [
+            m for m in st.session_state["missions"]["data"]["missions"] 
+            if m["type"] == "epic"
+        ]
+        
+        if not epic_missions:
+            st.warning("No tienes misiones épicas definidas. ¡Es hora de soñar en grande!")
+        
+        if st.button("Crear Misión Épica"):
+            epic_mission = {
+                "id": f"epic_{uuid.uuid4().hex}",
+                "name": "Mi Gran Misión",
+                "description": "Describe tu objetivo más ambicioso...",
+                "type": "epic",
+                "base_xp": 100,
+                "tokens_reward": 50,
+                "attribute_id": None,
+                "start_date": date.today().isoformat(),
+                "end_date": (date.today() + timedelta(days=365)).isoformat(),
+                "recurrence": "yearly",
+                "priority": "high",
+                "time_cost": 60
+            }
+            st.session_state["missions"]["data"]["missions"].append(epic_mission)
+            update_search_index(mission_document(epic_mission))
+            bump_version("missions")
+            st.rerun()
@@ -0,0 +1,190 @@
+"""🏆 Sistema de Recompensas"""
+
+import uuid
+import streamlit as st
+from datetime import timedelta
+from typing import List, Dict
+
+from lifegame.engine import plan_reward_redemptions
+from lifegame.profiling import traced
+from lifegame.state import (
+    bump_version,
+    current_hub,
+    get_reward_catalog,
+    projected_token_income,
+    sync_with_hub,
+    today_date,
+)
+from lifegame.ui import render_sidebar_status
+
+def page_rewards():
+    st.header("🏆 Sistema de Recompensas")
+    
+    catalog = get_reward_catalog()
+    
+    tokens_slot = st.empty()
+    render_token_balance(tokens_slot)
+    
+    tab1, tab2, tab3 = st.tabs(["Tienda", "Canjear Recompensa", "Historial"])
+    
+    with tab1:
+        st.subheader("🎁 Recompensas Disponibles")
+        reward_shop(tokens_slot)
+        
+        # Crear nueva recompensa
+        st.subheader("➕ Crear Nueva Recompensa")
+        with st.form("create_reward"):
+            rname = st.text_input("Nombre de la recompensa")
+            rdesc = st.text_area("Descripción")
+            cost = st.number_input("Costo en tokens", 1, 1000, 10)
+            category = st.selectbox("Categoría", ["leisure", "reward", "experience", "item"])
+            preference = st.slider("Preferencia", 1, 5, 3, help="Cuánto deseas esta recompensa (usado por el planificador)")
+            max_copies = st.number_input("Máximo de canjes en el plan", 1, 20, 3)
+            
+            if st.form_submit_button("Crear Recompensa"):
+                if not rname.strip():
+                    st.error("El nombre es obligatorio")
+                else:
+                    new_reward = {
+                        "id": f"r_{uuid.uuid4().hex}",
+                        "name": rname.strip(),
+                        "description": rdesc,
+                        "cost_tokens": cost,
+                        "category": category,
+                        "preference": preference,
+                        "max_copies": max_copies
+                    }
+                    catalog.add(new_reward)
+                    bump_version("rewards")
+                    st.success("Recompensa creada!")
+                    st.rerun()
+    
+    with tab2:
+        st.subheader("🎯 Recompensas Recomendadas")
+        reward_quick_redeem(tokens_slot)
+    
+    with tab3:
+        st.subheader("📊 Historial de Canjes")
+        
+        if not catalog.data["redemptions"]:
+            st.info("Aún no has canjeado recompensas.")
+        else:
+            st.write(f"**Total gastado en recompensas:** {catalog.total_spent} tokens")
+            
+            by_category = sorted(catalog.spend_by_category.items(), key=lambda x: x[1], reverse=True)
+            st.caption(" · ".join(f"{category}: {spent}" for category, spent in by_category))
+            
+            for redemption in catalog.recent(10):
+                reward = catalog.get(redemption["reward_id"])
+                deleted = " (eliminada)" if reward.get("deleted") else ""
+                st.write(f"**{redemption['date']}** - {reward['name']}{deleted} (-{redemption['tokens_spent']} tokens)")
+
+def render_token_balance(tokens_slot):
+    tokens_slot.metric("Tokens Disponibles", st.session_state["profile"]["data"]["total_tokens"])
+
+def redeem_from_fragment(reward: Dict, tokens_slot) -> bool:
+    """
+    Canjea desde un fragment: actualiza saldo y sidebar sin rerun completo.
+    El saldo se revalida porque otro fragment pudo haberlo cambiado.
+    """
+    with current_hub().lock:
+        # Otra sesión del mismo usuario pudo haber gastado tokens
+        sync_with_hub()
+        profile = st.session_state["profile"]["data"]
+        if profile["total_tokens"] < reward["cost_tokens"]:
+            st.error("No tienes tokens suficientes")
+            return False
+        get_reward_catalog().redeem(reward["id"], profile, today_date())
+        bump_version("rewards", "profile")
+    render_token_balance(tokens_slot)
+    render_sidebar_status()
+    return True
+
+@st.fragment
+def reward_shop(tokens_slot):
+    profile = st.session_state["profile"]["data"]
+    catalog = get_reward_catalog()
+    rewards = catalog.active()
+    
+    if not rewards:
+        st.info("No hay recompensas definidas. Crea algunas!")
+        return
+    
+    for reward in rewards:
+        col1, col2, col3 = st.columns([3, 1, 1])
+        with col1:
+            st.write(f"**{reward['name']}**")
+            st.caption(reward['description'])
+            st.write(f"**Costo:** {reward['cost_tokens']} tokens")
+        
+        with col2:
+            can_afford = profile["total_tokens"] >= reward["cost_tokens"]
+            if can_afford:
+                if st.button("Canjear", key=f"buy_{reward['id']}"):
+                    if redeem_from_fragment(reward, tokens_slot):
+                        st.success(f"¡Canjeado! Disfruta de: {reward['name']}")
+                        st.rerun(scope="fragment")
+            else:
+                st.write(f"Necesitas {reward['cost_tokens'] - profile['total_tokens']} tokens más")
+        
+        with col3:
+            if st.button("Eliminar", key=f"del_reward_{reward['id']}"):
+                catalog.delete(reward["id"], today_date())
+                bump_version("rewards")
+                st.rerun()
+        
+        st.markdown("---")
+
+@st.fragment
+def reward_quick_redeem(tokens_slot):
+    profile = st.session_state["profile"]["data"]
+    rewards = get_reward_catalog().active()
+    
+    render_reward_plan(rewards, profile["total_tokens"])
+    
+    # Recompensas que puedes costear
+    affordable = [r for r in rewards if r["cost_tokens"] <= profile["total_tokens"]]
+    
+    if not affordable:
+        st.info("Ahorra más tokens para desbloquear recompensas!")
+    else:
+        st.write("**Puedes costear estas recompensas ahora:**")
+        for reward in affordable:
+            if st.button(f"Canjear: {reward['name']} - {reward['cost_tokens']} tokens", 
+                       key=f"quick_{reward['id']}"):
+                if redeem_from_fragment(reward, tokens_slot):
+                    st.success(f"¡Disfruta de {reward['name']}!")
+                    st.rerun(scope="fragment")
+
+@traced("view")
+def render_reward_plan(rewards: List[Dict], balance: int):
+    """Plan de canjes óptimo con el saldo actual y los tokens proyectados"""
+    config = st.session_state["config"]["data"]
+    
+    with st.expander("🧮 Plan de Canjes", expanded=True):
+        horizon = st.slider(
+            "Horizonte (días)",
+            0, 90,
+            int(config["reward_plan_horizon_days"]),
+            key="reward_plan_horizon"
+        )
+        today = today_date()
+        income = projected_token_income(today, horizon)
+        plan = plan_reward_redemptions(
+            rewards,
+            balance,
+            income,
+            max_copies=int(config["reward_plan_max_copies"]),
+        )
+        
+        st.caption(f"Saldo {balance} + {sum(income)} tokens proyectados = {plan['budget']} tokens")
+        if not plan["schedule"]:
+            st.info("Con los tokens proyectados todavía no alcanza para ninguna recompensa.")
+            return
+        
+        st.write(f"**Preferencia total: {plan['total_preference']} · Coste: {plan['total_cost']} tokens**")
+        for item in plan["schedule"]:
+            reward = item["reward"]
+            when = today + timedelta(days=item["day_offset"])
+            label = "hoy" if item["day_offset"] == 0 else when.strftime("%d %b")
+            st.write(f"🎁 {reward['name']} - {reward['cost_tokens']} tokens ({label})")
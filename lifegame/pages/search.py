@@ -0,0 +1,24 @@
+"""🔎 Buscar"""
+
+import streamlit as st
+
+from lifegame.state import search_documents
+
+def page_search():
+    st.header("🔎 Buscar")
+    
+    query = st.text_input("Buscar en diario, decisiones y misiones", placeholder="Ej: ejercicio, trabajo, familia")
+    if not query.strip():
+        st.info("Escribe una o más palabras. Los acentos y mayúsculas no importan.")
+        return
+    
+    results = search_documents(query, limit=30)
+    
+    if not results:
+        st.warning("Sin resultados.")
+        return
+    
+    st.caption(f"{len(results)} resultados")
+    for score, doc_id, title, doc_date, snippet in results:
+        with st.expander(f"{title} · {doc_date} · {score:.2f}"):
+            st.write(snippet)
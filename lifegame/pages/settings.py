@@ -0,0 +1,527 @@
+"""⚙️ Configuración Completa del Sistema"""
+
+import uuid
+import streamlit as st
+from datetime import datetime, timedelta
+
+from lifegame.backup import EXPORT_FORMATS, EXPORT_MIME, export_filename
+from lifegame.defaults import DEFAULT_PROFILE
+from lifegame.memory import get_memory_manager, MB
+from lifegame.metrics import REGISTRY
+from lifegame.state import (
+    bump_version,
+    compute_system_stats,
+    export_backup,
+    import_user_backup,
+    load_all_user_data,
+    save_all_user_data,
+    today_date,
+)
+from lifegame.ui import wait_for_history
+
+def page_config():
+    st.header("⚙️ Configuración Completa del Sistema")
+    
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "👤 Perfil de Usuario", 
+        "💪 Atributos y Fortalezas", 
+        "🎮 Ajustes del Juego",
+        "📊 Datos y Estadísticas",
+        "🔧 Sistema Avanzado"
+    ])
+    
+    with tab1:
+        st.subheader("👤 Perfil Personal")
+        
+        profile = st.session_state["profile"]["data"]
+        
+        with st.form("profile_form"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                player_name = st.text_input(
+                    "Nombre del Jugador",
+                    value=profile["player_name"],
+                    placeholder="Tu nombre o alias"
+                )
+                
+                current_level = st.number_input(
+                    "Nivel Actual",
+                    min_value=1,
+                    max_value=100,
+                    value=profile["current_level"]
+                )
+                
+                current_xp = st.number_input(
+                    "XP Actual",
+                    min_value=0,
+                    value=profile["current_xp"]
+                )
+                
+                total_tokens = st.number_input(
+                    "Tokens Totales",
+                    min_value=0,
+                    value=profile["total_tokens"]
+                )
+            
+            with col2:
+                player_bio = st.text_area(
+                    "Biografía Personal",
+                    value=profile["player_bio"],
+                    placeholder="Describe quién eres, tus valores, tu misión..."
+                )
+                
+                player_goals = st.text_area(
+                    "Metas Principales",
+                    value=profile["player_goals"],
+                    placeholder="Tus objetivos a largo plazo..."
+                )
+                
+                player_motivation = st.text_area(
+                    "Motivación Personal",
+                    value=profile["player_motivation"],
+                    placeholder="¿Qué te impulsa a seguir adelante?"
+                )
+            
+            if st.form_submit_button("💾 Guardar Perfil"):
+                profile["player_name"] = player_name
+                profile["player_bio"] = player_bio
+                profile["player_goals"] = player_goals
+                profile["player_motivation"] = player_motivation
+                profile["current_level"] = current_level
+                profile["current_xp"] = current_xp
+                profile["total_tokens"] = total_tokens
+                bump_version("profile")
+                st.success("Perfil actualizado correctamente!")
+    
+    with tab2:
+        st.subheader("💪 Sistema de Atributos")
+        
+        attributes_data = st.session_state["attributes"]["data"]
+        attributes = attributes_data["attributes"]
+        
+        st.info("💡 **Los atributos representan tus fortalezas y áreas de desarrollo.** Cada misión puede contribuir a uno o más atributos.")
+        
+        # Lista de atributos existentes
+        st.write("### Atributos Actuales")
+        
+        for i, attr in enumerate(attributes):
+            with st.expander(f"{attr['icon']} {attr['name']} - {attr['current_xp']} XP", expanded=False):
+                with st.form(f"edit_attr_{i}"):
+                    col1, col2, col3 = st.columns([2, 2, 1])
+                    
+                    with col1:
+                        new_name = st.text_input("Nombre", value=attr["name"], key=f"name_{i}")
+                        new_description = st.text_area(
+                            "Descripción", 
+                            value=attr["description"],
+                            key=f"desc_{i}"
+                        )
+                    
+                    with col2:
+                        new_xp = st.number_input(
+                            "XP Actual", 
+                            min_value=0, 
+                            value=attr["current_xp"],
+                            key=f"xp_{i}"
+                        )
+                        new_color = st.color_picker(
+                            "Color", 
+                            value=attr["color"],
+                            key=f"color_{i}"
+                        )
+                    
+                    with col3:
+                        icon_options = ["💪", "🧠", "❤️", "⚡", "🎨", "👥", "🦉", "⭐", "🔥", "🌱", "📚", "🏃"]
+                        new_icon = st.selectbox(
+                            "Icono",
+                            options=icon_options,
+                            index=icon_options.index(attr["icon"]) if attr["icon"] in icon_options else 0,
+                            key=f"icon_{i}"
+                        )
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.form_submit_button("💾 Actualizar Atributo"):
+                            attr["name"] = new_name
+                            attr["description"] = new_description
+                            attr["current_xp"] = new_xp
+                            attr["color"] = new_color
+                            attr["icon"] = new_icon
+                            bump_version("attributes")
+                            st.success(f"Atributo {new_name} actualizado!")
+                    
+                    with col2:
+                        if st.form_submit_button("🗑️ Eliminar"):
+                            attributes.remove(attr)
+                            bump_version("attributes")
+                            st.rerun()
+        
+        # Crear nuevo atributo
+        st.write("### ➕ Crear Nuevo Atributo")
+        with st.form("new_attribute_form"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                new_attr_name = st.text_input("Nombre del Nuevo Atributo")
+                new_attr_desc = st.text_area("Descripción")
+            
+            with col2:
+                new_attr_xp = st.number_input("XP Inicial", min_value=0, value=0)
+                new_attr_color = st.color_picker("Color", value="#4ECDC4")
+                icon_options = ["💪", "🧠", "❤️", "⚡", "🎨", "👥", "🦉", "⭐", "🔥", "🌱", "📚", "🏃"]
+                new_attr_icon = st.selectbox("Icono", options=icon_options)
+            
+            if st.form_submit_button("✨ Crear Atributo"):
+                if new_attr_name.strip():
+                    new_attribute = {
+                        "id": f"attr_{uuid.uuid4().hex}",
+                        "name": new_attr_name.strip(),
+                        "description": new_attr_desc,
+                        "current_xp": new_attr_xp,
+                        "color": new_attr_color,
+                        "icon": new_attr_icon
+                    }
+                    attributes.append(new_attribute)
+                    bump_version("attributes")
+                    st.success("Nuevo atributo creado!")
+                    st.rerun()
+                else:
+                    st.error("El nombre del atributo es obligatorio")
+    
+    with tab3:
+        st.subheader("🎮 Ajustes del Juego")
+        
+        config = st.session_state["config"]["data"]
+        profile = st.session_state["profile"]["data"]
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("### Sistema de Niveles")
+            xp_base = st.number_input(
+                "XP necesario por nivel",
+                min_value=10,
+                max_value=10000,
+                value=config["xp_base_per_level"],
+                help="Cantidad de XP requerida para subir de nivel"
+            )
+            
+            xp_formula = st.selectbox(
+                "Fórmula de progresión",
+                options=["linear", "exponential", "custom"],
+                index=0,
+                help="Cómo escala la dificultad entre niveles"
+            )
+            
+            st.write("### Sistema de Recompensas")
+            auto_save = st.checkbox(
+                "Guardado automático",
+                value=config["auto_save"],
+                help="Guardar automáticamente los cambios"
+            )
+            
+            notifications = st.checkbox(
+                "Notificaciones",
+                value=config["notifications_enabled"],
+                help="Mostrar notificaciones del sistema"
+            )
+            
+            st.write("### Plan Diario")
+            time_budget = st.number_input(
+                "Tiempo diario para misiones (min)",
+                min_value=0,
+                max_value=1440,
+                value=int(config["daily_time_budget"]),
+                step=15,
+                help="Presupuesto de tiempo usado por el plan óptimo del dashboard"
+            )
+            
+            max_share = st.slider(
+                "Máximo por atributo (%)",
+                min_value=10,
+                max_value=100,
+                value=int(config["attribute_max_share"] * 100),
+                step=5,
+                help="Porcentaje máximo del tiempo diario dedicado a un mismo atributo"
+            )
+        
+        with col2:
+            st.write("### Interfaz")
+            theme = st.selectbox(
+                "Tema de la aplicación",
+                options=["minimal", "dark", "light"],
+                index=0
+            )
+            
+            language = st.selectbox(
+                "Idioma",
+                options=["es", "en", "fr", "de"],
+                index=0
+            )
+            
+            default_view = st.selectbox(
+                "Vista por defecto",
+                options=["month", "week", "day"],
+                index=0
+            )
+            
+            start_week_on = st.selectbox(
+                "La semana comienza en",
+                options=["monday", "sunday"],
+                index=0
+            )
+            
+            daily_reset = st.time_input(
+                "Hora de reset diario",
+                value=datetime.strptime(config["daily_reset_time"], "%H:%M").time()
+            )
+        
+        if st.button("💾 Guardar Ajustes del Juego"):
+            config["xp_base_per_level"] = xp_base
+            config["xp_formula"] = xp_formula
+            config["theme"] = theme
+            config["language"] = language
+            config["default_view"] = default_view
+            config["calendar_start_week_on"] = start_week_on
+            config["notifications_enabled"] = notifications
+            config["auto_save"] = auto_save
+            config["daily_reset_time"] = daily_reset.strftime("%H:%M")
+            config["daily_time_budget"] = time_budget
+            config["attribute_max_share"] = max_share / 100
+            
+            # Actualizar también en el perfil si es diferente
+            if profile["xp_base_per_level"] != xp_base:
+                profile["xp_base_per_level"] = xp_base
+            bump_version("config", "profile")
+            
+            st.success("Ajustes del juego guardados correctamente!")
+    
+    with tab4:
+        st.subheader("📊 Gestión de Datos")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("### Guardado y Carga")
+            if st.button("💾 Guardar en GitHub", use_container_width=True):
+                save_all_user_data(st.session_state.username)
+                st.success("Todos los datos guardados en GitHub!")
+            
+            if st.button("🔄 Recargar desde GitHub", use_container_width=True):
+                load_all_user_data(st.session_state.username)
+                st.success("Datos recargados desde GitHub!")
+            
+            st.write("### Exportación")
+            if wait_for_history("mission_log", "journal", "decisions"):
+                render_export_panel()
+            
+            st.write("### Importación")
+            render_import_panel()
+        
+        with col2:
+            st.write("### Estadísticas del Sistema")
+            
+            stats = compute_system_stats()
+            
+            st.metric("Días Activos", stats["days_active"])
+            st.metric("Misiones Totales", stats["total_missions"])
+            st.metric("XP Total Ganado", stats["total_xp"])
+            st.metric("Entradas de Diario", stats["total_journal"])
+            st.metric("Decisiones Registradas", stats["total_decisions"])
+            st.metric("Misiones/Día Promedio", f"{stats['avg_missions']:.1f}")
+            
+            st.write("### Acciones Peligrosas")
+            if st.button("🆕 Reiniciar Progreso", type="secondary", use_container_width=True):
+                if st.checkbox("¿Estás completamente seguro? Esta acción NO se puede deshacer"):
+                    st.session_state["profile"]["data"] = DEFAULT_PROFILE.copy()
+                    st.session_state["mission_log"]["data"] = []
+                    st.session_state["journal"]["data"] = []
+                    st.session_state["decisions"]["data"] = []
+                    bump_version("profile", "mission_log", "journal", "decisions")
+                    st.success("Progreso reiniciado! Los datos base se mantienen.")
+    
+    with tab5:
+        st.subheader("🔧 Sistema Avanzado")
+        
+        st.warning("⚠️ **Configuración avanzada** - Modifica estos ajustes solo si sabes lo que estás haciendo.")
+        
+        config = st.session_state["config"]["data"]
+        memory = get_memory_manager()
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("### Rendimiento")
+            # El tope de cada usuario no puede pasar del presupuesto del servidor (LIFEGAME_CACHE_MB)
+            budget_mb = max(10, int(memory.budget / MB))
+            cache_size = st.number_input(
+                "Tamaño de caché (MB)",
+                min_value=10,
+                max_value=budget_mb,
+                value=min(int(config["cache_size_mb"]), budget_mb),
+                help="Memoria del servidor para tu historial; al superarla se compacta lo anterior a la ventana. El total de todas las sesiones lo fija el servidor"
+            )
+            
+            history_window = st.number_input(
+                "Ventana de historial (días)",
+                min_value=1,
+                max_value=3650,
+                value=int(config["history_window_days"]),
+                help="Al compactar se conservan como registros vivos los de estos últimos días"
+            )
+            
+            st.caption(f"Historial en memoria: {memory.usage() / MB:.1f} MB de {memory.budget / MB:.0f} MB ({memory.session_count()} sesiones)")
+            
+            auto_refresh = st.number_input(
+                "Auto-refresco (segundos)",
+                min_value=0,
+                max_value=3600,
+                value=0,
+                help="0 = desactivado"
+            )
+            
+            st.write("### Desarrollo")
+            debug_mode = st.checkbox(
+                "Modo Debug",
+                value=config["debug_mode"],
+                help="Muestra al pie de cada página el perfil del rerun: tiempos por función y llamadas a GitHub"
+            )
+            experimental_features = st.checkbox("Características Experimentales", value=False)
+        
+        with col2:
+            st.write("### Integraciones")
+            github_sync = st.checkbox("Sincronización automática con GitHub", value=True)
+            backup_interval = st.selectbox(
+                "Frecuencia de backup automático",
+                options=["disabled", "hourly", "daily", "weekly"],
+                index=2
+            )
+            
+            st.write("### Personalización CSS")
+            custom_css = st.text_area(
+                "CSS Personalizado",
+                value="",
+                height=100,
+                help="Añade estilos CSS personalizados"
+            )
+            
+            if st.button("Aplicar CSS"):
+                if custom_css.strip():
+                    st.markdown(f"<style>{custom_css}</style>", unsafe_allow_html=True)
+                    st.success("CSS aplicado!")
+        
+        if st.button("💾 Guardar Configuración Avanzada"):
+            config["cache_size_mb"] = cache_size
+            config["history_window_days"] = history_window
+            config["debug_mode"] = debug_mode
+            bump_version("config")
+            st.success("Configuración avanzada guardada!")
+        
+        st.write("### Métricas")
+        summary = REGISTRY.rolling_summary()
+        st.caption(f"Últimos {summary['window_minutes']:.0f} minutos, todas las sesiones del servidor")
+        
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Peticiones a GitHub", summary["github_requests"], help=f"{summary['github_per_minute']:.1f} por minuto")
+        m2.metric("Errores (4xx/5xx)", summary["github_errors"])
+        m3.metric("Latencia p95", f"{summary['github_p95_ms']:.0f} ms", help=f"p50: {summary['github_p50_ms']:.0f} ms · espera en cola p95: {summary['github_wait_p95_ms']:.0f} ms")
+        remaining = summary["ratelimit_remaining"]
+        m4.metric("Rate limit restante", "—" if remaining is None else f"{remaining:.0f}")
+        
+        rows = [
+            {"Tipo": "página", "Nombre": page, "Veces": stats["count"], "p50 (ms)": round(stats["p50_ms"]), "p95 (ms)": round(stats["p95_ms"])}
+            for page, stats in summary["reruns"].items()
+        ] + [
+            {"Tipo": "datos", "Nombre": op, "Veces": stats["count"], "p50 (ms)": round(stats["p50_ms"]), "p95 (ms)": round(stats["p95_ms"])}
+            for op, stats in summary["operations"].items()
+        ]
+        if rows:
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+        
+        with st.expander("Formato Prometheus"):
+            text = REGISTRY.render_prometheus()
+            st.code(text, language="text")
+            st.download_button("📥 Descargar métricas", text, file_name="lifegame_metrics.prom", mime="text/plain")
+
+def discard_export():
+    """El backup preparado deja de valer al cambiar las opciones o tras descargarlo"""
+    st.session_state.pop("backup_export", None)
+
+def render_export_panel():
+    """El backup se genera al pedirlo, no en cada rerun de la página"""
+    export_format = st.radio(
+        "Formato",
+        EXPORT_FORMATS,
+        horizontal=True,
+        key="export_format",
+        on_change=discard_export,
+        help="zip: un archivo por dataset, como en GitHub. NDJSON: una línea por registro."
+    )
+    since = None
+    if st.checkbox("Solo el historial desde una fecha", key="export_incremental", on_change=discard_export):
+        since = st.date_input(
+            "Desde",
+            value=today_date() - timedelta(days=30),
+            key="export_since",
+            on_change=discard_export
+        ).isoformat()
+    
+    if st.button("📦 Preparar backup", use_container_width=True):
+        with st.spinner("Generando backup..."):
+            st.session_state.backup_export = {
+                "data": export_backup(export_format, since),
+                "file_name": export_filename(export_format, since),
+                "mime": EXPORT_MIME[export_format],
+                "since": since,
+            }
+    
+    export = st.session_state.get("backup_export")
+    if export:
+        kind = f"Backup desde {export['since']}" if export["since"] else "Backup Completo"
+        st.download_button(
+            label=f"📥 Descargar {kind} ({len(export['data']) / 1024:.0f} KB)",
+            data=export["data"],
+            file_name=export["file_name"],
+            mime=export["mime"],
+            on_click=discard_export,
+            use_container_width=True
+        )
+
+def render_import_panel():
+    """Restaura un backup (zip, NDJSON o el JSON de la versión 1.0) sobre los datos del usuario"""
+    uploaded = st.file_uploader("Archivo de backup", type=["zip", "gz", "ndjson", "json"], key="import_file")
+    mode = st.radio(
+        "Modo",
+        ["Fusionar", "Reemplazar"],
+        horizontal=True,
+        key="import_mode",
+        help="Fusionar conserva lo existente y agrega lo nuevo. Reemplazar deja los datos como en el backup."
+    )
+    skip_invalid = st.checkbox("Omitir registros inválidos", key="import_skip_invalid")
+    recompute = st.checkbox("Recalcular nivel, XP y tokens desde el historial", value=True, key="import_recompute")
+    
+    if uploaded is None or not st.button("📤 Importar Backup", use_container_width=True):
+        return
+    try:
+        with st.spinner("Importando backup..."):
+            report = import_user_backup(uploaded, mode == "Reemplazar", skip_invalid, recompute)
+    except ValueError as e:
+        st.error(f"No se pudo importar: {e}")
+        return
+    
+    if report["errors"]:
+        with st.expander(f"⚠️ {report['invalid']} registros inválidos"):
+            for error in report["errors"]:
+                st.write(error)
+    if report["written"]:
+        counts = [c for fname, c in next(iter(report["users"].values())).items() if fname.endswith(".jsonl")]
+        imported = sum(c["imported"] for c in counts)
+        duplicates = sum(c["duplicates"] for c in counts)
+        st.success(f"Backup importado: {imported} registros nuevos, {duplicates} repetidos")
+    elif report["invalid"]:
+        st.error("Backup no importado: tiene registros inválidos")
+    elif report["failed"]:
+        st.error("No se pudo escribir el backup")
+    else:
+        st.info("El backup no tiene datos")
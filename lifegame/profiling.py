@@ -0,0 +1,98 @@
+"""
+Perfilado por rerun: tiempos de páginas, vistas y funciones del motor, y
+cada petición a GitHub. Sin una traza activa (modo debug apagado) los
+decoradores y `span` solo cuestan una lectura de ContextVar. Este módulo no
+importa Streamlit.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List
+
+_current: ContextVar["Trace | None"] = ContextVar("lifegame_trace", default=None)
+
+class Trace:
+    """Spans y peticiones HTTP de un rerun, con tiempos relativos a su inicio"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.started = time.perf_counter()
+        self.spans: List[Dict] = []
+        self.requests: List[Dict] = []
+        self.duration_ms = 0.0
+        self._depth = 0
+
+    def offset_ms(self, at: float) -> float:
+        return (at - self.started) * 1000
+
+    def finish(self):
+        self.duration_ms = self.offset_ms(time.perf_counter())
+
+    def summary(self) -> Dict:
+        return {
+            "label": self.label,
+            "ms": round(self.duration_ms, 1),
+            "spans": len(self.spans),
+            "github_calls": len(self.requests),
+            "github_kb": round(sum(r["bytes"] for r in self.requests) / 1024, 1),
+            "github_ms": round(sum(r["ms"] for r in self.requests), 1),
+        }
+
+def start_trace(label: str = "") -> Trace:
+    trace = Trace(label)
+    _current.set(trace)
+    return trace
+
+def stop_trace() -> "Trace | None":
+    trace = _current.get()
+    if trace is not None:
+        trace.finish()
+        _current.set(None)
+    return trace
+
+def current_trace() -> "Trace | None":
+    return _current.get()
+
+@contextmanager
+def span(name: str, category: str = "app"):
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    record = {"name": name, "category": category, "start_ms": trace.offset_ms(start), "ms": 0.0, "depth": trace._depth}
+    trace.spans.append(record)
+    trace._depth += 1
+    try:
+        yield
+    finally:
+        trace._depth -= 1
+        record["ms"] = (time.perf_counter() - start) * 1000
+
+def traced(category: str):
+    """Decorador: registra cada llamada como un span de la traza activa"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(fn.__qualname__, category):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_request(method: str, url: str, status: int, nbytes: int, started: float):
+    """Registra una petición HTTP (llamado por storage.github_request)"""
+    trace = _current.get()
+    if trace is None:
+        return
+    trace.requests.append({
+        "method": method,
+        "path": url.split("/contents/", 1)[-1],
+        "status": status,
+        "bytes": nbytes,
+        "start_ms": trace.offset_ms(started),
+        "ms": (time.perf_counter() - started) * 1000,
+    })
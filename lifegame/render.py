@@ -0,0 +1,110 @@
+"""Constructores de HTML puros (sin Streamlit) para vistas pesadas."""
+
+import calendar
+import html
+from datetime import date
+from typing import Dict, List
+
+from lifegame.profiling import traced
+
+# =========================================================
+#  CALENDARIO MENSUAL
+# =========================================================
+
+CALENDAR_GRID_CSS = """
+<style>
+.month-grid { display: grid; grid-template-columns: repeat(7, 1fr); gap: 4px; }
+.month-grid .head { font-weight: 700; text-align: center; padding: 4px 0; }
+.month-grid .day { border: 1px solid #e0e0e0; border-radius: 4px; padding: 6px; min-height: 84px;
+                   cursor: pointer; font-size: 13px; overflow: hidden; }
+.month-grid .day:hover { border-color: #000; }
+.month-grid .today { background-color: #f0f8ff; border: 2px solid #000; }
+.month-grid .other { color: #aaa; }
+.month-grid .num { font-weight: 700; margin-bottom: 4px; }
+.month-grid .badge { display: block; color: #555; white-space: nowrap; text-overflow: ellipsis; overflow: hidden; }
+.month-grid .done { color: #2e7d32; }
+</style>
+"""
+
+WEEKDAY_LABELS = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+
+@traced("render")
+def build_month_grid_html(
+    year: int,
+    month: int,
+    summaries: Dict[date, tuple],
+    today: date,
+    first_weekday: int = 0,
+) -> str:
+    """
+    Construye la grilla del mes completa como un único bloque HTML.
+    summaries: {fecha: (misiones_completadas, misiones_totales, [títulos de eventos])}
+    """
+    labels = WEEKDAY_LABELS[first_weekday:] + WEEKDAY_LABELS[:first_weekday]
+    parts = [CALENDAR_GRID_CSS, '<div class="month-grid">']
+    parts.extend(f'<div class="head">{label}</div>' for label in labels)
+    
+    for week in calendar.Calendar(first_weekday).monthdatescalendar(year, month):
+        for day_date in week:
+            classes = "day"
+            if day_date == today:
+                classes += " today"
+            if day_date.month != month:
+                classes += " other"
+            parts.append(f'<div class="{classes}" data-date="{day_date.isoformat()}"><div class="num">{day_date.day}</div>')
+            
+            completed, total, event_titles = summaries.get(day_date, (0, 0, []))
+            if total:
+                done = " done" if completed == total else ""
+                parts.append(f'<span class="badge{done}">🎯 {completed}/{total}</span>')
+            for title in event_titles[:2]:
+                parts.append(f'<span class="badge">🗓️ {html.escape(title)}</span>')
+            if len(event_titles) > 2:
+                parts.append(f'<span class="badge">+{len(event_titles) - 2} eventos</span>')
+            parts.append("</div>")
+    
+    parts.append("</div>")
+    return "".join(parts)
+
+# =========================================================
+#  TIMELINE DE PERFILADO
+# =========================================================
+
+TIMELINE_CSS = """
+<style>
+.tl-row { display: flex; align-items: center; font-size: 12px; line-height: 18px; }
+.tl-label { width: 35%; overflow: hidden; white-space: nowrap; text-overflow: ellipsis; }
+.tl-track { position: relative; flex: 1; height: 12px; background: #f3f3f3; }
+.tl-bar { position: absolute; top: 0; height: 12px; min-width: 2px; }
+.tl-ms { width: 70px; text-align: right; color: #666; }
+</style>
+"""
+
+TIMELINE_COLORS = {
+    "page": "#4ECDC4",
+    "view": "#45B7D1",
+    "engine": "#FF9800",
+    "render": "#9C27B0",
+    "search": "#96CEB4",
+    "storage": "#888888",
+    "github": "#FF6B6B",
+}
+
+def build_timeline_html(spans: List[Dict], requests: List[Dict], total_ms: float) -> str:
+    """Barras de cada span y petición HTTP sobre la duración total del rerun"""
+    total_ms = total_ms or 1.0
+    rows = [(s["name"], s["category"], s["start_ms"], s["ms"], s["depth"]) for s in spans]
+    rows += [(f"{r['method']} {r['path']} → {r['status']}", "github", r["start_ms"], r["ms"], 0) for r in requests]
+    rows.sort(key=lambda row: row[2])
+    parts = [TIMELINE_CSS]
+    for name, category, start_ms, ms, depth in rows:
+        left = min(start_ms / total_ms * 100, 100)
+        width = min(ms / total_ms * 100, 100 - left)
+        color = TIMELINE_COLORS.get(category, "#DDDDDD")
+        label = html.escape(name)
+        parts.append(
+            f'<div class="tl-row"><span class="tl-label" style="padding-left:{depth * 12}px" title="{label}">{label}</span>'
+            f'<div class="tl-track"><div class="tl-bar" style="left:{left:.2f}%;width:{width:.2f}%;background:{color}"></div></div>'
+            f'<span class="tl-ms">{ms:.1f} ms</span></div>'
+        )
+    return "".join(parts)
@@ -0,0 +1,163 @@
+"""
+Planificador de peticiones a la API de GitHub, compartido por el proceso.
+
+Todas las sesiones del servidor usan el mismo token y por tanto la misma
+cuota. Antes de cada petición, storage.github_request pide turno aquí:
+
+- cubetas de tokens con los límites de GitHub: el primario (5000/hora), los
+  puntos secundarios (900/minuto, 5 por escritura) y la creación de
+  contenido (80/minuto y 500/hora), más un tope de peticiones en vuelo;
+- las cabeceras X-RateLimit-* y Retry-After de cada respuesta ajustan las
+  cubetas a lo que GitHub dice que queda;
+- las lecturas pasan antes que las escrituras (una escritura que lleva más
+  de WRITE_AGING_SECONDS esperando compite como lectura);
+- dentro de cada prioridad se atiende primero al usuario servido hace más
+  tiempo, así que un usuario que encola muchas peticiones no deja sin turno
+  al resto. Quien llama a github_request dice de qué usuario es la petición
+  (también las de la Git Data API, cuya URL no lo nombra); las que no son
+  de nadie en particular van como SYSTEM_USER.
+
+Este módulo no importa Streamlit.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List
+
+# Límites de GitHub para un token (primario y secundarios); el primario se
+# corrige con X-RateLimit-Limit y admite ráfagas de un cuarto de hora
+PRIMARY_PER_HOUR = 5000
+PRIMARY_BURST_FRACTION = 0.25
+POINTS_PER_MINUTE = 900
+WRITE_POINTS = 5
+WRITES_PER_MINUTE = 80
+WRITES_PER_HOUR = 500
+MAX_IN_FLIGHT = 100
+# Espera tras la cual una escritura deja de ceder el paso a las lecturas
+WRITE_AGING_SECONDS = 2.0
+# Tope de cada espera antes de volver a mirar la cola
+MAX_POLL_SECONDS = 0.5
+
+READ_METHODS = ("GET", "HEAD")
+SYSTEM_USER = "_system"
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, cost: float) -> float:
+        """Segundos hasta poder gastar `cost` (0 si ya se puede)"""
+        return 0.0 if self.tokens >= cost else (cost - self.tokens) / self.rate
+
+class Ticket:
+    __slots__ = ("seq", "user", "write", "enqueued")
+
+    def __init__(self, seq: int, user: str, write: bool, enqueued: float):
+        self.seq = seq
+        self.user = user
+        self.write = write
+        self.enqueued = enqueued
+
+class RequestScheduler:
+    """
+    `scale` multiplica todos los límites: 1 son los de GitHub; más sirve
+    para servidores sin límites secundarios o para pruebas de carga, que
+    comprimen en segundos lo que los usuarios hacen en minutos.
+    """
+
+    def __init__(self, scale: float = 1.0):
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.pending: List[Ticket] = []
+        self.last_served: Dict[str, float] = {}
+        self._seq = 0
+        self.configure(scale)
+
+    def configure(self, scale: float = 1.0, primary_per_hour: float = PRIMARY_PER_HOUR):
+        with self._cond:
+            self.scale = scale
+            self.primary = TokenBucket(primary_per_hour * scale / 3600, primary_per_hour * scale * PRIMARY_BURST_FRACTION)
+            self.points = TokenBucket(POINTS_PER_MINUTE * scale / 60, POINTS_PER_MINUTE * scale)
+            self.writes_minute = TokenBucket(WRITES_PER_MINUTE * scale / 60, WRITES_PER_MINUTE * scale)
+            self.writes_hour = TokenBucket(WRITES_PER_HOUR * scale / 3600, WRITES_PER_HOUR * scale)
+            self._cond.notify_all()
+
+    def _costs(self, ticket: Ticket) -> list:
+        if ticket.write:
+            return [(self.primary, 1), (self.points, WRITE_POINTS), (self.writes_minute, 1), (self.writes_hour, 1)]
+        return [(self.primary, 1), (self.points, 1)]
+
+    def _delay(self, ticket: Ticket, now: float) -> float:
+        if self.in_flight >= MAX_IN_FLIGHT:
+            return MAX_POLL_SECONDS
+        return max([self.blocked_until - now] + [bucket.delay(cost) for bucket, cost in self._costs(ticket)])
+
+    def _order(self, ticket: Ticket, now: float) -> tuple:
+        write_class = ticket.write and now - ticket.enqueued < WRITE_AGING_SECONDS
+        return (write_class, self.last_served.get(ticket.user, 0.0), ticket.seq)
+
+    def _next(self, now: float) -> tuple:
+        """(ticket a despachar o None, segundos hasta que alguno pueda salir)"""
+        for bucket in (self.primary, self.points, self.writes_minute, self.writes_hour):
+            bucket.refill(now)
+        wait = MAX_POLL_SECONDS
+        for ticket in sorted(self.pending, key=lambda t: self._order(t, now)):
+            delay = self._delay(ticket, now)
+            if delay <= 0:
+                return ticket, 0.0
+            wait = min(wait, delay)
+        return None, wait
+
+    def acquire(self, method: str, user: str = SYSTEM_USER) -> float:
+        """Espera turno para una petición de `user`; devuelve los segundos en cola"""
+        now = time.monotonic()
+        with self._cond:
+            self._seq += 1
+            ticket = Ticket(self._seq, user, method.upper() not in READ_METHODS, now)
+            self.pending.append(ticket)
+            while True:
+                now = time.monotonic()
+                chosen, wait = self._next(now)
+                if chosen is ticket:
+                    break
+                # Si el turno es de otro hilo, su notify_all nos despierta
+                self._cond.wait(wait if chosen is None else MAX_POLL_SECONDS)
+            for bucket, cost in self._costs(ticket):
+                bucket.tokens -= cost
+            self.pending.remove(ticket)
+            self.last_served[ticket.user] = now
+            self.in_flight += 1
+            self._cond.notify_all()
+        return now - ticket.enqueued
+
+    def release(self, status: int = 0, headers=None):
+        """Fin de la petición: ajusta las cubetas a las cabeceras de GitHub"""
+        headers = headers or {}
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            limit = headers.get("X-RateLimit-Limit")
+            if limit and float(limit) * self.scale / 3600 != self.primary.rate:
+                # Otro tipo de token (p. ej. una GitHub App) u otro servidor
+                self.primary.rate = float(limit) * self.scale / 3600
+                self.primary.capacity = float(limit) * self.scale * PRIMARY_BURST_FRACTION
+            remaining = headers.get("X-RateLimit-Remaining")
+            if remaining is not None:
+                self.primary.tokens = min(self.primary.tokens, float(remaining))
+                if float(remaining) <= 0 and headers.get("X-RateLimit-Reset"):
+                    reset = float(headers["X-RateLimit-Reset"]) - time.time()
+                    self.blocked_until = max(self.blocked_until, now + reset)
+            if status in (403, 429) and headers.get("Retry-After"):
+                self.blocked_until = max(self.blocked_until, now + float(headers["Retry-After"]))
+            self._cond.notify_all()
+
+SCHEDULER = RequestScheduler(float(os.environ.get("LIFEGAME_GITHUB_LIMIT_SCALE", 1)))
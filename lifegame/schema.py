@@ -0,0 +1,158 @@
+"""
+Versiones de esquema de los datasets y migraciones perezosas.
+
+Cada registro de historial (mission_log, journal, decisions) y cada
+documento JSON (profile, attributes, missions, rewards) lleva su versión en
+`_v`; sin ella es la versión 1, la de los archivos anteriores a este módulo.
+config y calendar también: la configuración queda con todas las claves de
+DEFAULT_CONFIG y cada evento con todos sus campos.
+Un paso registrado con `@migration(clave, n)` lleva un registro de n a n+1
+en el sitio. storage.parse_user_file migra lo que lee, de modo que el
+historial se pone al día a medida que se carga (en segundo plano, ver
+lifegame.hub) y queda guardado en el siguiente guardado, sin una migración
+completa que bloquee. Lo que ya está en la versión actual solo paga una
+comparación; lo escrito por una versión más nueva de la app no se toca.
+
+Tras la migración los campos de la versión actual están siempre presentes,
+así que el código que lee los datasets los indexa directamente en lugar de
+repetir `.get(campo, por_defecto)`. Este módulo no importa Streamlit.
+"""
+
+from typing import Callable, Dict, List
+
+from lifegame.defaults import DEFAULT_CONFIG, DEFAULT_TIME_COST
+from lifegame.metrics import REGISTRY
+
+VERSION_FIELD = "_v"
+
+# Versión actual por dataset: la siguiente al último paso registrado
+SCHEMA_VERSIONS: Dict[str, int] = {}
+_MIGRATIONS: Dict[str, Dict[int, Callable[[Dict], None]]] = {}
+
+def migration(key: str, version: int):
+    """Registra el paso que lleva un registro (o documento) de `key` de `version` a `version + 1`"""
+    def register(step: Callable[[Dict], None]):
+        _MIGRATIONS.setdefault(key, {})[version] = step
+        SCHEMA_VERSIONS[key] = max(SCHEMA_VERSIONS.get(key, 1), version + 1)
+        return step
+    return register
+
+def upgrade(key: str, item: Dict) -> bool:
+    """Lleva `item` a la versión actual en el sitio; True si hubo que migrarlo"""
+    target = SCHEMA_VERSIONS.get(key)
+    version = item.get(VERSION_FIELD, 1)
+    if target is None or version >= target:
+        return False
+    steps = _MIGRATIONS[key]
+    while version < target:
+        steps[version](item)
+        version += 1
+    item[VERSION_FIELD] = version
+    return True
+
+def upgrade_dataset(key: str, data) -> int:
+    """Migra lo pendiente de un dataset recién leído; devuelve cuántos registros cambiaron"""
+    target = SCHEMA_VERSIONS.get(key)
+    if target is None:
+        return 0
+    if isinstance(data, list):
+        stale = [record for record in data if record.get(VERSION_FIELD, 1) < target]
+    else:
+        stale = [data]
+    migrated = sum(upgrade(key, item) for item in stale)
+    if migrated:
+        REGISTRY.inc("lifegame_schema_migrations_total", {"dataset": key}, migrated)
+    return migrated
+
+def stamp(key: str, item: Dict) -> Dict:
+    """Marca un registro nuevo, creado ya con la forma actual, con la versión vigente"""
+    if key in SCHEMA_VERSIONS:
+        item[VERSION_FIELD] = SCHEMA_VERSIONS[key]
+    return item
+
+# =========================================================
+#  MIGRACIONES
+# =========================================================
+
+def _fill(item: Dict, defaults: Dict):
+    for field, value in defaults.items():
+        if field not in item:
+            item[field] = type(value)(value) if isinstance(value, (list, dict)) else value
+
+def _fill_items(items: List[Dict], defaults: Dict):
+    for item in items:
+        _fill(item, defaults)
+
+def _fill_dates(record: Dict):
+    """
+    `date` y `timestamp`, cada uno a partir del otro (null cuenta como
+    ausente). Una línea antigua sin ninguno de los dos queda con "" en vez
+    de hacer fallar la carga del usuario entero.
+    """
+    day = record.get("date") or (record.get("timestamp") or "")[:10]
+    for field in ("date", "timestamp"):
+        if record.get(field) is None:
+            record[field] = day
+
+# v2: campos que la app daba por supuestos con `.get(campo, por_defecto)`.
+# Los valores son los mismos que usaban esas lecturas.
+
+@migration("mission_log", 1)
+def _mission_log_v2(record: Dict):
+    _fill_dates(record)
+    _fill(record, {"xp_awarded": 0, "tokens_awarded": 0, "notes": ""})
+
+@migration("journal", 1)
+def _journal_v2(entry: Dict):
+    _fill_dates(entry)
+    _fill(entry, {"text": "", "attribute_ids": [], "xp_awarded": 0, "mood": "😊"})
+
+@migration("decisions", 1)
+def _decisions_v2(decision: Dict):
+    _fill(decision, {"situation": "", "options": [], "chosen_option": None, "reason": "", "regret_check": None, "regret_notes": None})
+
+@migration("profile", 1)
+def _profile_v2(profile: Dict):
+    _fill(profile, {
+        "streak_days": 0,
+        "last_active_date": None,
+        "agenda": None,
+        "player_name": "",
+        "player_bio": "",
+        "player_goals": "",
+        "player_motivation": "",
+    })
+
+@migration("attributes", 1)
+def _attributes_v2(document: Dict):
+    _fill_items(document.setdefault("attributes", []), {"current_xp": 0, "description": "", "color": "#4ECDC4", "icon": "⭐"})
+
+@migration("missions", 1)
+def _missions_v2(document: Dict):
+    _fill_items(document.setdefault("missions", []), {
+        "name": "",
+        "description": "",
+        "type": "daily",
+        "base_xp": 0,
+        "tokens_reward": 0,
+        "attribute_id": None,
+        "start_date": "2000-01-01",
+        "end_date": None,
+        "recurrence": "everyday",
+        "priority": "medium",
+        "time_cost": DEFAULT_TIME_COST,
+    })
+
+@migration("config", 1)
+def _config_v2(config: Dict):
+    _fill(config, DEFAULT_CONFIG)
+
+@migration("calendar", 1)
+def _calendar_v2(document: Dict):
+    _fill_items(document.setdefault("events", []), {"title": "", "start_time": "", "end_time": "", "notes": "", "type": "event"})
+
+@migration("rewards", 1)
+def _rewards_v2(document: Dict):
+    _fill_items(document.setdefault("rewards", []), {"description": "", "cost_tokens": 0, "category": "other", "preference": 1})
+    for redemption in document.setdefault("redemptions", []):
+        _fill_dates(redemption)
@@ -0,0 +1,204 @@
+"""Búsqueda de texto completo: índice invertido incremental con ranking BM25."""
+
+import heapq
+import json
+import math
+import re
+import unicodedata
+import zlib
+from functools import lru_cache
+from typing import List, Dict
+
+from lifegame.profiling import traced
+
+# =========================================================
+#  TOKENIZACIÓN
+# =========================================================
+
+SEARCH_INDEX_FILE = "search_index.json"
+SEARCH_INDEX_VERSION = 3
+# Archivos de los que salen los documentos (ver SearchIndex.sources)
+SEARCH_SOURCES = ("journal", "decisions", "missions")
+SEARCH_SNIPPET_CHARS = 300
+
+SPANISH_STOPWORDS = set("""
+a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante
+e el ella ellas ellos en entre era eran es esa esas ese eso esos esta estaba estas este esto
+estos fue fueron ha habia han hasta hay la las le les lo los mas me mi mis mucho muy nada
+ni no nos o otra otro para pero poco por porque que se sea ser si sin sobre su sus tambien
+te tener tengo ti tu tus un una uno unos y ya yo
+""".split())
+
+SPANISH_SUFFIXES = (
+    "amientos", "imientos", "amiento", "imiento", "aciones", "uciones", "amente", "mente",
+    "acion", "ucion", "idades", "idad", "ando", "iendo", "adas", "idas", "ados", "idos",
+    "ada", "ida", "ado", "ido", "es", "as", "os", "a", "o", "s", "e",
+)
+
+def normalize_text(text: str) -> str:
+    """Minúsculas y sin acentos (á -> a, ñ -> n)"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+@lru_cache(maxsize=65536)
+def stem_spanish(word: str) -> str:
+    """Stemming ligero por sufijos; conserva al menos 3 letras"""
+    for suffix in SPANISH_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+def tokenize(text: str) -> List[str]:
+    return [
+        stem_spanish(word)
+        for word in re.findall(r"[a-z0-9]+", normalize_text(text))
+        if word not in SPANISH_STOPWORDS
+    ]
+
+# =========================================================
+#  DOCUMENTOS
+# =========================================================
+
+def journal_document(entry: Dict) -> tuple:
+    return (f"journal:{entry['id']}", entry["text"], f"📔 Diario {entry['date']}", entry["date"])
+
+def decision_document(decision: Dict) -> tuple:
+    text = f"{decision['situation']} {decision['reason']}"
+    return (f"decision:{decision['id']}", text, f"🎲 {decision['situation'][:60]}", decision["timestamp"][:10])
+
+def mission_document(mission: Dict) -> tuple:
+    text = f"{mission['name']} {mission['description']}"
+    return (f"mission:{mission['id']}", text, f"🎯 {mission['name']}", mission["start_date"])
+
+def searchable_documents(state) -> List[tuple]:
+    """(doc_id, texto, título, fecha) de diario, decisiones y misiones de un usuario"""
+    docs = [journal_document(entry) for entry in state["journal"]["data"]]
+    docs += [decision_document(decision) for decision in state["decisions"]["data"]]
+    docs += [mission_document(mission) for mission in state["missions"]["data"]["missions"]]
+    return docs
+
+def search_sources(state) -> Dict[str, str]:
+    """SHA de cada archivo del que salen los documentos"""
+    return {key: state[key]["sha"] for key in SEARCH_SOURCES}
+
+# =========================================================
+#  ÍNDICE INVERTIDO + BM25
+# =========================================================
+
+class SearchIndex:
+    """
+    Índice invertido incremental con ranking BM25.
+
+    Cada documento guarda una firma (crc32 del texto) para que `sync` solo
+    reindexe lo que cambió desde la última vez que se persistió el índice, y
+    sus términos (`doc_terms`) para que `remove` solo toque sus postings.
+
+    Título, fecha y fragmento (`doc_meta`) se persisten junto con las SHA
+    de los archivos indexados (`sources`): si al cargar coinciden con las de
+    journal, decisions y missions, el índice ya está al día y la primera
+    búsqueda no necesita un `sync`.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_len: Dict[str, int] = {}
+        self.doc_sig: Dict[str, int] = {}
+        self.doc_terms: Dict[str, tuple] = {}
+        self.doc_meta: Dict[str, List[str]] = {}
+        self.sources: Dict[str, str] = {}
+        self.total_len = 0
+        self.dirty = False
+
+    def add(self, doc_id: str, text: str, title: str = "", doc_date: str = ""):
+        signature = zlib.crc32(text.encode("utf-8"))
+        if self.doc_sig.get(doc_id) == signature:
+            self.doc_meta[doc_id] = [title, doc_date, text[:SEARCH_SNIPPET_CHARS]]
+            return
+        self.remove(doc_id)
+        terms = tokenize(text)
+        counts: Dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+        self.doc_terms[doc_id] = tuple(counts)
+        self.doc_len[doc_id] = len(terms)
+        self.doc_sig[doc_id] = signature
+        self.doc_meta[doc_id] = [title, doc_date, text[:SEARCH_SNIPPET_CHARS]]
+        self.total_len += len(terms)
+        self.dirty = True
+
+    def remove(self, doc_id: str):
+        if doc_id not in self.doc_sig:
+            return
+        for term in self.doc_terms.pop(doc_id):
+            posting = self.postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self.postings[term]
+        self.total_len -= self.doc_len.pop(doc_id)
+        del self.doc_sig[doc_id]
+        self.doc_meta.pop(doc_id, None)
+        self.dirty = True
+
+    @traced("search")
+    def sync(self, docs: List[tuple]):
+        """Alinea el índice con los documentos actuales (solo toca cambios)"""
+        current = set()
+        for doc_id, text, title, doc_date in docs:
+            current.add(doc_id)
+            self.add(doc_id, text, title, doc_date)
+        for doc_id in [d for d in self.doc_sig if d not in current]:
+            self.remove(doc_id)
+
+    @traced("search")
+    def search(self, query: str, limit: int = 20) -> List[tuple]:
+        """Devuelve [(score, doc_id)] ordenados por relevancia BM25"""
+        n_docs = len(self.doc_len)
+        if not n_docs:
+            return []
+        avg_len = self.total_len / n_docs or 1
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                norm = tf + self.K1 * (1 - self.B + self.B * self.doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.K1 + 1) / norm
+        return heapq.nlargest(limit, ((score, doc_id) for doc_id, score in scores.items()))
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "version": SEARCH_INDEX_VERSION,
+            "sources": self.sources,
+            "postings": self.postings,
+            "doc_len": self.doc_len,
+            "doc_sig": self.doc_sig,
+            "doc_meta": self.doc_meta,
+        }, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, content: str | None) -> "SearchIndex":
+        index = cls()
+        if not content:
+            return index
+        data = json.loads(content)
+        if data.get("version") != SEARCH_INDEX_VERSION:
+            return index
+        index.postings = data["postings"]
+        index.doc_len = data["doc_len"]
+        index.doc_sig = data["doc_sig"]
+        index.doc_meta = data["doc_meta"]
+        index.sources = data["sources"]
+        index.total_len = sum(index.doc_len.values())
+        doc_terms: Dict[str, list] = {doc_id: [] for doc_id in index.doc_sig}
+        for term, posting in index.postings.items():
+            for doc_id in posting:
+                doc_terms[doc_id].append(term)
+        index.doc_terms = {doc_id: tuple(terms) for doc_id, terms in doc_terms.items()}
+        return index
@@ -0,0 +1,76 @@
+"""
+Reparto de usuarios entre varios repos o ramas de GitHub (shards).
+
+Cada usuario vive en data/<usuario>/ de un único shard, elegido por hashing
+consistente sobre su nombre: agregar o quitar un shard solo mueve ~1/N de
+los usuarios, que `python -m lifegame rebalance` migra. Como cada shard es
+una ref distinta, los commits de usuarios de shards distintos no compiten
+por la misma rama. Este módulo no importa Streamlit ni hace peticiones.
+"""
+
+import bisect
+import hashlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple
+
+DEFAULT_BRANCH = "main"
+
+# Puntos por shard en el anillo; con 160 el reparto queda a ~±10% de 1/N
+VNODES = 160
+
+class Shard(NamedTuple):
+    repo: str
+    branch: str = DEFAULT_BRANCH
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """'owner/repo' o 'owner/repo@rama'"""
+        repo, _, branch = spec.strip().partition("@")
+        return cls(repo, branch or DEFAULT_BRANCH)
+
+    def __str__(self) -> str:
+        return f"{self.repo}@{self.branch}"
+
+def parse_shards(spec: str | Iterable[str]) -> List[Shard]:
+    """Lista separada por comas (variable de entorno) o lista de st.secrets"""
+    items = spec.split(",") if isinstance(spec, str) else spec
+    shards = [Shard.parse(item) for item in items if item.strip()]
+    if len(set(shards)) != len(shards):
+        raise ValueError(f"Shards repetidos: {', '.join(map(str, shards))}")
+    return shards
+
+def _point(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+class HashRing:
+    """Anillo de hashing consistente con VNODES puntos por shard"""
+
+    def __init__(self, shards: Iterable[Shard], vnodes: int = VNODES):
+        self.shards = list(shards)
+        if not self.shards:
+            raise ValueError("Se necesita al menos un shard")
+        ring = sorted((_point(f"{shard}#{i}"), shard) for shard in self.shards for i in range(vnodes))
+        self._points = [point for point, _ in ring]
+        self._owners = [shard for _, shard in ring]
+
+    def shard_for(self, username: str) -> Shard:
+        if len(self.shards) == 1:
+            return self.shards[0]
+        position = bisect.bisect(self._points, _point(username)) % len(self._points)
+        return self._owners[position]
+
+@lru_cache(maxsize=8)
+def hash_ring(shards: tuple) -> HashRing:
+    return HashRing(shards)
+
+def plan_moves(placement: Dict[str, List[Shard]], ring: HashRing) -> List[tuple]:
+    """
+    [(usuario, origen, destino)] para dejar a cada usuario en su shard del
+    anillo. `placement` es {usuario: [shards donde hoy tiene carpeta]}; si
+    está en varios (una migración a medias) hay un movimiento por copia.
+    """
+    moves = []
+    for username in sorted(placement):
+        target = ring.shard_for(username)
+        moves.extend((username, source, target) for source in placement[username] if source != target)
+    return moves
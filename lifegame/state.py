@@ -0,0 +1,408 @@
+"""Estado de la sesión de Streamlit y vistas derivadas memoizadas."""
+
+import streamlit as st
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import wraps
+from typing import List, Dict, Any
+
+from lifegame import engine
+from lifegame.agenda import agenda_missions, game_day
+from lifegame.backup import import_backup
+from lifegame.columnar import column_stats
+from lifegame.defaults import DEFAULT_CONFIG, USER_FILES
+from lifegame.engine import (
+    completions_index,
+    decision_stats,
+    events_index,
+    HistoryIndex,
+    missions_for_date,
+    month_summaries,
+    project_token_income,
+    RewardCatalog,
+)
+from lifegame.hub import COLD_KEYS, UserHub
+from lifegame.memory import get_memory_manager, MB
+from lifegame.profiling import span
+from lifegame.render import build_month_grid_html
+from lifegame.search import search_sources, searchable_documents, SearchIndex
+from lifegame.storage import get_backend, write_user_data
+
+# =========================================================
+#  SESSION STATE
+# =========================================================
+
+def init_session():
+    if "authenticated" not in st.session_state:
+        st.session_state.authenticated = False
+    if "username" not in st.session_state:
+        st.session_state.username = None
+    if "current_date" not in st.session_state:
+        # Aún sin usuario: hora de reset por defecto; el login la corrige
+        st.session_state.current_date = game_day(datetime.now(), DEFAULT_CONFIG["daily_reset_time"])
+    if "calendar_view" not in st.session_state:
+        st.session_state.calendar_view = "month"
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+
+# =========================================================
+#  LOAD & SAVE DATA
+# =========================================================
+
+@st.cache_resource(show_spinner=False)
+def user_hub(username: str) -> UserHub:
+    """Hub del usuario, único en el proceso y compartido por todas sus sesiones"""
+    return UserHub(username)
+
+def current_hub() -> UserHub:
+    return user_hub(st.session_state.username)
+
+def load_hot_user_data(username: str):
+    """
+    Enlaza la sesión con el hub del usuario. Si es la primera sesión, el hub
+    carga lo necesario para el dashboard y lanza la carga del historial.
+    """
+    user_hub(username).ensure_loaded(get_backend())
+    for key in USER_FILES.values():
+        st.session_state.pop(key, None)
+    st.session_state.pop("search_index", None)
+    st.session_state.hub_revisions = {}
+    sync_with_hub()
+    st.session_state.current_date = today_date()
+
+def sync_with_hub():
+    """
+    Enlaza la sesión con los datasets del hub (historial recién llegado o
+    recargado) y descarta las vistas derivadas de lo que cambiaron otras
+    sesiones. Barato si no cambió nada.
+    """
+    hub = current_hub()
+    hub.collect()
+    # Cambio de día de juego pendiente (si el planificador no lo hizo ya)
+    hub.agenda()
+    datasets, revisions = hub.snapshot()
+    seen = st.session_state.setdefault("hub_revisions", {})
+    changed = []
+    for key, dataset in datasets.items():
+        if st.session_state.get(key) is not dataset:
+            st.session_state[key] = dataset
+        if seen.get(key) != revisions[key]:
+            seen[key] = revisions[key]
+            changed.append(key)
+    if changed:
+        invalidate_derived(*changed)
+
+def invalidate_derived(*keys: str):
+    """Descarta lo derivado de datasets que cambiaron fuera de esta sesión"""
+    indexes = st.session_state.get("history_indexes", {})
+    for key in keys:
+        indexes.pop(key, None)
+    if "rewards" in keys:
+        st.session_state.pop("reward_catalog", None)
+    _bump_local(*keys)
+
+def history_ready(*keys: str) -> bool:
+    return all(key in st.session_state for key in keys)
+
+def history_errors() -> Dict[str, str]:
+    return current_hub().errors()
+
+def retry_history_load():
+    current_hub().retry(get_backend())
+
+def track_memory():
+    """
+    Registra el historial del usuario en el gestor de memoria del proceso y
+    compacta a los usuarios inactivos si se supera el presupuesto.
+    """
+    hub = current_hub()
+    memory = hub.memory
+    with hub.lock:
+        memory.datasets = {key: hub.datasets[key] for key in COLD_KEYS if key in hub.datasets}
+        config = st.session_state["config"]["data"]
+        memory.window_days = config["history_window_days"]
+        memory.reset_time = config["daily_reset_time"]
+        memory.share = config["cache_size_mb"] * MB
+        memory.measure()
+    memory.register_session(st.session_state.session_id, [
+        st.session_state.setdefault("view_cache", OrderedDict()),
+        st.session_state.setdefault("history_indexes", {}),
+        st.session_state.setdefault("history_views", {}),
+    ])
+    manager = get_memory_manager()
+    manager.touch(memory)
+    manager.enforce()
+
+def restore_history(*keys: str, since: date | None = None):
+    """
+    Rehidrata el historial compactado de estos datasets. Con `since`, solo si
+    la parte compactada incluye registros desde esa fecha. Sin `since` la
+    página usa el dataset entero y queda fijado en memoria (UserMemory.pin).
+    """
+    hub = current_hub()
+    hub.memory.last_used = time.monotonic()
+    if since is None:
+        hub.memory.pin(*keys)
+    restored = hub.restore(*keys, since=since)
+    if restored:
+        st.session_state.setdefault("hub_revisions", {}).update(restored)
+        invalidate_derived(*restored)
+
+def load_all_user_data(username: str):
+    """Recarga todos los archivos del usuario para todas sus sesiones."""
+    user_hub(username).reload(get_backend())
+    sync_with_hub()
+
+def save_all_user_data(username: str):
+    """Guarda los datasets cargados; el historial aún en camino no se toca"""
+    user_hub(username).save(get_backend())
+
+# Un backup más grande que esto se arma en disco y no en memoria
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+def export_backup(fmt: str, since: str | None = None) -> bytes:
+    """Backup comprimido del usuario (ver lifegame.backup), generado al pedirlo"""
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as out:
+        current_hub().export(out, fmt, since)
+        out.seek(0)
+        return out.read()
+
+def import_user_backup(f, replace: bool = False, skip_invalid: bool = False, recompute: bool = True) -> Dict:
+    """
+    Importa un backup al usuario de la sesión (ver lifegame.backup) y recarga
+    sus datos en todas sus sesiones. Antes guarda lo pendiente, que la
+    recarga descartaría; después, si se pide, recalcula el perfil desde el
+    historial resultante.
+    """
+    username = st.session_state.username
+    backend = get_backend()
+    hub = user_hub(username)
+    hub.save(backend)
+    report = import_backup(f, backend, replace=replace, target=username, skip_invalid=skip_invalid)
+    if username not in report["written"]:
+        return report
+    load_all_user_data(username)
+    if recompute:
+        with hub.lock:
+            engine.recompute_profile(engine.UserState(username, hub.datasets))
+            write_user_data(username, hub.datasets, ["profile", "attributes"], backend)
+        bump_version("profile", "attributes")
+    return report
+
+# =========================================================
+#  MEMOIZACIÓN DE VISTAS DERIVADAS
+# =========================================================
+
+VIEW_CACHE_SIZE = 256
+
+def bump_version(*keys: str):
+    """
+    Marca datasets como modificados. Todo código que muta un dataset de la
+    sesión debe llamarla para invalidar las vistas derivadas que dependen de él
+    y avisar a las demás sesiones del mismo usuario.
+    """
+    _bump_local(*keys)
+    seen = st.session_state.setdefault("hub_revisions", {})
+    for key, revision in current_hub().publish(*keys).items():
+        if seen.get(key, revision - 1) != revision - 1:
+            # Otra sesión también lo cambió desde el último rerun
+            invalidate_derived(key)
+        seen[key] = revision
+
+def _bump_local(*keys: str):
+    versions = st.session_state.setdefault("data_versions", {})
+    for key in keys:
+        versions[key] = versions.get(key, 0) + 1
+
+def memoized(*datasets: str):
+    """
+    Memoiza una vista derivada por (usuario, función, versiones de los
+    datasets de los que depende, argumentos) en un LRU de la sesión.
+    El resultado es compartido entre reruns: no debe mutarse.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args):
+            versions = st.session_state.setdefault("data_versions", {})
+            cache = st.session_state.setdefault("view_cache", OrderedDict())
+            cache_key = (
+                st.session_state.username,
+                fn.__name__,
+                tuple(versions.get(key, 0) for key in datasets),
+                args,
+            )
+            if cache_key in cache:
+                cache.move_to_end(cache_key)
+                return cache[cache_key]
+            with span(fn.__name__, "view"):
+                result = fn(*args)
+            cache[cache_key] = result
+            if len(cache) > VIEW_CACHE_SIZE:
+                cache.popitem(last=False)
+            return result
+        return wrapper
+    return decorator
+
+# =========================================================
+#  VISTAS DERIVADAS
+# =========================================================
+
+@memoized("mission_log")
+def completions_by_date() -> Dict[str, Dict[str, Dict]]:
+    return completions_index(st.session_state["mission_log"]["data"])
+
+@memoized("missions", "mission_log")
+def get_missions_for_date(target_date: date) -> List[Dict]:
+    """Misiones activas en una fecha, marcadas como completadas o no"""
+    missions = st.session_state["missions"]["data"]["missions"]
+    day_log = completions_by_date().get(target_date.isoformat(), {})
+    return missions_for_date(missions, day_log, target_date)
+
+def today_date() -> date:
+    """Día de juego actual según la hora de reset del usuario (lifegame.agenda)"""
+    agenda = current_hub().agenda()
+    if agenda is not None:
+        return agenda["date"]
+    return game_day(datetime.now(), st.session_state["config"]["data"]["daily_reset_time"])
+
+@memoized("missions", "mission_log")
+def today_agenda_missions(day: date) -> List[Dict]:
+    return agenda_missions(current_hub().agenda(), completions_by_date().get(day.isoformat(), {}))
+
+def today_missions_ready() -> bool:
+    """Si ya se pueden mostrar las misiones de hoy (con el historial o con los registros recientes)"""
+    return history_ready("mission_log") or current_hub().agenda() is not None
+
+def get_today_missions() -> List[Dict]:
+    """Misiones de la agenda precalculada de hoy, marcadas como completadas o no"""
+    hub = current_hub()
+    agenda = hub.agenda()
+    if agenda is None:
+        return get_missions_for_date(today_date())
+    if not history_ready("mission_log"):
+        # El historial aún no llegó a la sesión: lo de hoy sale de los registros recientes
+        return agenda_missions(agenda, hub.day_log(agenda["date"]))
+    return today_agenda_missions(agenda["date"])
+
+@memoized("calendar")
+def events_by_date() -> Dict[str, List[Dict]]:
+    """Índice {fecha: [eventos ordenados por hora]} del calendario"""
+    return events_index(st.session_state["calendar"]["data"]["events"])
+
+@memoized("missions", "mission_log")
+def projected_token_income(start: date, days: int) -> List[int]:
+    return project_token_income(
+        st.session_state["missions"]["data"]["missions"],
+        st.session_state["mission_log"]["data"],
+        start,
+        days,
+    )
+
+@memoized("mission_log", "journal", "decisions")
+def compute_system_stats() -> Dict[str, Any]:
+    """
+    Estadísticas globales de la pestaña 'Datos y Estadísticas', desde la
+    copia columnar del mission_log que mantiene el hub (ver lifegame.columnar)
+    """
+    stats = column_stats(current_hub().columns(get_backend()))
+    stats["total_journal"] = len(st.session_state["journal"]["data"])
+    stats["total_decisions"] = len(st.session_state["decisions"]["data"])
+    return stats
+
+@memoized("decisions")
+def compute_decision_stats() -> Dict[str, Any]:
+    return decision_stats(st.session_state["decisions"]["data"])
+
+@memoized("missions", "mission_log", "calendar")
+def month_grid_html(year: int, month: int, first_weekday: int, today: date) -> str:
+    """Grilla del mes con los resúmenes de misiones y eventos de cada día"""
+    summaries = month_summaries(year, month, first_weekday, get_missions_for_date, events_by_date())
+    return build_month_grid_html(year, month, summaries, today, first_weekday)
+
+# =========================================================
+#  ACCIONES
+# =========================================================
+
+def complete_mission(mission_id: str, notes: str = "", target_date: date | None = None):
+    """Completa una misión hoy (día de juego) o en `target_date`"""
+    target_date = target_date or today_date()
+    with current_hub().lock:
+        # Otra sesión del mismo usuario pudo haberla completado ya
+        sync_with_hub()
+        if mission_id in completions_by_date().get(target_date.isoformat(), {}):
+            return
+        engine.complete_mission(st.session_state, mission_id, target_date, notes)
+        bump_version("mission_log", "profile", "attributes")
+
+# =========================================================
+#  ÍNDICES DE LA SESIÓN
+# =========================================================
+
+def get_reward_catalog() -> RewardCatalog:
+    """Catálogo de la sesión; se reconstruye si rewards.json fue recargado"""
+    rewards_data = st.session_state["rewards"]["data"]
+    catalog = st.session_state.get("reward_catalog")
+    if catalog is None or catalog.data is not rewards_data:
+        catalog = RewardCatalog(rewards_data)
+        st.session_state.reward_catalog = catalog
+    return catalog
+
+# El índice es del hub: se consulta y modifica con su lock tomado para no
+# recorrer un posting mientras otra sesión lo cambia.
+
+def get_search_index() -> SearchIndex:
+    """Índice del usuario, sincronizado una vez tras cada carga de datos"""
+    restore_history("search_index")
+    hub = current_hub()
+    with hub.lock:
+        index = st.session_state["search_index"]["data"]
+        if not hub.search_synced:
+            # Guardado con estos mismos archivos y sin ediciones desde la carga: ya está al día
+            if hub.search_edited or index.sources != search_sources(st.session_state):
+                index.sync(searchable_documents(st.session_state))
+            hub.search_synced = True
+        return index
+
+def search_documents(query: str, limit: int = 20) -> List[tuple]:
+    """[(score, doc_id, título, fecha, fragmento)] ordenados por relevancia"""
+    index = get_search_index()
+    with current_hub().lock:
+        return [
+            (score, doc_id, *index.doc_meta.get(doc_id, [doc_id, "", ""]))
+            for score, doc_id in index.search(query, limit)
+        ]
+
+def update_search_index(doc: tuple):
+    """Reindexa un documento tras crearlo o editarlo"""
+    hub = current_hub()
+    if hub.search_synced:
+        restore_history("search_index")
+        with hub.lock:
+            st.session_state["search_index"]["data"].add(*doc)
+    else:
+        # Cambio aún sin guardar: las SHA ya no dicen si el índice está al día
+        hub.search_edited = True
+
+def remove_from_search_index(doc_id: str):
+    hub = current_hub()
+    if hub.search_synced:
+        restore_history("search_index")
+        with hub.lock:
+            st.session_state["search_index"]["data"].remove(doc_id)
+    else:
+        hub.search_edited = True
+
+def get_history_index(key: str, sort_field: str) -> HistoryIndex:
+    """Índice de la sesión para un dataset JSONL; se reconstruye tras recargar"""
+    records = st.session_state[key]["data"]
+    indexes = st.session_state.setdefault("history_indexes", {})
+    index = indexes.get(key)
+    if index is None or index.records is not records or index.indexed > len(records):
+        index = HistoryIndex(records, sort_field)
+        indexes[key] = index
+    elif index.indexed < len(records):
+        index.refresh()
+    return index
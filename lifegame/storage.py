@@ -0,0 +1,558 @@
+"""
+Persistencia de los datos de cada usuario en data/<usuario>/<archivo>.
+
+El backend por defecto es GitHub (Contents API): el repo configurado o, con
+varios shards, el repo@rama que le toca a cada usuario (lifegame.sharding). Con
+la variable de entorno LIFEGAME_DATA_DIR se usa un directorio local con la
+misma estructura, útil para la CLI y para trabajar sin red. Este módulo no
+importa Streamlit: dentro de la app lee `st.secrets` solo si no hay
+variables de entorno.
+"""
+
+import base64
+import contextvars
+import copy
+import hashlib
+import json
+import logging
+import os
+import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+
+from lifegame.defaults import (
+    DEFAULT_ATTRIBUTES,
+    DEFAULT_CALENDAR,
+    DEFAULT_CONFIG,
+    DEFAULT_MISSIONS,
+    DEFAULT_PROFILE,
+    DEFAULT_REWARDS,
+    USER_FILES,
+)
+from lifegame.metrics import observe_github
+from lifegame.profiling import record_request, traced
+from lifegame.scheduler import SCHEDULER, SYSTEM_USER
+from lifegame.schema import upgrade_dataset
+from lifegame.sharding import Shard, hash_ring, parse_shards
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA = {
+    "profile.json": DEFAULT_PROFILE,
+    "config.json": DEFAULT_CONFIG,
+    "attributes.json": DEFAULT_ATTRIBUTES,
+    "missions.json": DEFAULT_MISSIONS,
+    "calendar.json": DEFAULT_CALENDAR,
+    "rewards.json": DEFAULT_REWARDS,
+}
+
+def report_error(message: str):
+    """Muestra el error en la app si hay una sesión de Streamlit; si no, lo registra"""
+    try:
+        from streamlit.runtime import exists
+    except ImportError:
+        exists = None
+    if exists is not None and exists():
+        import streamlit as st
+        st.error(message)
+    else:
+        logger.error(message)
+
+# =========================================================
+#  GITHUB HELPERS (REPOS O RAMAS POR SHARD)
+# =========================================================
+
+# LIFEGAME_API_BASE apunta a otro servidor, p. ej. lifegame.mockgithub
+API_BASE = os.environ.get("LIFEGAME_API_BASE", "https://api.github.com").rstrip("/")
+
+def github_settings() -> Dict:
+    """
+    Token, repo y shards: LIFEGAME_GITHUB_TOKEN/LIFEGAME_GITHUB_REPO/
+    LIFEGAME_GITHUB_SHARDS o st.secrets["github"]. Sin shards configurados
+    todo vive en <repo>@main, como antes.
+    """
+    token = os.environ.get("LIFEGAME_GITHUB_TOKEN")
+    repo = os.environ.get("LIFEGAME_GITHUB_REPO")
+    if token and repo:
+        shards = os.environ.get("LIFEGAME_GITHUB_SHARDS") or repo
+        return {"token": token, "repo": repo, "shards": parse_shards(shards)}
+    import streamlit as st
+    github = st.secrets["github"]
+    shards = github.get("shards") or github["repo"]
+    return {"token": github["token"], "repo": github["repo"], "shards": parse_shards(shards)}
+
+def github_headers():
+    return {
+        "Authorization": f"Bearer {github_settings()['token']}",
+        "Accept": "application/vnd.github+json",
+    }
+
+def github_repo():
+    return github_settings()["repo"]
+
+def github_shards() -> List[Shard]:
+    return github_settings()["shards"]
+
+def user_shard(username: str) -> Shard:
+    """Shard donde vive data/<username>/ según el anillo de hashing"""
+    return hash_ring(tuple(github_shards())).shard_for(username)
+
+def contents_url(shard: Shard, path: str) -> str:
+    return f"{API_BASE}/repos/{shard.repo}/contents/{path}"
+
+def github_request(method: str, url: str, user: str = SYSTEM_USER, **kwargs) -> requests.Response:
+    """
+    Toda petición a la API de GitHub pasa por aquí: espera turno en
+    lifegame.scheduler (en la cola de `user`) y se registra en
+    lifegame.profiling y lifegame.metrics.
+    """
+    wait = SCHEDULER.acquire(method, user)
+    started = time.perf_counter()
+    # El turno se devuelve una sola vez pase lo que pase (también si falla
+    # github_headers o cualquier otra excepción que no sea de requests)
+    status, headers = 0, None
+    try:
+        r = requests.request(method, url, headers=github_headers(), **kwargs)
+        status, headers = r.status_code, r.headers
+    except requests.RequestException:
+        observe_github(method, 0, time.perf_counter() - started, 0, wait=wait)
+        raise
+    finally:
+        SCHEDULER.release(status, headers)
+    sent = len(r.request.body or b"")
+    record_request(method, url, r.status_code, sent + len(r.content), started)
+    observe_github(method, r.status_code, time.perf_counter() - started, sent + len(r.content), r.headers, wait)
+    return r
+
+def github_exists(path: str, shard: Shard, user: str = SYSTEM_USER) -> bool:
+    """
+    Verifica si un archivo o carpeta existe en el shard.
+    path es relativo al root del repo, ej: 'data', 'data/leo/profile.json'
+    """
+    r = github_request("GET", contents_url(shard, path), user, params={"ref": shard.branch})
+    return r.status_code == 200
+
+def github_create_file(path: str, message: str, content: str, shard: Shard, user: str = SYSTEM_USER) -> bool:
+    """
+    Crea un archivo en el shard (crea carpetas implícitamente).
+    """
+    payload = {
+        "message": message,
+        "content": base64.b64encode(content.encode()).decode(),
+        "branch": shard.branch,
+    }
+    r = github_request("PUT", contents_url(shard, path), user, json=payload)
+    return r.status_code in (200, 201)
+
+def github_get(user: str, filename: str, shard: Shard | None = None):
+    """
+    Lee archivo desde GitHub, dentro de data/<user>/<filename> de su shard.
+    Devuelve (content_str, sha) o (None, None) si no existe.
+    """
+    shard = shard or user_shard(user)
+    path = f"data/{user}/{filename}"
+    r = github_request("GET", contents_url(shard, path), user, params={"ref": shard.branch})
+    if r.status_code == 200:
+        data = r.json()
+        content = base64.b64decode(data["content"]).decode("utf-8")
+        sha = data.get("sha")
+        return content, sha
+    return None, None
+
+def github_put(user: str, filename: str, content_str: str, sha: str | None, shard: Shard | None = None):
+    """
+    Escribe archivo en GitHub (update o create) en el shard del usuario.
+    Devuelve nueva SHA o None si falla.
+    """
+    shard = shard or user_shard(user)
+    path = f"data/{user}/{filename}"
+
+    payload = {
+        "message": f"Update {filename}",
+        "content": base64.b64encode(content_str.encode()).decode(),
+        "branch": shard.branch,
+    }
+    if sha:
+        payload["sha"] = sha
+
+    r = github_request("PUT", contents_url(shard, path), user, json=payload)
+    if r.status_code in (200, 201):
+        body = r.json()
+        new_sha = body["content"]["sha"]
+        return new_sha
+    else:
+        report_error(f"Error al subir {filename}: {r.status_code} - {r.text}")
+        return None
+
+def github_delete(path: str, sha: str, message: str, shard: Shard, user: str = SYSTEM_USER) -> bool:
+    payload = {"message": message, "sha": sha, "branch": shard.branch}
+    r = github_request("DELETE", contents_url(shard, path), user, json=payload)
+    if r.status_code != 200:
+        report_error(f"Error al borrar {path} en {shard}: {r.status_code} - {r.text}")
+        return False
+    return True
+
+def github_list_dir(path: str, shard: Shard, user: str = SYSTEM_USER) -> List[Dict] | None:
+    """Entradas de una carpeta del shard, o None si no existe"""
+    r = github_request("GET", contents_url(shard, path), user, params={"ref": shard.branch})
+    if r.status_code != 200:
+        return None
+    return r.json()
+
+def github_list_users(shard: Shard | None = None) -> List[str]:
+    """Usuarios con carpeta en data/ de un shard, o de todos"""
+    shards = [shard] if shard else github_shards()
+    users = set()
+    for item in shards:
+        entries = github_list_dir("data", item) or []
+        users.update(entry["name"] for entry in entries if entry["type"] == "dir")
+    return sorted(users)
+
+def github_ensure_branch(shard: Shard, user: str = SYSTEM_USER) -> bool:
+    """
+    Crea la rama del shard si todavía no existe. Es una rama huérfana con
+    solo data/.keep: si partiera de main heredaría los usuarios de main.
+    """
+    git = f"{API_BASE}/repos/{shard.repo}/git"
+    if github_request("GET", f"{git}/ref/heads/{shard.branch}", user).status_code == 200:
+        return True
+    tree = [{"path": "data/.keep", "mode": "100644", "type": "blob", "content": ""}]
+    r = github_request("POST", f"{git}/trees", user, json={"tree": tree})
+    if r.status_code == 201:
+        commit = {"message": f"Init shard {shard}", "tree": r.json()["sha"], "parents": []}
+        r = github_request("POST", f"{git}/commits", user, json=commit)
+    if r.status_code == 201:
+        payload = {"ref": f"refs/heads/{shard.branch}", "sha": r.json()["sha"]}
+        r = github_request("POST", f"{git}/refs", user, json=payload)
+    # 422 al crear la ref: otra sesión la creó entre medias
+    if r.status_code not in (201, 422):
+        report_error(f"No se pudo crear la rama {shard}: {r.status_code} - {r.text}")
+        return False
+    return True
+
+def github_commit_files(username: str, files: Iterable[Tuple[str, str]], message: str, shard: Shard | None = None) -> bool:
+    """
+    Escribe varios archivos de data/<username>/ en un solo commit (Git Data
+    API). Los blobs se suben a medida que `files` los produce, de a uno; la
+    rama solo se mueve al final y como fast-forward, así que si otro guardado
+    la avanzó entre medias no cambia nada y se devuelve False. Crea la rama
+    del shard si falta.
+    """
+    shard = shard or user_shard(username)
+    git = f"{API_BASE}/repos/{shard.repo}/git"
+    r = github_request("GET", f"{git}/ref/heads/{shard.branch}", username)
+    if r.status_code == 404 and github_ensure_branch(shard, username):
+        r = github_request("GET", f"{git}/ref/heads/{shard.branch}", username)
+    if r.status_code == 200:
+        head = r.json()["object"]["sha"]
+        r = github_request("GET", f"{git}/commits/{head}", username)
+    if r.status_code != 200:
+        report_error(f"No se pudo leer la rama {shard}: {r.status_code} - {r.text}")
+        return False
+    base_tree = r.json()["tree"]["sha"]
+
+    tree = []
+    for fname, content in files:
+        payload = {"content": base64.b64encode(content.encode("utf-8")).decode(), "encoding": "base64"}
+        r = github_request("POST", f"{git}/blobs", username, json=payload)
+        if r.status_code != 201:
+            report_error(f"Error al subir {fname}: {r.status_code} - {r.text}")
+            return False
+        tree.append({"path": f"data/{username}/{fname}", "mode": "100644", "type": "blob", "sha": r.json()["sha"]})
+
+    r = github_request("POST", f"{git}/trees", username, json={"base_tree": base_tree, "tree": tree})
+    if r.status_code == 201:
+        commit = {"message": message, "tree": r.json()["sha"], "parents": [head]}
+        r = github_request("POST", f"{git}/commits", username, json=commit)
+    if r.status_code == 201:
+        r = github_request("PATCH", f"{git}/refs/heads/{shard.branch}", username, json={"sha": r.json()["sha"]})
+    if r.status_code != 200:
+        report_error(f"No se pudo escribir el commit en {shard}: {r.status_code} - {r.text}")
+        return False
+    return True
+
+# =========================================================
+#  MIGRACIÓN ENTRE SHARDS
+# =========================================================
+
+def migrate_user(username: str, source: Shard, target: Shard, overwrite: bool = False) -> bool:
+    """
+    Copia data/<username>/ de `source` a `target`, relee la copia y solo
+    entonces borra el origen. Los archivos que ya están iguales en el destino
+    (una migración interrumpida) se saltan; si difieren se aborta salvo con
+    `overwrite`. Una escritura concurrente en el origen cambia su SHA y el
+    borrado falla, así que el origen nunca se pierde sin copia.
+    """
+    folder = f"data/{username}"
+    entries = github_list_dir(folder, source, username)
+    if entries is None:
+        return True
+    if not github_ensure_branch(target, username):
+        return False
+
+    copied = {}
+    for fname in sorted(item["name"] for item in entries if item["type"] == "file"):
+        content, sha = github_get(username, fname, source)
+        if content is None:
+            report_error(f"No se pudo leer {folder}/{fname} en {source}")
+            return False
+        current, target_sha = github_get(username, fname, target)
+        if current is not None and current != content and not overwrite:
+            report_error(f"{folder}/{fname} ya existe con otro contenido en {target}")
+            return False
+        if current != content and github_put(username, fname, content, target_sha, target) is None:
+            return False
+        copied[fname] = (content, sha)
+
+    for fname, (content, _) in copied.items():
+        if github_get(username, fname, target)[0] != content:
+            report_error(f"La copia de {folder}/{fname} en {target} no coincide")
+            return False
+    for fname, (_, sha) in copied.items():
+        if not github_delete(f"{folder}/{fname}", sha, f"Move {fname} of {username} to {target}", source, username):
+            return False
+    return True
+
+# =========================================================
+#  CREACIÓN AUTOMÁTICA DE /data Y DATA DEL USUARIO
+# =========================================================
+
+def default_user_files() -> Dict[str, str]:
+    """Contenido inicial de cada archivo de un usuario nuevo"""
+    files = {fname: json.dumps(data, indent=2) for fname, data in DEFAULT_DATA.items()}
+    files.update({fname: "" for fname in USER_FILES if fname.endswith(".jsonl")})
+    return files
+
+def ensure_data_structure(username: str):
+    """
+    Crea en GitHub:
+      - /data/
+      - /data/<username>/
+      - archivos JSON y JSONL base
+    en el shard del usuario si no existen. Para un usuario existente basta un listado de su carpeta.
+    """
+    shard = user_shard(username)
+    user_folder = f"data/{username}"
+    entries = github_list_dir(user_folder, shard, username)
+
+    if entries is None:
+        # 0) rama del shard
+        github_ensure_branch(shard, username)
+
+        # 1) carpeta /data/
+        if not github_exists("data", shard):
+            github_create_file("data/.keep", "Init data folder", "", shard)
+
+        # 2) carpeta /data/<username>/
+        github_create_file(f"{user_folder}/.keep", f"Init folder for {username}", "", shard, username)
+        entries = []
+
+    # 3) archivos base
+    existing = {item["name"] for item in entries}
+    for fname, content in default_user_files().items():
+        if fname not in existing:
+            github_create_file(f"{user_folder}/{fname}", f"Init {fname} for {username}", content, shard, username)
+
+# =========================================================
+#  BACKENDS
+# =========================================================
+
+class GitHubBackend:
+    """data/<usuario>/ en el shard (repo@rama) que le toca a cada usuario"""
+
+    def get(self, user: str, filename: str):
+        return github_get(user, filename)
+
+    def put(self, user: str, filename: str, content: str, sha: str | None):
+        return github_put(user, filename, content, sha)
+
+    def put_files(self, user: str, files: Iterable[Tuple[str, str]], message: str) -> bool:
+        return github_commit_files(user, files, message)
+
+    def file_shas(self, user: str) -> Dict[str, str]:
+        """SHA de cada archivo de data/<user>/ con un solo listado, sin descargarlos"""
+        entries = github_list_dir(f"data/{user}", user_shard(user), user) or []
+        return {entry["name"]: entry["sha"] for entry in entries if entry["type"] == "file"}
+
+    def ensure_user(self, username: str):
+        ensure_data_structure(username)
+
+    def list_users(self) -> List[str]:
+        return github_list_users()
+
+class LocalBackend:
+    """
+    data/<usuario>/ en un directorio local. La SHA es el sha1 del contenido y
+    se valida igual que en GitHub: escribir con una SHA vieja falla.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, user: str, filename: str) -> str:
+        return os.path.join(self.root, user, filename)
+
+    def get(self, user: str, filename: str):
+        path = self._path(user, filename)
+        if not os.path.exists(path):
+            return None, None
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+        return content, hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def put(self, user: str, filename: str, content: str, sha: str | None):
+        _, current_sha = self.get(user, filename)
+        if current_sha and sha != current_sha:
+            report_error(f"Error al subir {filename}: 409 - sha does not match")
+            return None
+        path = self._path(user, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def put_files(self, user: str, files: Iterable[Tuple[str, str]], message: str) -> bool:
+        """Sobrescribe varios archivos (sin commits: `message` se ignora)"""
+        return all([self.put(user, fname, content, self.get(user, fname)[1]) for fname, content in files])
+
+    def file_shas(self, user: str) -> Dict[str, str]:
+        folder = os.path.join(self.root, user)
+        if not os.path.isdir(folder):
+            return {}
+        return {fname: self.get(user, fname)[1] for fname in os.listdir(folder) if os.path.isfile(os.path.join(folder, fname))}
+
+    def ensure_user(self, username: str):
+        for fname, content in default_user_files().items():
+            if not os.path.exists(self._path(username, fname)):
+                self.put(username, fname, content, None)
+
+    def list_users(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name))
+        )
+
+class MemoryBackend:
+    """
+    Archivos en un dict, con las mismas SHAs y validación que LocalBackend.
+    Para benchmarks y pruebas de carga sin disco ni red.
+    """
+
+    def __init__(self):
+        self.files: Dict[tuple, str] = {}
+
+    def get(self, user: str, filename: str):
+        content = self.files.get((user, filename))
+        if content is None:
+            return None, None
+        return content, hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def put(self, user: str, filename: str, content: str, sha: str | None):
+        _, current_sha = self.get(user, filename)
+        if current_sha and sha != current_sha:
+            report_error(f"Error al subir {filename}: 409 - sha does not match")
+            return None
+        self.files[(user, filename)] = content
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def put_files(self, user: str, files: Iterable[Tuple[str, str]], message: str) -> bool:
+        """Sobrescribe varios archivos (sin commits: `message` se ignora)"""
+        return all([self.put(user, fname, content, self.get(user, fname)[1]) for fname, content in files])
+
+    def file_shas(self, user: str) -> Dict[str, str]:
+        return {
+            fname: hashlib.sha1(content.encode("utf-8")).hexdigest()
+            for (owner, fname), content in self.files.items() if owner == user
+        }
+
+    def ensure_user(self, username: str):
+        for fname, content in default_user_files().items():
+            self.files.setdefault((username, fname), content)
+
+    def list_users(self) -> List[str]:
+        return sorted({user for user, _ in self.files})
+
+def get_backend():
+    """Backend configurado: LIFEGAME_DATA_DIR (local) o GitHub"""
+    data_dir = os.environ.get("LIFEGAME_DATA_DIR")
+    if data_dir:
+        return LocalBackend(data_dir)
+    return GitHubBackend()
+
+# =========================================================
+#  LOAD & SAVE DATA
+# =========================================================
+
+def parse_user_file(fname: str, content: str | None):
+    """
+    Convierte el contenido de un archivo en su estructura de datos, con los
+    registros de versiones anteriores ya migrados (ver lifegame.schema); el
+    archivo queda al día en el siguiente guardado.
+    """
+    if fname.endswith(".jsonl"):
+        if not content:
+            return []
+        data = [json.loads(line) for line in content.splitlines() if line.strip()]
+    elif content:
+        data = json.loads(content)
+    else:
+        # fallback (no debería pasar, porque ensure_data_structure ya los crea)
+        data = copy.deepcopy(DEFAULT_DATA[fname])
+    upgrade_dataset(USER_FILES.get(fname), data)
+    return data
+
+def serialize_user_file(fname: str, data) -> str:
+    if fname.endswith(".jsonl"):
+        return "\n".join(json.dumps(item) for item in data)
+    return json.dumps(data, indent=2)
+
+def read_user_file(username: str, fname: str, backend=None) -> Dict:
+    """Lee un archivo del usuario como {"data": ..., "sha": ...}"""
+    backend = backend or get_backend()
+    content, sha = backend.get(username, fname)
+    return {"data": parse_user_file(fname, content), "sha": sha}
+
+@traced("storage")
+def read_user_data(username: str, backend=None, keys: List[str] | None = None) -> Dict[str, Dict]:
+    """
+    Lee los archivos indicados (por defecto todos) en paralelo:
+    {clave: {"data": ..., "sha": ...}}
+    """
+    backend = backend or get_backend()
+    files = {key: fname for fname, key in USER_FILES.items() if keys is None or key in keys}
+    with ThreadPoolExecutor(max_workers=len(files) or 1) as pool:
+        # Cada hilo con una copia del contexto para que la traza del rerun vea sus peticiones
+        futures = {
+            key: pool.submit(contextvars.copy_context().run, read_user_file, username, fname, backend)
+            for key, fname in files.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+def write_user_file(username: str, fname: str, dataset: Dict, backend=None) -> bool:
+    """
+    Escribe un dataset y actualiza su SHA; devuelve False si falla. Si parte
+    del historial está compactado en memoria (ver lifegame.memory) se escribe
+    delante de los registros vivos sin descomprimirlo a dicts.
+    """
+    backend = backend or get_backend()
+    content = serialize_user_file(fname, dataset["data"])
+    archive = dataset.get("archive")
+    if archive is not None:
+        content = archive.text() + ("\n" + content if content else "")
+    new_sha = backend.put(username, fname, content, dataset["sha"])
+    if new_sha:
+        dataset["sha"] = new_sha
+    return bool(new_sha)
+
+@traced("storage")
+def write_user_data(username: str, datasets, keys: List[str] | None = None, backend=None) -> bool:
+    """Escribe los datasets indicados (por defecto todos); devuelve False si alguno falla"""
+    backend = backend or get_backend()
+    ok = True
+    for fname, key in USER_FILES.items():
+        if keys is None or key in keys:
+            ok = write_user_file(username, fname, datasets[key], backend) and ok
+    return ok
@@ -0,0 +1,243 @@
+"""Componentes de interfaz compartidos entre páginas."""
+
+import os
+import streamlit as st
+import streamlit.components.v1 as components
+from collections import deque
+
+from lifegame.engine import HISTORY_PAGE_SIZE
+from lifegame.profiling import Trace
+from lifegame.render import build_timeline_html
+from lifegame.state import (
+    get_history_index,
+    get_today_missions,
+    history_errors,
+    history_ready,
+    load_hot_user_data,
+    retry_history_load,
+    sync_with_hub,
+    today_date,
+    today_missions_ready,
+)
+from lifegame.storage import get_backend
+
+# =========================================================
+#  CSS MINIMALISTA
+# =========================================================
+
+def inject_css():
+    """CSS minimalista blanco/negro"""
+    st.markdown(
+        """
+        <style>
+        body { background-color: #FFF; }
+        .stButton>button {
+            border:1px solid #000;
+            background:#FFF;
+            color:#000;
+            border-radius:4px;
+            padding:0.4rem 1rem;
+            transition:0.2s;
+        }
+        .stButton>button:hover {
+            background:#000;
+            color:#FFF;
+        }
+        input, textarea, select {
+            border:1px solid #000 !important;
+            border-radius:4px !important;
+        }
+        .mission-daily { border-left: 4px solid #4CAF50; padding-left: 10px; margin: 5px 0; }
+        .mission-weekly { border-left: 4px solid #2196F3; padding-left: 10px; margin: 5px 0; }
+        .mission-monthly { border-left: 4px solid #FF9800; padding-left: 10px; margin: 5px 0; }
+        .mission-epic { border-left: 4px solid #9C27B0; padding-left: 10px; margin: 5px 0; }
+        .mission-completed { text-decoration: line-through; color: #888; }
+        .attribute-card { border: 1px solid #ddd; padding: 10px; margin: 5px 0; border-radius: 5px; }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+# =========================================================
+#  AUTENTICACIÓN
+# =========================================================
+
+def get_valid_users():
+    if "auth" not in st.secrets:
+        return {"demo": "demo"}
+    return {k: str(st.secrets["auth"][k]) for k in st.secrets["auth"]}
+
+def login_screen():
+    st.title("LifeGame Theory")
+    st.subheader("Acceso")
+
+    users = get_valid_users()
+    username = st.text_input("Usuario")
+    password = st.text_input("Contraseña", type="password")
+
+    if st.button("Entrar"):
+        if username in users and users[username] == password:
+            st.session_state.authenticated = True
+            st.session_state.username = username
+
+            # crear /data y archivos base si no existen
+            get_backend().ensure_user(username)
+            # cargar perfil y configuración; el historial llega en segundo plano
+            load_hot_user_data(username)
+
+            st.rerun()
+        else:
+            st.error("Usuario o contraseña incorrectos")
+
+# =========================================================
+#  SIDEBAR
+# =========================================================
+
+def render_sidebar_status():
+    """Nivel, XP y tokens en el sidebar; se puede llamar desde un fragment"""
+    slot = st.session_state.get("sidebar_status")
+    if slot is None:
+        return
+    profile = st.session_state["profile"]["data"]
+    with slot.container():
+        st.write(f"**Nivel {profile['current_level']}**")
+        st.write(f"XP: {profile['current_xp']}/{profile['xp_base_per_level']}")
+        st.write(f"Tokens: {profile['total_tokens']}")
+        if today_missions_ready():
+            today_missions = get_today_missions()
+            completed = sum(1 for m in today_missions if m.get("completed"))
+            st.write(f"Hoy: {completed}/{len(today_missions)} misiones")
+
+# Cada cuánto una sesión abierta mira si cambió el día de juego
+AGENDA_POLL_SECONDS = 60
+
+@st.fragment(run_every=AGENDA_POLL_SECONDS)
+def agenda_watch():
+    """Rerun completo cuando pasa la hora de reset con la sesión abierta"""
+    day = today_date()
+    if st.session_state.setdefault("agenda_day", day) != day:
+        st.session_state.agenda_day = day
+        st.session_state.current_date = day
+        st.rerun()
+
+# =========================================================
+#  COMPONENTES
+# =========================================================
+
+def get_mission_class(mission_type: str) -> str:
+    """Devuelve la clase CSS para el tipo de misión"""
+    type_classes = {
+        "daily": "mission-daily",
+        "weekly": "mission-weekly",
+        "monthly": "mission-monthly",
+        "epic": "mission-epic"
+    }
+    return type_classes.get(mission_type, "mission-daily")
+
+def render_history_page(key: str, sort_field: str, render_entry, empty_message: str, page_size: int = HISTORY_PAGE_SIZE):
+    """
+    Lista paginada (más reciente primero) con botón 'Cargar más'. Los
+    registros ya mostrados se guardan en la sesión: cada página nueva solo
+    materializa los suyos y los agregados después se ponen arriba.
+    """
+    index = get_history_index(key, sort_field)
+    views = st.session_state.setdefault("history_views", {})
+    view = views.get(key)
+    if view is None or view["index"] is not index or view["out_of_order"] != index.out_of_order:
+        entries, cursor, has_more = index.newest_first(None, page_size)
+        view = views[key] = {
+            "index": index,
+            "out_of_order": index.out_of_order,
+            "entries": entries,
+            "newest": index.newest_key(),
+            "cursor": cursor,
+            "has_more": has_more,
+        }
+    elif index.newest_key() != view["newest"]:
+        view["entries"][:0] = index.newer_than(view["newest"])
+        view["newest"] = index.newest_key()
+    
+    if not view["entries"]:
+        st.info(empty_message)
+        return
+    
+    for entry in view["entries"]:
+        render_entry(entry)
+    
+    if view["has_more"] and st.button("Cargar más", key=f"more_{key}"):
+        older, view["cursor"], view["has_more"] = index.newest_first(view["cursor"], page_size)
+        view["entries"].extend(older)
+        st.rerun()
+
+HISTORY_POLL_SECONDS = 1
+
+def wait_for_history(*keys: str) -> bool:
+    """True si los datasets ya están en la sesión; si no, muestra un aviso de carga"""
+    if history_ready(*keys):
+        return True
+    history_loading_notice(keys)
+    return False
+
+@st.fragment(run_every=HISTORY_POLL_SECONDS)
+def history_loading_notice(keys):
+    """Se refresca solo hasta que llega el historial y entonces rerenderiza la app"""
+    sync_with_hub()
+    if history_ready(*keys):
+        st.rerun()
+    
+    errors = history_errors()
+    if any(key in errors for key in keys):
+        st.error(f"No se pudo cargar el historial: {'; '.join(errors.values())}")
+        if st.button("Reintentar", key=f"retry_history_{'_'.join(keys)}"):
+            retry_history_load()
+            st.rerun(scope="fragment")
+    else:
+        st.info("⏳ Cargando historial...")
+
+# =========================================================
+#  MODO DEBUG
+# =========================================================
+
+DEBUG_HISTORY = 20
+
+def render_debug_panel(trace: Trace):
+    """Timeline del rerun, tiempos agregados y peticiones a GitHub"""
+    summary = trace.summary()
+    history = st.session_state.setdefault("debug_traces", deque(maxlen=DEBUG_HISTORY))
+    history.append(summary)
+    
+    title = (
+        f"🐞 Perfil del rerun · {summary['ms']} ms · {summary['github_calls']} llamadas a GitHub "
+        f"({summary['github_kb']} KB, {summary['github_ms']} ms)"
+    )
+    with st.expander(title):
+        st.markdown(build_timeline_html(trace.spans, trace.requests, trace.duration_ms), unsafe_allow_html=True)
+        
+        totals = {}
+        for s in trace.spans:
+            row = totals.setdefault((s["category"], s["name"]), {"categoría": s["category"], "función": s["name"], "llamadas": 0, "ms": 0.0})
+            row["llamadas"] += 1
+            row["ms"] += s["ms"]
+        st.write("**Tiempo por función**")
+        st.dataframe(
+            sorted(({**row, "ms": round(row["ms"], 1)} for row in totals.values()), key=lambda row: -row["ms"]),
+            use_container_width=True,
+        )
+        
+        if trace.requests:
+            st.write("**Peticiones a GitHub**")
+            st.dataframe(
+                [
+                    {"método": r["method"], "ruta": r["path"], "estado": r["status"], "KB": round(r["bytes"] / 1024, 1), "ms": round(r["ms"], 1)}
+                    for r in trace.requests
+                ],
+                use_container_width=True,
+            )
+        
+        st.write("**Últimos reruns**")
+        st.dataframe(list(reversed(history)), use_container_width=True)
+
+calendar_grid = components.declare_component(
+    "calendar_grid",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "calendar_grid"),
+)
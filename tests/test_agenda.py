@@ -0,0 +1,135 @@
+"""Día de juego, cambio de día y agenda (lifegame.agenda)."""
+
+import copy
+from datetime import date, datetime, timedelta
+
+from lifegame.agenda import carried_over, close_days, game_day, next_reset, read_recent_log, roll_over
+from lifegame.engine import complete_mission, UserState
+from lifegame.hub import HOT_KEYS, UserHub
+from lifegame.storage import MemoryBackend, read_user_data
+
+USER = "ana"
+MONDAY = date(2024, 1, 1)
+
+def mission(mission_id: str, mission_type: str = "daily", recurrence: str = "everyday", end_date: str | None = None) -> dict:
+    return {
+        "id": mission_id, "type": mission_type, "recurrence": recurrence,
+        "start_date": "2023-12-01", "end_date": end_date,
+    }
+
+def done(mission_id: str, day: date) -> dict:
+    return {"mission_id": mission_id, "date": day.isoformat(), "status": "completed"}
+
+def user_state(missions: list, log: list, agenda: dict | None, streak: int = 0, last_active: str | None = None) -> dict:
+    profile = {"streak_days": streak, "last_active_date": last_active, "agenda": agenda}
+    return {
+        "profile": {"data": profile},
+        "missions": {"data": {"missions": missions}},
+        "mission_log": {"data": log},
+    }
+
+def test_game_day_changes_at_the_reset_hour():
+    assert game_day(datetime(2024, 1, 2, 5, 59), "06:00") == date(2024, 1, 1)
+    assert game_day(datetime(2024, 1, 2, 6, 0), "06:00") == date(2024, 1, 2)
+    assert game_day(datetime(2024, 1, 2, 23, 0), "23:30") == date(2024, 1, 1)
+
+def test_next_reset_is_strictly_after_now():
+    assert next_reset(datetime(2024, 1, 2, 5, 0), "06:00") == datetime(2024, 1, 2, 6, 0)
+    assert next_reset(datetime(2024, 1, 2, 6, 0), "06:00") == datetime(2024, 1, 3, 6, 0)
+    assert next_reset(datetime(2024, 1, 2, 23, 45), "23:30") == datetime(2024, 1, 3, 23, 30)
+
+def test_close_days_over_a_gap_ends_the_streak():
+    profile = {"streak_days": 3, "last_active_date": (MONDAY - timedelta(days=1)).isoformat()}
+    completions = {MONDAY.isoformat(): {"m": done("m", MONDAY)}, "2024-01-02": {"m": done("m", date(2024, 1, 2))}}
+
+    assert close_days(profile, completions, MONDAY, date(2024, 1, 3)) == (5, "2024-01-02")
+    assert close_days(profile, completions, MONDAY, date(2024, 1, 5)) == (0, "2024-01-02")
+
+def test_unfinished_weekly_mission_is_carried_until_completed():
+    missions = [mission("daily"), mission("weekly", "weekly", "monday")]
+    previous = {"date": MONDAY.isoformat(), "carried_over": []}
+
+    assert carried_over(missions, {}, previous, date(2024, 1, 2)) == ["weekly"]
+    carried = {"date": "2024-01-02", "carried_over": ["weekly"]}
+    assert carried_over(missions, {}, carried, date(2024, 1, 3)) == ["weekly"]
+    completions = {"2024-01-02": {"weekly": done("weekly", date(2024, 1, 2))}}
+    assert carried_over(missions, completions, carried, date(2024, 1, 3)) == []
+
+def test_carried_mission_is_dropped_after_its_end_date():
+    missions = [mission("weekly", "weekly", "monday", end_date="2024-01-02")]
+    previous = {"date": "2024-01-02", "carried_over": ["weekly"]}
+
+    assert carried_over(missions, {}, previous, date(2024, 1, 3)) == []
+
+def test_roll_over_closes_every_day_since_the_previous_agenda():
+    missions = [mission("daily"), mission("weekly", "weekly", "monday")]
+    log = [done("daily", MONDAY), done("daily", date(2024, 1, 2))]
+    state = user_state(missions, log, {"date": MONDAY.isoformat(), "carried_over": []}, streak=2, last_active="2023-12-31")
+
+    assert roll_over(state, date(2024, 1, 3))
+
+    profile = state["profile"]["data"]
+    assert (profile["streak_days"], profile["last_active_date"]) == (4, "2024-01-02")
+    assert profile["agenda"] == {"date": "2024-01-03", "carried_over": ["weekly"]}
+
+def test_roll_over_twice_on_the_same_day_changes_nothing():
+    state = user_state([mission("weekly", "weekly", "monday")], [], {"date": MONDAY.isoformat(), "carried_over": []})
+    assert roll_over(state, date(2024, 1, 4))
+    before = copy.deepcopy(state)
+
+    assert not roll_over(state, date(2024, 1, 4))
+    assert state == before
+
+def test_hub_rolls_over_at_a_reset_hour_that_is_not_midnight():
+    backend = MemoryBackend()
+    backend.ensure_user(USER)
+    hub = UserHub(USER)
+    hub.datasets = read_user_data(USER, backend)
+    hub.datasets["config"]["data"]["daily_reset_time"] = "04:30"
+
+    assert hub.agenda(datetime(2024, 1, 2, 4, 29))["date"] == MONDAY
+    assert hub.next_reset == datetime(2024, 1, 2, 4, 30)
+    assert hub.agenda(datetime(2024, 1, 2, 4, 30))["date"] == date(2024, 1, 2)
+    assert hub.datasets["profile"]["data"]["agenda"]["date"] == "2024-01-02"
+
+def saved_user(backend: MemoryBackend, now: datetime) -> UserHub:
+    """Usuario con la misión por defecto completada hoy y guardado"""
+    backend.ensure_user(USER)
+    hub = UserHub(USER)
+    hub.datasets = read_user_data(USER, backend)
+    hub.agenda(now)
+    day = game_day(now, hub.datasets["config"]["data"]["daily_reset_time"])
+    complete_mission(UserState(USER, hub.datasets), "m_daily_routine", day)
+    assert hub.save(backend)
+    return hub
+
+def hot_hub(backend: MemoryBackend) -> UserHub:
+    """Sesión nueva con los datasets calientes y sin el historial"""
+    hub = UserHub(USER)
+    hub.datasets = read_user_data(USER, backend, HOT_KEYS)
+    hub.recent, _ = read_recent_log(USER, backend)
+    return hub
+
+def test_today_is_served_from_recent_records_before_the_history():
+    backend = MemoryBackend()
+    now = datetime.now()
+    saved_user(backend, now)
+
+    hub = hot_hub(backend)
+    agenda = hub.agenda(now)
+
+    assert "mission_log" not in hub.datasets
+    assert [m["id"] for m in agenda["missions"]] == ["m_daily_routine"]
+    assert hub.day_log(agenda["date"])["m_daily_routine"]["status"] == "completed"
+
+def test_recent_records_of_an_older_log_are_ignored():
+    backend = MemoryBackend()
+    now = datetime.now()
+    saved_user(backend, now)
+    content, sha = backend.get(USER, "mission_log.jsonl")
+    backend.put(USER, "mission_log.jsonl", content + "\n", sha)
+
+    hub = hot_hub(backend)
+
+    assert hub.recent is None
+    assert hub.agenda(now) is None
@@ -0,0 +1,161 @@
+"""Importación de backups (lifegame.backup): fusión, reemplazo, repetidos y validación."""
+
+import io
+import json
+
+import pytest
+
+from lifegame.backup import BACKUP_FORMAT, backend_files, EXPORT_VERSION, import_backup, write_export
+from lifegame.storage import MemoryBackend, parse_user_file, serialize_user_file
+
+USER = "ana"
+
+def log_record(mission_id: str, day: str) -> dict:
+    return {
+        "mission_id": mission_id,
+        "date": day,
+        "status": "completed",
+        "xp_awarded": 10,
+        "tokens_awarded": 1,
+        "timestamp": f"{day}T08:00:00",
+    }
+
+def journal_entry(entry_id: str, day: str, text: str = "") -> dict:
+    return {"id": entry_id, "date": day, "timestamp": f"{day}T21:00:00", "text": text}
+
+def make_user(backend: MemoryBackend, mission_log=(), journal=(), rewards=None):
+    backend.ensure_user(USER)
+    backend.put(USER, "mission_log.jsonl", serialize_user_file("mission_log.jsonl", list(mission_log)), backend.get(USER, "mission_log.jsonl")[1])
+    backend.put(USER, "journal.jsonl", serialize_user_file("journal.jsonl", list(journal)), backend.get(USER, "journal.jsonl")[1])
+    if rewards is not None:
+        backend.put(USER, "rewards.json", serialize_user_file("rewards.json", rewards), backend.get(USER, "rewards.json")[1])
+
+def export(backend: MemoryBackend, fmt: str = "ndjson") -> io.BytesIO:
+    out = io.BytesIO()
+    write_export(out, [(USER, backend_files(USER, backend))], fmt)
+    out.seek(0)
+    return out
+
+def ndjson(*records) -> io.BytesIO:
+    """Backup NDJSON escrito a mano: (clave, datos) por línea, o texto crudo"""
+    lines = [json.dumps({"type": "header", "format": BACKUP_FORMAT, "export_version": EXPORT_VERSION, "since": None})]
+    for item in records:
+        if isinstance(item, str):
+            lines.append(item)
+        else:
+            key, data = item
+            lines.append(json.dumps({"type": "record", "user": USER, "key": key, "data": data}))
+    return io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+
+def read(backend: MemoryBackend, fname: str):
+    return parse_user_file(fname, backend.get(USER, fname)[0])
+
+@pytest.mark.parametrize("fmt", ["zip", "ndjson"])
+def test_merge_keeps_existing_and_adds_new(fmt):
+    source = MemoryBackend()
+    make_user(source, [log_record("m1", "2024-01-01"), log_record("m1", "2024-01-03")])
+    target = MemoryBackend()
+    make_user(target, [log_record("m2", "2024-01-02")])
+
+    report = import_backup(export(source, fmt), target)
+
+    assert report["written"] == [USER]
+    log = read(target, "mission_log.jsonl")
+    # Intercalado por fecha con lo que ya había
+    assert [(r["mission_id"], r["date"]) for r in log] == [("m1", "2024-01-01"), ("m2", "2024-01-02"), ("m1", "2024-01-03")]
+
+def test_replace_drops_what_the_backup_does_not_have():
+    source = MemoryBackend()
+    make_user(source, [log_record("m1", "2024-01-01")])
+    target = MemoryBackend()
+    make_user(target, [log_record("m2", "2024-01-02")], [journal_entry("j1", "2024-01-02")])
+
+    report = import_backup(export(source), target, replace=True)
+
+    assert report["written"] == [USER]
+    assert [r["mission_id"] for r in read(target, "mission_log.jsonl")] == ["m1"]
+    assert read(target, "journal.jsonl") == []
+
+def test_merge_of_json_files_adds_items_by_id():
+    rewards = {"rewards": [{"id": "r1", "name": "Cine", "cost_tokens": 5}], "redemptions": []}
+    source = MemoryBackend()
+    make_user(source, rewards={"rewards": [{"id": "r1", "name": "Otro nombre", "cost_tokens": 9}, {"id": "r2", "name": "Pizza", "cost_tokens": 8}], "redemptions": []})
+    target = MemoryBackend()
+    make_user(target, rewards=rewards)
+
+    import_backup(export(source), target)
+
+    merged = read(target, "rewards.json")["rewards"]
+    assert [(r["id"], r["name"]) for r in merged] == [("r1", "Cine"), ("r2", "Pizza")]
+
+def test_duplicates_are_counted_inside_the_backup_and_against_existing():
+    target = MemoryBackend()
+    make_user(target, [log_record("m1", "2024-01-01")], [journal_entry("j1", "2024-01-01")])
+    backup = ndjson(
+        ("mission_log", log_record("m1", "2024-01-01")),
+        ("mission_log", log_record("m1", "2024-01-02")),
+        ("mission_log", log_record("m1", "2024-01-02")),
+        ("journal", journal_entry("j1", "2024-01-01", "otra versión")),
+        ("journal", journal_entry("j2", "2024-01-02")),
+    )
+
+    report = import_backup(backup, target)
+
+    counts = report["users"][USER]
+    assert counts["mission_log.jsonl"] == {"imported": 1, "duplicates": 2}
+    assert counts["journal.jsonl"] == {"imported": 1, "duplicates": 1}
+    assert len(read(target, "mission_log.jsonl")) == 2
+    # Al fusionar gana lo existente
+    assert read(target, "journal.jsonl")[0]["text"] == ""
+
+def test_invalid_records_block_the_user_unless_skipped():
+    backup = [
+        ("mission_log", log_record("m1", "2024-01-01")),
+        ("mission_log", {"mission_id": "m2", "status": "completed"}),
+        ("journal", journal_entry("j1", "no-es-fecha")),
+        "{roto",
+    ]
+    target = MemoryBackend()
+    make_user(target)
+
+    report = import_backup(ndjson(*backup), target)
+
+    assert report["failed"] == [USER]
+    assert report["invalid"] == 3
+    assert read(target, "mission_log.jsonl") == []
+
+    report = import_backup(ndjson(*backup), target, skip_invalid=True)
+
+    assert report["written"] == [USER]
+    assert [r["mission_id"] for r in read(target, "mission_log.jsonl")] == ["m1"]
+
+def test_dry_run_reports_without_writing():
+    source = MemoryBackend()
+    make_user(source, [log_record("m1", "2024-01-01")])
+    target = MemoryBackend()
+    make_user(target)
+    before = dict(target.files)
+
+    report = import_backup(export(source), target, dry_run=True)
+
+    assert report["users"][USER]["mission_log.jsonl"]["imported"] == 1
+    assert target.files == before
+
+def test_incremental_backup_cannot_replace():
+    source = MemoryBackend()
+    make_user(source, [log_record("m1", "2024-01-01")])
+    out = io.BytesIO()
+    write_export(out, [(USER, backend_files(USER, source))], "ndjson", since="2024-01-01")
+    out.seek(0)
+
+    with pytest.raises(ValueError):
+        import_backup(out, MemoryBackend(), replace=True)
+
+def test_merge_orders_history_that_is_not_in_date_order():
+    target = MemoryBackend()
+    make_user(target, [log_record("m2", "2024-01-04"), log_record("m1", "2024-01-02")])
+
+    import_backup(ndjson(("mission_log", log_record("m3", "2024-01-05")), ("mission_log", log_record("m3", "2024-01-01"))), target)
+
+    log = read(target, "mission_log.jsonl")
+    assert [r["date"] for r in log] == ["2024-01-01", "2024-01-02", "2024-01-04", "2024-01-05"]
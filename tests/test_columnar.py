@@ -0,0 +1,108 @@
+"""Copia columnar del mission_log (lifegame.columnar) contra los registros."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from lifegame import columnar
+from lifegame.columnar import column_stats, COLUMNS_FILE, load_columns, MissionLogColumns
+from lifegame.engine import system_stats
+from lifegame.hub import UserHub
+from lifegame.storage import MemoryBackend, read_user_data, serialize_user_file
+
+USER = "ana"
+
+def random_log(rng: random.Random, n: int) -> list:
+    start = date(2023, 1, 1)
+    log = []
+    for _ in range(n):
+        day = "" if rng.random() < 0.05 else (start + timedelta(days=rng.randint(0, 400))).isoformat()
+        log.append({
+            "mission_id": f"m{rng.randint(0, 6)}",
+            "date": day,
+            "status": rng.choice(["completed", "completed", "skipped"]),
+            "xp_awarded": rng.randint(0, 50),
+            "tokens_awarded": rng.randint(0, 5),
+            "timestamp": day,
+        })
+    return log
+
+@pytest.fixture(params=[True, False], ids=["numpy", "sin-numpy"])
+def numpy_mode(request, monkeypatch):
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar, "np", None)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_column_stats_match_system_stats(seed, numpy_mode):
+    log = random_log(random.Random(seed), 300)
+    state = {"mission_log": {"data": log}, "journal": {"data": []}, "decisions": {"data": []}}
+
+    stats = column_stats(MissionLogColumns.from_records(log))
+
+    expected = system_stats(state)
+    assert stats == {key: expected[key] for key in stats}
+
+def test_text_roundtrip_keeps_every_column():
+    columns = MissionLogColumns.from_records(random_log(random.Random(1), 200), source="abc")
+
+    loaded = MissionLogColumns.from_text(columns.to_text())
+
+    assert (loaded.missions, loaded.statuses, loaded.source) == (columns.missions, columns.statuses, "abc")
+    assert {name: list(col) for name, col in loaded.columns.items()} == {name: list(col) for name, col in columns.columns.items()}
+
+def test_undated_lines_count_but_do_not_make_streaks(numpy_mode):
+    log = [
+        {"mission_id": "m1", "date": "", "status": "completed", "xp_awarded": 5, "tokens_awarded": 1, "timestamp": ""},
+        {"mission_id": "m1", "date": "2024-01-01", "status": "completed", "xp_awarded": 5, "tokens_awarded": 1, "timestamp": "2024-01-01"},
+    ]
+    columns = MissionLogColumns.from_records(log)
+
+    assert column_stats(columns)["total_missions"] == 2
+    assert columnar.completed_days(columns) == [date(2024, 1, 1).toordinal()]
+
+def hub_with_log(backend: MemoryBackend, log: list) -> UserHub:
+    backend.ensure_user(USER)
+    backend.put(USER, "mission_log.jsonl", serialize_user_file("mission_log.jsonl", log), backend.get(USER, "mission_log.jsonl")[1])
+    hub = UserHub(USER)
+    hub.datasets = read_user_data(USER, backend)
+    return hub
+
+def test_save_appends_new_records_and_keeps_the_copy_fresh():
+    backend = MemoryBackend()
+    log = random_log(random.Random(2), 50)
+    hub = hub_with_log(backend, log)
+    columns = hub.columns(backend)
+
+    hub.datasets["mission_log"]["data"].append(dict(log[0], date="2024-06-01", timestamp="2024-06-01"))
+    assert hub.save(backend)
+
+    assert hub.columns(backend) is columns
+    assert len(columns) == 51
+    saved, fresh = load_columns(USER, backend)
+    assert fresh and len(saved) == 51
+
+def test_fresh_copy_is_read_without_downloading_the_log():
+    backend = MemoryBackend()
+    hub = hub_with_log(backend, random_log(random.Random(3), 20))
+    hub.datasets["mission_log"]["data"].pop()
+    hub.save(backend)
+    downloads = []
+    get = backend.get
+    backend.get = lambda user, fname: downloads.append(fname) or get(user, fname)
+
+    columns, fresh = load_columns(USER, backend)
+
+    assert fresh and len(columns) == 19
+    assert downloads == [COLUMNS_FILE]
+
+def test_replaced_log_is_rebuilt():
+    backend = MemoryBackend()
+    hub = hub_with_log(backend, random_log(random.Random(4), 30))
+    hub.columns(backend)
+
+    hub.datasets["mission_log"]["data"] = random_log(random.Random(5), 10)
+
+    assert len(hub.columns(backend)) == 10
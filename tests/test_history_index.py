@@ -0,0 +1,43 @@
+"""Paginación por cursor del historial (engine.HistoryIndex)."""
+
+from lifegame.engine import HistoryIndex
+
+def entry(n: int, day: int) -> dict:
+    return {"id": f"j{n}", "date": f"2024-01-{day:02d}"}
+
+def test_pages_only_return_their_own_records():
+    records = [entry(n, n + 1) for n in range(25)]
+    index = HistoryIndex(records, "date")
+
+    first, cursor, has_more = index.newest_first(None, 10)
+    second, cursor, has_more = index.newest_first(cursor, 10)
+    third, cursor, has_more = index.newest_first(cursor, 10)
+
+    assert [e["id"] for e in first] == [f"j{n}" for n in range(24, 14, -1)]
+    assert [e["id"] for e in second] == [f"j{n}" for n in range(14, 4, -1)]
+    assert [e["id"] for e in third] == [f"j{n}" for n in range(4, -1, -1)]
+    assert not has_more
+
+def test_cursor_is_stable_when_records_are_appended_between_pages():
+    records = [entry(n, n + 1) for n in range(20)]
+    index = HistoryIndex(records, "date")
+    first, cursor, _ = index.newest_first(None, 10)
+    newest = index.newest_key()
+
+    records += [entry(20, 28), entry(21, 29)]
+    index.refresh()
+    second, _, has_more = index.newest_first(cursor, 10)
+
+    assert [e["id"] for e in second] == [f"j{n}" for n in range(9, -1, -1)]
+    assert not has_more
+    assert [e["id"] for e in index.newer_than(newest)] == ["j21", "j20"]
+    assert index.out_of_order == 0
+
+def test_backdated_records_are_flagged():
+    records = [entry(n, n + 1) for n in range(5)]
+    index = HistoryIndex(records, "date")
+
+    records.append(entry(5, 2))
+    index.refresh()
+
+    assert index.out_of_order == 1
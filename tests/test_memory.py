@@ -0,0 +1,48 @@
+"""Presupuesto de memoria del historial (lifegame.memory)."""
+
+import threading
+from datetime import date, timedelta
+
+from lifegame.memory import is_compacted, MemoryManager, restore_dataset, UserMemory
+
+def history(days: int):
+    today = date.today()
+    records = []
+    for n in range(days, 0, -1):
+        day = (today - timedelta(days=n)).isoformat()
+        records.append({"mission_id": "m1", "date": day, "timestamp": day, "status": "completed", "notes": "x" * 50})
+    return {"data": records, "sha": None}
+
+def active_user(manager: MemoryManager) -> UserMemory:
+    user = UserMemory(threading.RLock())
+    user.window_days = 30
+    user.share = 0
+    user.datasets = {"mission_log": history(365), "journal": history(365)}
+    user.measure()
+    manager.touch(user)
+    return user
+
+def test_active_user_over_budget_is_not_compacted_again_after_restoring():
+    manager = MemoryManager(0)
+    user = active_user(manager)
+    mission_log = user.datasets["mission_log"]
+
+    # Rerun 1: se compacta todo y la página (Recompensas) rehidrata el mission_log
+    assert manager.enforce() == 2
+    user.pin("mission_log")
+    restore_dataset("mission_log", mission_log)
+    user.measure()
+
+    # Rerun 2: sigue por encima del presupuesto, pero no hay nada nuevo que compactar
+    assert manager.enforce() == 0
+    assert not is_compacted(mission_log)
+    assert len(mission_log["data"]) == 365
+
+def test_idle_user_is_compacted_even_if_pinned():
+    manager = MemoryManager(0)
+    user = active_user(manager)
+    user.pin("mission_log")
+    user.last_used -= 3600
+
+    assert manager.enforce() == 2
+    assert is_compacted(user.datasets["mission_log"])
@@ -0,0 +1,60 @@
+"""Optimizador de misiones (engine.optimize_mission_portfolio) contra la fuerza bruta en casos chicos."""
+
+import itertools
+import random
+
+import pytest
+
+from lifegame.engine import mission_value, optimize_mission_portfolio
+
+ATTRIBUTES = ["strength", "intelligence", None]
+PRIORITIES = ["low", "medium", "high"]
+
+def random_missions(rng: random.Random, n: int) -> list:
+    return [
+        {
+            "id": f"m{i}",
+            "attribute_id": rng.choice(ATTRIBUTES),
+            "base_xp": rng.randint(1, 50),
+            "priority": rng.choice(PRIORITIES),
+            "time_cost": rng.choice([0, 5, 10, 15, 20, 30, 45, 60, 90]),
+        }
+        for i in range(n)
+    ]
+
+def units(mission: dict, granularity: int) -> int:
+    return -(-mission["time_cost"] // granularity)
+
+def brute_force_portfolio(missions, time_budget, weights, max_share, granularity) -> float:
+    capacity = time_budget // granularity
+    attr_capacity = capacity if max_share >= 1 else min(capacity, int(max_share * time_budget) // granularity)
+    best = 0.0
+    for size in range(len(missions) + 1):
+        for subset in itertools.combinations(missions, size):
+            if sum(units(m, granularity) for m in subset) > capacity:
+                continue
+            per_attribute = {}
+            for m in subset:
+                if m["attribute_id"]:
+                    per_attribute[m["attribute_id"]] = per_attribute.get(m["attribute_id"], 0) + units(m, granularity)
+            if any(used > attr_capacity for used in per_attribute.values()):
+                continue
+            best = max(best, sum(mission_value(m, weights) for m in subset))
+    return best
+
+@pytest.mark.parametrize("seed", range(40))
+def test_mission_portfolio_matches_brute_force(seed):
+    rng = random.Random(seed)
+    missions = random_missions(rng, rng.randint(0, 9))
+    time_budget = rng.choice([0, 30, 60, 90, 120, 180])
+    weights = {"strength": rng.choice([0.5, 1.0, 2.0])}
+    max_share = rng.choice([0.3, 0.5, 1.0])
+    granularity = rng.choice([1, 5, 15])
+
+    result = optimize_mission_portfolio(missions, time_budget, weights, max_share, granularity)
+
+    assert result["total_value"] == pytest.approx(brute_force_portfolio(missions, time_budget, weights, max_share, granularity))
+    selected = result["selected"]
+    assert len({m["id"] for m in selected}) == len(selected)
+    assert sum(units(m, granularity) for m in selected) <= time_budget // granularity
+    assert result["total_minutes"] == sum(m["time_cost"] for m in selected)
@@ -0,0 +1,68 @@
+"""Plan de canjes (engine.plan_reward_redemptions) contra la fuerza bruta en casos chicos."""
+
+import itertools
+import random
+
+import pytest
+
+from lifegame.engine import plan_reward_redemptions
+
+def random_rewards(rng: random.Random, n: int) -> list:
+    rewards = []
+    for i in range(n):
+        reward = {"id": f"r{i}", "cost_tokens": rng.randint(0, 40), "preference": rng.randint(0, 5)}
+        if rng.random() < 0.3:
+            reward["max_copies"] = rng.randint(1, 4)
+        rewards.append(reward)
+    return rewards
+
+def brute_force_redemptions(rewards, budget, max_copies) -> int:
+    options = []
+    for reward in rewards:
+        cost, preference = reward["cost_tokens"], reward["preference"]
+        if cost <= 0 or preference <= 0:
+            options.append([0])
+            continue
+        options.append(range(min(reward.get("max_copies", max_copies), budget // cost) + 1))
+    best = 0
+    for counts in itertools.product(*options):
+        cost = sum(n * r["cost_tokens"] for n, r in zip(counts, rewards))
+        if cost <= budget:
+            best = max(best, sum(n * r["preference"] for n, r in zip(counts, rewards)))
+    return best
+
+@pytest.mark.parametrize("seed", range(40))
+def test_reward_plan_matches_brute_force(seed):
+    rng = random.Random(seed)
+    rewards = random_rewards(rng, rng.randint(0, 5))
+    balance = rng.randint(0, 80)
+    income = [rng.randint(0, 10) for _ in range(rng.randint(0, 5))]
+    max_copies = rng.randint(1, 3)
+
+    result = plan_reward_redemptions(rewards, balance, income, max_copies)
+
+    budget = balance + sum(income)
+    assert result["budget"] == budget
+    assert result["total_preference"] == brute_force_redemptions(rewards, budget, max_copies)
+    by_id = {r["id"]: r for r in rewards}
+    counts = result["counts"]
+    assert all(n <= by_id[rid].get("max_copies", max_copies) for rid, n in counts.items())
+    assert sum(n * by_id[rid]["cost_tokens"] for rid, n in counts.items()) == result["total_cost"] <= budget
+    assert sum(n * by_id[rid]["preference"] for rid, n in counts.items()) == result["total_preference"]
+    assert len(result["schedule"]) == sum(counts.values())
+
+@pytest.mark.parametrize("seed", range(40))
+def test_reward_schedule_never_spends_tokens_not_yet_earned(seed):
+    rng = random.Random(seed)
+    rewards = random_rewards(rng, rng.randint(0, 5))
+    balance = rng.randint(0, 30)
+    income = [rng.randint(0, 10) for _ in range(rng.randint(0, 7))]
+
+    schedule = plan_reward_redemptions(rewards, balance, income)["schedule"]
+
+    offsets = [item["day_offset"] for item in schedule]
+    assert offsets == sorted(offsets)
+    spent = 0
+    for item in schedule:
+        spent += item["reward"]["cost_tokens"]
+        assert spent <= balance + sum(income[:item["day_offset"] + 1])
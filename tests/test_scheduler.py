@@ -0,0 +1,94 @@
+"""Orden y límites del planificador de peticiones (lifegame.scheduler) con un reloj falso."""
+
+import pytest
+
+from lifegame import scheduler
+from lifegame.scheduler import RequestScheduler, Ticket, WRITE_AGING_SECONDS
+
+class FakeClock:
+    """Sustituye al módulo time: monotonic y time avanzan solo con advance"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return 1_700_000_000.0 + self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler, "time", clock)
+    return clock
+
+def enqueue(requests: RequestScheduler, clock: FakeClock, method: str, user: str) -> Ticket:
+    """Deja una petición en cola sin bloquear, como hace acquire"""
+    requests._seq += 1
+    ticket = Ticket(requests._seq, user, method not in scheduler.READ_METHODS, clock.monotonic())
+    requests.pending.append(ticket)
+    return ticket
+
+def test_reads_go_before_earlier_writes(clock):
+    requests = RequestScheduler()
+    enqueue(requests, clock, "PUT", "ana")
+    read = enqueue(requests, clock, "GET", "ana")
+
+    assert requests._next(clock.monotonic()) == (read, 0.0)
+
+def test_write_waiting_past_aging_is_served_before_new_reads(clock):
+    requests = RequestScheduler()
+    write = enqueue(requests, clock, "PUT", "ana")
+    clock.advance(WRITE_AGING_SECONDS + 0.1)
+    enqueue(requests, clock, "GET", "ana")
+
+    assert requests._next(clock.monotonic()) == (write, 0.0)
+
+def test_heavy_user_does_not_starve_others(clock):
+    requests = RequestScheduler()
+    for _ in range(20):
+        requests.acquire("GET", "heavy")
+        requests.release(200)
+        clock.advance(0.01)
+    for _ in range(5):
+        enqueue(requests, clock, "GET", "heavy")
+    light = enqueue(requests, clock, "GET", "light")
+
+    assert requests._next(clock.monotonic()) == (light, 0.0)
+
+def test_exhausted_primary_limit_blocks_until_reset(clock):
+    requests = RequestScheduler()
+    requests.acquire("GET", "ana")
+    requests.release(200, {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(clock.time() + 60),
+    })
+    ticket = enqueue(requests, clock, "GET", "ana")
+
+    assert requests.blocked_until == pytest.approx(clock.monotonic() + 60)
+    assert requests._next(clock.monotonic())[0] is None
+    clock.advance(61)
+    assert requests._next(clock.monotonic())[0] is ticket
+
+def test_retry_after_blocks_every_request(clock):
+    requests = RequestScheduler()
+    requests.acquire("PUT", "ana")
+    requests.release(429, {"Retry-After": "30"})
+    enqueue(requests, clock, "GET", "luis")
+
+    assert requests.blocked_until == clock.monotonic() + 30
+    chosen, wait = requests._next(clock.monotonic())
+    assert chosen is None and 0 < wait <= scheduler.MAX_POLL_SECONDS
+
+def test_rate_limit_header_rescales_primary_bucket(clock):
+    requests = RequestScheduler()
+    requests.acquire("GET")
+    requests.release(200, {"X-RateLimit-Limit": "15000", "X-RateLimit-Remaining": "14000"})
+
+    assert requests.primary.rate == pytest.approx(15000 / 3600)
+    assert requests.primary.capacity == pytest.approx(15000 * scheduler.PRIMARY_BURST_FRACTION)
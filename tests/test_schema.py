@@ -0,0 +1,114 @@
+"""Migraciones de esquema (lifegame.schema) sobre registros de la versión 1."""
+
+import json
+
+from lifegame.defaults import DEFAULT_CONFIG
+from lifegame.metrics import REGISTRY
+from lifegame.schema import SCHEMA_VERSIONS, stamp, upgrade, upgrade_dataset, VERSION_FIELD
+from lifegame.storage import parse_user_file, serialize_user_file
+
+def test_legacy_mission_log_record_is_migrated():
+    record = {"mission_id": "m1", "date": "2024-01-01", "status": "completed"}
+
+    assert upgrade("mission_log", record)
+
+    assert record == {
+        "mission_id": "m1",
+        "date": "2024-01-01",
+        "status": "completed",
+        "xp_awarded": 0,
+        "tokens_awarded": 0,
+        "timestamp": "2024-01-01",
+        "notes": "",
+        VERSION_FIELD: SCHEMA_VERSIONS["mission_log"],
+    }
+
+def test_migration_keeps_existing_fields():
+    entry = {"id": "j1", "date": "2024-01-01", "text": "Hola", "mood": "😢"}
+
+    upgrade("journal", entry)
+
+    assert entry["text"] == "Hola"
+    assert entry["mood"] == "😢"
+    assert entry["attribute_ids"] == []
+    assert entry["timestamp"] == "2024-01-01"
+
+def test_legacy_record_without_date_does_not_fail():
+    records = [
+        {"mission_id": "m1", "status": "completed"},
+        {"mission_id": "m2", "status": "completed", "timestamp": "2024-02-03T10:00:00"},
+    ]
+
+    assert upgrade_dataset("mission_log", records) == 2
+
+    assert (records[0]["date"], records[0]["timestamp"]) == ("", "")
+    assert records[1]["date"] == "2024-02-03"
+
+def test_null_timestamp_does_not_fail():
+    records = [
+        {"mission_id": "m1", "status": "completed", "timestamp": None},
+        {"mission_id": "m2", "status": "completed", "date": "2024-02-03", "timestamp": None},
+    ]
+
+    assert upgrade_dataset("mission_log", records) == 2
+
+    assert (records[0]["date"], records[0]["timestamp"]) == ("", "")
+    assert records[1]["timestamp"] == "2024-02-03"
+
+def test_config_gets_every_default_key():
+    config = {"daily_reset_time": "04:30", "attribute_weights": {"strength": 2.0}}
+
+    upgrade("config", config)
+
+    assert config["daily_reset_time"] == "04:30"
+    assert config["attribute_weights"] == {"strength": 2.0}
+    assert all(key in config for key in DEFAULT_CONFIG)
+    # Cada configuración con sus propios contenedores, no los de DEFAULT_CONFIG
+    other = {}
+    upgrade("config", other)
+    assert other["attribute_weights"] is not DEFAULT_CONFIG["attribute_weights"]
+
+def test_calendar_events_get_every_field():
+    calendar = {"events": [{"id": "e1", "date": "2024-01-01", "title": "Cita"}]}
+
+    upgrade("calendar", calendar)
+
+    assert calendar["events"][0]["notes"] == ""
+    assert calendar["events"][0]["title"] == "Cita"
+
+def test_json_documents_fill_every_item():
+    missions = {"missions": [{"id": "m1", "name": "Leer"}, {"id": "m2", "name": "Correr", "priority": "high"}]}
+
+    upgrade("missions", missions)
+
+    assert [m["priority"] for m in missions["missions"]] == ["medium", "high"]
+    assert all(m["recurrence"] == "everyday" for m in missions["missions"])
+    assert missions[VERSION_FIELD] == SCHEMA_VERSIONS["missions"]
+
+def test_redemptions_get_dates_and_migrations_are_counted():
+    rewards = {"rewards": [{"id": "r1", "name": "Cine"}], "redemptions": [{"reward_id": "r1", "timestamp": "2024-03-04T20:00:00"}]}
+    counter = REGISTRY.counters.setdefault("lifegame_schema_migrations_total", {})
+    before = counter.get((("dataset", "rewards"),), 0)
+
+    assert upgrade_dataset("rewards", rewards) == 1
+
+    assert rewards["redemptions"][0]["date"] == "2024-03-04"
+    assert rewards["rewards"][0]["preference"] == 1
+    assert counter[(("dataset", "rewards"),)] == before + 1
+
+def test_current_and_newer_records_are_left_alone():
+    current = stamp("mission_log", {"mission_id": "m1", "date": "2024-01-01", "status": "completed"})
+    newer = {"mission_id": "m1", "date": "2024-01-01", VERSION_FIELD: SCHEMA_VERSIONS["mission_log"] + 1}
+
+    assert upgrade_dataset("mission_log", [current, newer]) == 0
+    assert "xp_awarded" not in current
+    assert "xp_awarded" not in newer
+
+def test_parse_user_file_migrates_and_save_persists_the_version():
+    content = "\n".join(json.dumps({"mission_id": f"m{n}", "date": "2024-01-01", "status": "completed"}) for n in range(3))
+
+    data = parse_user_file("mission_log.jsonl", content)
+    saved = parse_user_file("mission_log.jsonl", serialize_user_file("mission_log.jsonl", data))
+
+    assert all(record[VERSION_FIELD] == SCHEMA_VERSIONS["mission_log"] for record in saved)
+    assert saved == data
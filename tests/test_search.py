@@ -0,0 +1,80 @@
+"""Índice de búsqueda (lifegame.search): ranking BM25, cambios incrementales y persistencia."""
+
+from lifegame.hub import read_search_index, UserHub
+from lifegame.search import search_sources, searchable_documents, SearchIndex
+from lifegame.storage import MemoryBackend, read_user_data
+
+USER = "ana"
+
+def index_of(docs: dict) -> SearchIndex:
+    index = SearchIndex()
+    index.sync([(doc_id, text, doc_id, "2024-01-01") for doc_id, text in docs.items()])
+    return index
+
+def ranking(index: SearchIndex, query: str) -> list:
+    return [doc_id for _, doc_id in index.search(query)]
+
+def test_more_occurrences_rank_higher():
+    index = index_of({
+        "a": "correr por el parque",
+        "b": "correr correr y correr otra vez",
+        "c": "leer un libro",
+    })
+
+    assert ranking(index, "correr") == ["b", "a"]
+
+def test_rare_terms_weigh_more_than_common_ones():
+    index = index_of({
+        "a": "meditacion en casa",
+        "b": "ejercicio en casa",
+        "c": "lectura en casa",
+        "d": "cocina en casa",
+    })
+
+    assert ranking(index, "casa meditacion")[0] == "a"
+
+def test_accents_and_suffixes_match_the_same_stem():
+    index = index_of({"a": "Reflexión sobre las decisiones", "b": "nada que ver"})
+
+    assert ranking(index, "reflexion decision") == ["a"]
+
+def test_sync_only_touches_changed_documents():
+    index = index_of({"a": "correr", "b": "leer"})
+    index.dirty = False
+
+    index.sync([("a", "correr", "a", ""), ("b", "leer", "b", "")])
+    assert not index.dirty
+
+    index.sync([("a", "nadar", "a", "")])
+    assert index.dirty
+    assert ranking(index, "correr") == [] and ranking(index, "nadar") == ["a"]
+    assert ranking(index, "leer") == [] and "leer" not in index.postings
+    assert index.total_len == 1
+
+def test_json_roundtrip_keeps_metadata_and_ranking():
+    index = index_of({"a": "correr por el parque", "b": "correr correr"})
+    index.sources = {"journal": "s1", "decisions": "s2", "missions": "s3"}
+
+    loaded = SearchIndex.from_json(index.to_json())
+
+    assert loaded.doc_meta == index.doc_meta and loaded.sources == index.sources
+    assert loaded.search("correr") == index.search("correr")
+    loaded.remove("a")
+    assert ranking(loaded, "parque") == []
+
+def test_saved_index_records_the_files_it_was_synced_with():
+    backend = MemoryBackend()
+    backend.ensure_user(USER)
+    hub = UserHub(USER)
+    hub.datasets = read_user_data(USER, backend)
+    hub.datasets["search_index"] = read_search_index(USER, backend)
+    index = hub.datasets["search_index"]["data"]
+    hub.datasets["journal"]["data"].append({"id": "j1", "date": "2024-01-01", "text": "Un paseo largo"})
+    index.sync(searchable_documents(hub.datasets))
+    hub.search_synced = True
+
+    assert hub.save(backend)
+
+    loaded = read_search_index(USER, backend)["data"]
+    assert loaded.sources == search_sources(read_user_data(USER, backend))
+    assert loaded.doc_meta["journal:j1"][0] == "📔 Diario 2024-01-01"